@@ -6,12 +6,13 @@ import json
 import os
 import re
 import time
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Optional, Dict, List
-from datetime import datetime, timedelta
+from datetime import datetime
 
 import requests
-from bs4 import BeautifulSoup
+from urllib.parse import urljoin
+from bs4 import BeautifulSoup, SoupStrainer
 from telegram import Bot
 
 from config import (
@@ -21,7 +22,52 @@ from config import (
     STATE_FILE,
     POLL_INTERVAL,
     VALID_SELLERS_FILE,
+    RATE_STATE_FILE,
+    RATE_START,
+    RATE_MIN,
+    RATE_MAX,
+    RATE_INCREASE,
+    RATE_DECREASE,
+    HEALTH_FILE,
+    FAMILY_FILE,
+    BULK_LIST_URLS,
+    BULK_LIST_MAX_PAGES,
+    BREAKER_THRESHOLD,
+    BREAKER_COOLDOWN,
+    SUBSCRIBERS_FILE,
+    INDEX_FILE,
+    HISTORY_FILE,
+    COMMAND_POLL_TIMEOUT,
+    VERIFY_DELAY,
+    BROWSER_FALLBACK,
+    BROWSER_PAGES,
+    BROWSER_MAX_PER_CYCLE,
+    BROWSER_AFTER_BLOCKS,
+    SELECTOR_STATS_FILE,
+    ANALYTICS_WINDOWS,
+    WATCHLIST_DB,
 )
+from rate_control import RateController, CircuitBreaker, load_rates, save_rates
+from marketplaces import (
+    Marketplace,
+    MarketClient,
+    MARKETPLACES,
+    DEFAULT_MARKETPLACE,
+    marketplace_for_url,
+    parse_price_locale,
+)
+from item_health import ItemState, HealthTracker, MAX_UNKNOWN_MISSES
+from variant_families import FamilyIndex
+from offer_rules import Offer, parse_rule
+from subscribers import Subscriber, Subscription, load_subscribers
+from price_index import PriceIndex
+from price_history import HistoryStore
+from verify_queue import VerifyQueue
+from browser_pool import BrowserPool
+from selector_stats import SelectorStats
+from price_analytics import PriceAnalytics
+from site_adapters import SITE_ADAPTERS, SiteAdapter, adapter_for_url, market_for_key
+from watchlist_db import WatchEntry, WatchlistDB
 
 import logging
 from logging.handlers import RotatingFileHandler
@@ -32,6 +78,36 @@ from logging.handlers import RotatingFileHandler
 class WatchItem:
     site: str
     url: str
+    marketplace: str = DEFAULT_MARKETPLACE
+    subscriptions: List[Subscription] = field(default_factory=list)
+    priority: int = 0
+    tags: List[str] = field(default_factory=list)
+
+    def chat_ids(self) -> List[str]:
+        return list(dict.fromkeys(s.subscriber.chat_id for s in self.subscriptions))
+
+
+@dataclass
+class FetchResult:
+    html: Optional[str]
+    status: str  # "ok" | "blocked" | "gone" | "error"
+
+
+@dataclass
+class TrackerContext:
+    """Long-lived tracker state shared by the pollers and the command loop."""
+    state: Dict[str, float]
+    valid_sellers: set[str]
+    health: HealthTracker
+    families: FamilyIndex
+    index: PriceIndex
+    history: HistoryStore
+    verify: VerifyQueue
+    browser: BrowserPool
+    selectors: SelectorStats
+    analytics: PriceAnalytics
+    subscribers: List[Subscriber]
+    watchlist: WatchlistDB
 
 
 # ---------- Logging setup ----------
@@ -52,31 +128,113 @@ logger = logging.getLogger("AmazonTracker")
 
 # ---------- Helpers: watchlist / state / sellers ----------
 
-def load_watchlist(path: str) -> List[WatchItem]:
-    items: List[WatchItem] = []
+def parse_watch_line(line: str, linenum: int) -> Optional[WatchEntry]:
+    """One watchlist line -> WatchEntry, or None if it is invalid.
+
+    ASIN | amazon warehouse:used - like new<45 | amazon.com:new<80 | priority=5 | tags=gpu
+    """
+    target, *parts = [p.strip() for p in line.split("|")]
+    rules: List[str] = []
+    priority, tags = 0, []
+    for text in parts:
+        name, eq, value = text.partition("=")
+        if eq and name.strip() == "priority" and value.strip().lstrip("-").isdigit():
+            priority = int(value)
+        elif eq and name.strip() == "tags":
+            tags = [t.strip() for t in value.split(",") if t.strip()]
+        elif parse_rule(text):
+            rules.append(text)
+        else:
+            logger.info(f"Invalid rule on line {linenum}: {text}")
+
+    if target.startswith("http"):
+        market = marketplace_for_url(target)
+        if market:
+            return WatchEntry(target, "amazon", market.key, target, rules, priority, tags)
+        adapter = adapter_for_url(target)
+        if not adapter:
+            logger.info(f"Unknown marketplace on line {linenum}: {target}")
+            return None
+        if rules:
+            logger.info(f"Offer rules ignored for {adapter.name} on line {linenum}")
+        return WatchEntry(target, adapter.name, adapter.name, target, [], priority, tags)
+
+    # "B0..." (amazon.com) or "amazon.ca:B0..."
+    market_key, _, asin = target.rpartition(":")
+    market = MARKETPLACES.get(market_key or DEFAULT_MARKETPLACE)
+    if not market:
+        logger.info(f"Unknown marketplace on line {linenum}: {market_key}")
+        return None
+    if not (asin.startswith("B") and len(asin) == 10):
+        logger.info(f"Invalid ASIN on line {linenum}: {line}")
+        return None
+    return WatchEntry(market.dp_url(asin), "amazon", market.key, target, rules, priority, tags)
+
+
+def load_watchlist(path: str) -> List[WatchEntry]:
+    entries: List[WatchEntry] = []
     if not os.path.exists(path):
         logger.info(f"{path} not found")
-        return items
+        return entries
 
     with open(path) as f:
         for linenum, line in enumerate(f, 1):
             line = line.strip()
             if not line or line.startswith("#"):
                 continue
+            entry = parse_watch_line(line, linenum)
+            if entry:
+                entries.append(entry)
+    return entries
+
+
+def sync_watchlists(db: WatchlistDB, subscribers: List[Subscriber]) -> None:
+    """Re-import each subscriber's text watchlist into the DB when it changed."""
+    db.prune([s.name for s in subscribers], [s.watchlist for s in subscribers])
+    for sub in subscribers:
+        if not os.path.exists(sub.watchlist):
+            db.forget_import(sub.name, sub.watchlist)
+            continue
+        mtime = os.path.getmtime(sub.watchlist)
+        if db.needs_import(sub.watchlist, mtime):
+            db.import_entries(sub.name, load_watchlist(sub.watchlist), sub.watchlist, mtime)
+
+
+def item_from_row(ctx: "TrackerContext", row: tuple) -> WatchItem:
+    """Bind one due DB row to live subscriber objects and parsed rules."""
+    item_id, url, site, marketplace, priority, tags = row
+    subs = {s.name: s for s in ctx.subscribers}
+    subscriptions = [
+        Subscription(
+            subs[name],
+            [r for r in (parse_rule(t) for t in rules.split(" | ") if rules) if r],
+        )
+        for name, rules in ctx.watchlist.subscriptions(item_id)
+        if name in subs
+    ]
+    return WatchItem(
+        site=site,
+        url=url,
+        marketplace=marketplace,
+        subscriptions=subscriptions,
+        priority=priority,
+        tags=tags.split(",") if tags else [],
+    )
+
+
+def item_asin(item: WatchItem) -> Optional[str]:
+    m = re.search(r"/dp/([A-Z0-9]{10})", item.url)
+    return m.group(1) if m else None
+
 
-            if line.startswith("http"):
-                url = line
-            else:
-                asin = line
-                if not (asin.startswith("B") and len(asin) == 10):
-                    logger.info(f"Invalid ASIN on line {linenum}: {line}")
-                    continue
-                url = f"https://www.amazon.com/dp/{asin}"
+def market_key(asin: str, marketplace: str) -> str:
+    """Watchlist-style key: bare ASIN on amazon.com, 'amazon.ca:B0...' elsewhere."""
+    return asin if marketplace == DEFAULT_MARKETPLACE else f"{marketplace}:{asin}"
 
-            items.append(WatchItem(site="amazon", url=url))
 
-    logger.info(f"Loaded {len(items)} Amazon items")
-    return items
+def item_key(item: WatchItem) -> Optional[str]:
+    asin = item_asin(item)
+    return market_key(asin, item.marketplace) if asin else None
 
 
 def load_state(path: str) -> Dict[str, float]:
@@ -96,22 +254,35 @@ def save_state(path: str, state: Dict[str, float]) -> None:
     os.replace(tmp, path)
 
 
-async def send_telegram(msg: str) -> None:
+async def send_telegram(msg: str, chat_id: str = TELEGRAM_CHAT_ID) -> None:
     bot = Bot(token=TELEGRAM_TOKEN)
     await bot.send_message(
-        chat_id=TELEGRAM_CHAT_ID, text=msg, parse_mode="Markdown"
+        chat_id=chat_id, text=msg, parse_mode="Markdown"
     )
 
 
-def parse_price_text(text: str) -> Optional[float]:
-    m = re.search(r"[\d]{1,3}(?:,[\d]{3})*\.[\d]{2}", text)
-    if m:
-        price_str = m.group(0).replace(",", "").replace("$", "")
+async def send_to_chats(msg: str, chat_ids: List[str]) -> List[str]:
+    """Send to each chat in turn; one failing chat never stops the rest.
+
+    Returns the chat ids the message could not be delivered to.
+    """
+    failed = []
+    for chat_id in chat_ids:
         try:
-            return float(price_str)
-        except ValueError:
-            return None
-    return None
+            await send_telegram(msg, chat_id)
+        except Exception as e:
+            logger.warning(f"Telegram to {chat_id} failed: {e}")
+            failed.append(chat_id)
+    return failed
+
+
+async def notify_subscribers(item: WatchItem, msg: str) -> None:
+    """Fan one alert out to every chat watching the item."""
+    await send_to_chats(msg, item.chat_ids())
+
+
+def parse_price_text(text: str, market: Optional[Marketplace] = None) -> Optional[float]:
+    return parse_price_locale(text, market)
 
 
 def load_valid_sellers(sellers_file: str) -> set[str]:
@@ -132,7 +303,19 @@ def load_valid_sellers(sellers_file: str) -> set[str]:
 
 # ---------- HTTP fetching with backoff & basic bot detection ----------
 
-def fetch_html(url: str, retry_count: int = 0) -> Optional[str]:
+def looks_like_captcha(html: str) -> bool:
+    text_lower = html.lower()
+    return (
+        "captcha" in text_lower
+        or "enter the characters you see below" in text_lower
+        or "type the characters you see in this image" in text_lower
+        or "robot check" in text_lower
+    )
+
+
+def fetch_page(
+    url: str, client: Optional[MarketClient] = None, retry_count: int = 0
+) -> FetchResult:
     if retry_count > 0:
         delay = 2 ** retry_count + random.uniform(1, 3)
         logger.info(f"Backoff {retry_count}/3: {delay:.1f}s")
@@ -150,7 +333,7 @@ def fetch_html(url: str, retry_count: int = 0) -> Optional[str]:
     headers = {
         "User-Agent": random.choice(user_agents),
         "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-        "Accept-Language": "en-US,en;q=0.5",
+        "Accept-Language": client.market.accept_language if client else "en-US,en;q=0.5",
         "Accept-Encoding": "gzip, deflate, br",
         "DNT": "1",
         "Connection": "keep-alive",
@@ -161,8 +344,9 @@ def fetch_html(url: str, retry_count: int = 0) -> Optional[str]:
         "Cache-Control": "max-age=0",
     }
 
+    http = client.session if client else requests
     try:
-        resp = requests.get(
+        resp = http.get(
             url,
             headers=headers,
             timeout=25,
@@ -172,58 +356,115 @@ def fetch_html(url: str, retry_count: int = 0) -> Optional[str]:
         # CloudFront / IP block 503
         if resp.status_code == 503:
             logger.warning(f"503 from Amazon/CloudFront for {url}")
-            if retry_count < 3:
-                return fetch_html(url, retry_count + 1)
-            return None
+            if client:
+                client.on_block()
+            if retry_count < 3 and not (client and client.breaker.is_open):
+                return fetch_page(url, client, retry_count + 1)
+            return FetchResult(None, "blocked")
+
+        # Dead ASIN / removed listing: retrying will not help
+        if resp.status_code in (404, 410):
+            logger.warning(f"{resp.status_code} for {url}")
+            return FetchResult(None, "gone")
 
         resp.raise_for_status()
 
-        text_lower = resp.text.lower()
-        if (
-            "captcha" in text_lower
-            or "enter the characters you see below" in text_lower
-            or "type the characters you see in this image" in text_lower
-            or "robot check" in text_lower
-        ):
+        # Amazon's robot page only; retailer adapters spot their own blocks,
+        # since their pages routinely ship recaptcha/px-captcha markup
+        amazon = client is None or client.market.key in MARKETPLACES
+        if amazon and looks_like_captcha(resp.text):
             logger.warning(f"CAPTCHA/robot page detected: {url}")
-            if retry_count < 3:
-                return fetch_html(url, retry_count + 1)
-            return None
+            if client:
+                client.on_block()
+            if retry_count < 3 and not (client and client.breaker.is_open):
+                return fetch_page(url, client, retry_count + 1)
+            return FetchResult(None, "blocked")
 
-        return resp.text
+        if client:
+            client.on_success()
+        return FetchResult(resp.text, "ok")
 
     except requests.exceptions.RequestException as e:
         logger.warning(
             f"Fetch fail {retry_count+1}/3 {url}: {str(e)[:120]}"
         )
         if retry_count < 3:
-            return fetch_html(url, retry_count + 1)
+            return fetch_page(url, client, retry_count + 1)
         logger.error(f"Max retries exceeded: {url}")
-        return None
+        return FetchResult(None, "error")
+
+
+def fetch_html(url: str, client: Optional[MarketClient] = None) -> Optional[str]:
+    return fetch_page(url, client).html
+
+
+async def fetch_async(url: str, client: MarketClient) -> FetchResult:
+    """Take the domain's next rate slot, then fetch off the event loop."""
+    await client.wait()
+    return await asyncio.to_thread(fetch_page, url, client)
 
 
 # ---------- HTML parsing ----------
 
+DEAD_PAGE_MARKERS = (
+    "looking for something?",
+    "we couldn't find that page",
+    "the web address you entered is not a functioning page",
+)
+
+OOS_MARKERS = (
+    "currently unavailable",
+    "out of stock",
+    "we don't know when or if this item will be back in stock",
+)
+
+
+def detect_availability(soup: BeautifulSoup, text_lower: str) -> Optional[ItemState]:
+    """Classify a detail page that yielded no price; None if unknown."""
+    if any(m in text_lower for m in DEAD_PAGE_MARKERS):
+        return ItemState.DEAD
+
+    if soup.select_one("#outOfStock"):
+        return ItemState.OOS
+    avail_el = soup.select_one("#availability")
+    if avail_el:
+        avail = avail_el.get_text(" ", strip=True).lower()
+        if any(m in avail for m in OOS_MARKERS):
+            return ItemState.OOS
+    return None
+
+
 def get_price_name_amazon(
-    html: str, valid_sellers: set[str]
-) -> tuple[str, Optional[float]]:
-    """Return (product_name, price_from_buybox_valid_seller_or_None)."""
+    html: str,
+    valid_sellers: set[str],
+    market: Optional[Marketplace] = None,
+    selectors: Optional[SelectorStats] = None,
+    key: Optional[str] = None,
+) -> tuple[str, Optional[float], Optional[ItemState]]:
+    """Return (product_name, price_from_buybox_valid_seller_or_None, state).
+
+    state is HEALTHY when a price was found, OOS / NO_SELLER / DEAD when a
+    detection rule matched, or None when the page could not be classified.
+    With `selectors`, the item's learned seller/price selectors go first
+    within their tier.
+    """
     soup = BeautifulSoup(html, "html.parser")
     text = soup.get_text(" ", strip=True)
+    text_lower = text.lower()
 
     # CAPTCHA check (defensive; usually caught in fetch_html)
     if (
         "enter the characters you see below" in text
         or "type the characters you see in this image" in text
     ):
-        return "Amazon CAPTCHA/robot page", None
+        return "Amazon CAPTCHA/robot page", None, ItemState.BLOCKED
 
     # Product title
     title_el = soup.select_one("#productTitle") or soup.find("title")
     name = title_el.get_text(strip=True)[:80] if title_el else "Amazon Product"
 
     if name == "Amazon.com" or (len(name) < 20 and "Amazon" in name):
-        return name, None
+        return name, None, detect_availability(soup, text_lower)
 
     # Find seller FIRST
     buybox_seller_selectors = [
@@ -232,9 +473,16 @@ def get_price_name_amazon(
         ".sellerName",
     ]
 
+    seller_tiers = [(buybox_seller_selectors, "seller")]
+    seller_plan = (
+        selectors.plan(key, "seller", seller_tiers) if selectors
+        else [(sel, "seller") for sel in buybox_seller_selectors]
+    )
     seller_text = None
-    for sel in buybox_seller_selectors:
+    for sel, _ in seller_plan:
         el = soup.select_one(sel)
+        if selectors:
+            selectors.record(key, "seller", sel, el is not None)
         if el:
             seller_text = el.get_text(" ", strip=True).lower()
             break
@@ -250,6 +498,9 @@ def get_price_name_amazon(
         logger.debug(
             f"Seller '{seller_match}' found in: {seller_text[:100]}"
         )
+    elif seller_text:
+        logger.debug(f"Buybox seller not valid: {seller_text[:100]}")
+        return name, None, ItemState.NO_SELLER
 
     # Priority selectors
     priority_prices = [
@@ -272,42 +523,134 @@ def get_price_name_amazon(
         "#priceblock_shippingmessage",
     ]
 
-    for selector_list, priority in [
+    price_tiers = [
         (priority_prices, "deal"),
         (buybox_prices, "buybox"),
         (fallback_prices, "fallback"),
-    ]:
-        for sel in selector_list:
-            el = soup.select_one(sel)
-            if not el:
-                continue
-            price_text = el.get_text()
-            price = parse_price_text(price_text)
-            if price and 0.01 <= price <= 5000:
-                logger.info(
-                    f"Buybox match ${price:.2f} from {seller_match} "
-                    f"for {name} [SEL:{sel}] [{priority}]"
-                )
-                return name, price
-            else:
-                logger.debug(
-                    f"Price rejected from {sel}: '{price_text[:50]}' -> {price}"
-                )
+    ]
+    price_plan = (
+        selectors.plan(key, "price", price_tiers) if selectors
+        else [(sel, priority) for sel_list, priority in price_tiers for sel in sel_list]
+    )
+    for sel, priority in price_plan:
+        el = soup.select_one(sel)
+        if not el:
+            if selectors:
+                selectors.record(key, "price", sel, False)
+            continue
+        price_text = el.get_text()
+        price = parse_price_text(price_text, market)
+        valid = bool(price and 0.01 <= price <= 5000)
+        if selectors:
+            selectors.record(key, "price", sel, valid)
+        if valid:
+            logger.info(
+                f"Buybox match ${price:.2f} from {seller_match} "
+                f"for {name} [SEL:{sel}] [{priority}]"
+            )
+            return name, price, ItemState.HEALTHY
+        else:
+            logger.debug(
+                f"Price rejected from {sel}: '{price_text[:50]}' -> {price}"
+            )
 
     logger.debug(
         f"No valid buybox price for {name} (seller: {seller_match})"
     )
-    return name, None
+    return name, None, detect_availability(soup, text_lower)
 
 
-def get_price_name_offers(
-    html: str, valid_sellers: set[str]
-) -> tuple[str, Optional[float]]:
-    """Scan Amazon OFFICIAL offers page - ALL sellers for main product only."""
+PARENT_ASIN_RE = re.compile(r'"parentAsin"\s*:\s*"([A-Z0-9]{10})"')
+ASIN_RE = re.compile(r"^[A-Z0-9]{10}$")
+
+
+def get_variant_prices(
+    html: str, market: Optional[Marketplace] = None
+) -> tuple[Optional[str], Dict[str, Optional[float]]]:
+    """Return (parent_asin, {variant_asin: swatch_price_or_None}) from a /dp page.
+
+    Swatch prices are whatever the twister shows for that variant's buy box;
+    the seller is not visible there.
+    """
+    m = PARENT_ASIN_RE.search(html)
+    parent = m.group(1) if m else None
+
+    siblings: Dict[str, Optional[float]] = {}
+    soup = BeautifulSoup(html, "html.parser", parse_only=SoupStrainer("li"))
+    for li in soup.find_all("li"):
+        asin = li.get("data-defaultasin") or li.get("data-asin")
+        if not asin or not ASIN_RE.match(asin):
+            continue
+        classes = " ".join(li.get("class", []))
+        if li.get("data-dp-url") is None and "swatch" not in classes:
+            continue
+
+        price = None
+        if "swatchUnavailable" not in classes:
+            price_el = li.select_one(
+                ".twisterSwatchPrice, .a-price .a-offscreen, .a-size-mini"
+            )
+            if price_el:
+                price = parse_price_text(price_el.get_text(), market)
+                if price is not None and not (0.01 <= price <= 5000):
+                    price = None
+        siblings[asin] = price
+
+    if siblings:
+        found = sum(1 for p in siblings.values() if p is not None)
+        logger.debug(f"Variants: parent {parent}, {found}/{len(siblings)} priced")
+    return parent, siblings
+
+
+def get_list_prices(
+    html: str, market: Optional[Marketplace] = None
+) -> tuple[Dict[str, float], Optional[str]]:
+    """Parse a wish list / list page: ({asin: price}, next_page_path_or_None)."""
     soup = BeautifulSoup(html, "html.parser")
+    prices: Dict[str, float] = {}
+
+    for li in soup.select("li[data-itemid], li[data-price]"):
+        asin = None
+        params = li.get("data-reposition-action-params", "")
+        m = re.search(r"ASIN:([A-Z0-9]{10})", params)
+        if m:
+            asin = m.group(1)
+        else:
+            link = li.select_one("a[href*='/dp/']")
+            m = re.search(r"/dp/([A-Z0-9]{10})", link["href"]) if link else None
+            asin = m.group(1) if m else None
+        if not asin:
+            continue
 
-    best_price = float("inf")
-    best_seller = None
+        price = None
+        raw = li.get("data-price", "")
+        try:
+            price = float(raw)
+        except ValueError:
+            price_el = li.select_one(".a-price .a-offscreen")
+            if price_el:
+                price = parse_price_text(price_el.get_text(), market)
+        # Unavailable items show data-price="-Infinity"
+        if price is not None and 0.01 <= price <= 5000:
+            prices[asin] = price
+
+    next_path = None
+    more = soup.select_one("input[name='showMoreUrl']")
+    if more and more.get("value"):
+        next_path = more["value"]
+    else:
+        more_link = soup.select_one("a.wl-see-more[href]")
+        if more_link:
+            next_path = more_link["href"]
+    return prices, next_path
+
+
+def get_offers_amazon(
+    html: str, valid_sellers: set[str], market: Optional[Marketplace] = None
+) -> List[Offer]:
+    """Return the full offer table (every seller, price and condition)."""
+    soup = BeautifulSoup(html, "html.parser")
+    offers: List[Offer] = []
 
     # Amazon's OFFICIAL offer containers (NO ads here)
     offer_containers = soup.select(".olpOffer, .a-row.olpOffer, #olpOfferList")
@@ -318,77 +661,219 @@ def get_price_name_offers(
         )
         if not seller_el:
             continue
-
         seller_text = seller_el.get_text(" ", strip=True).lower()
-        seller_match = None
-        for valid in valid_sellers:
-            if valid in seller_text:
-                seller_match = valid
-                break
-
-        if not seller_match:
-            continue
 
         price_el = container.select_one(
             ".olpOfferPrice, .a-price-whole, .a-offscreen, .offer-price"
         )
         if not price_el:
             continue
+        price = parse_price_text(price_el.get_text(), market)
+        if not price or not (0.01 <= price <= 5000):
+            continue
 
-        price = parse_price_text(price_el.get_text())
-        if (
-            price
-            and 0.01 <= price <= 5000
-            and price < best_price
-        ):
-            best_price = price
-            best_seller = seller_match
+        cond_el = container.select_one(".olpCondition, #aod-offer-heading, .offer-condition")
+        condition = cond_el.get_text(" ", strip=True).lower() if cond_el else "new"
+        condition = re.sub(r"\s+", " ", condition)
 
-    if best_price != float("inf"):
+        offers.append(
+            Offer(
+                seller=seller_text,
+                price=price,
+                condition=condition,
+                valid_seller=any(v in seller_text for v in valid_sellers),
+            )
+        )
+
+    logger.debug(f"Offers table: {len(offers)} offers")
+    return offers
+
+
+def get_price_name_offers(
+    offers: List[Offer],
+) -> tuple[str, Optional[float], Optional[ItemState]]:
+    """Lowest price from a valid seller out of a parsed offer table."""
+    valid = [o for o in offers if o.valid_seller]
+    if valid:
+        best = min(valid, key=lambda o: o.price)
         logger.info(
-            f"Offers: Lowest ${best_price:.2f} from {best_seller}"
+            f"Offers: Lowest ${best.price:.2f} from {best.seller[:40]}"
         )
-        return "Main product (offers)", best_price
+        return "Main product (offers)", best.price, ItemState.HEALTHY
+
+    if offers:
+        logger.debug(f"Offers only from {len(offers)} non-valid sellers")
+        return "Main product (no valid seller)", None, ItemState.NO_SELLER
 
     logger.debug("No valid offers found")
-    return "Main product (no offers)", None
+    return "Main product (no offers)", None, None
 
 
 # ---------- Core check logic ----------
 
-async def check_item(
-    item: WatchItem, state: Dict[str, float], valid_sellers: set[str]
+async def harvest_list_prices(list_url: str, client: MarketClient) -> Dict[str, float]:
+    """Walk every page of a public list and return {asin: price}."""
+    prices: Dict[str, float] = {}
+    url: Optional[str] = list_url
+    pages = 0
+    while url and pages < BULK_LIST_MAX_PAGES:
+        page = await fetch_async(url, client)
+        pages += 1
+        if not page.html:
+            logger.warning(f"Bulk list page {pages} failed ({page.status}): {url}")
+            break
+        page_prices, next_path = get_list_prices(page.html, client.market)
+        prices.update(page_prices)
+        logger.info(f"Bulk list page {pages}: {len(page_prices)} prices")
+        url = urljoin(list_url, next_path) if next_path else None
+    return prices
+
+
+async def record_no_price(
+    item: WatchItem,
+    health: HealthTracker,
+    offers: FetchResult,
+    page: FetchResult,
+    offers_state: Optional[ItemState],
+    buybox_state: Optional[ItemState],
 ) -> None:
-    cooldown_key = f"{item.url}:cooldown_until"
-    cooldown_until = state.get(cooldown_key)
-    if cooldown_until and datetime.now().timestamp() < cooldown_until:
-        logger.info(f"Cooldown: {item.url}")
+    """Turn a price-less check into a health transition."""
+    if offers.status == "gone" and page.status == "gone":
+        observed: Optional[ItemState] = ItemState.DEAD
+    elif buybox_state in (ItemState.DEAD, ItemState.OOS, ItemState.NO_SELLER):
+        observed = buybox_state
+    elif offers_state == ItemState.NO_SELLER:
+        observed = ItemState.NO_SELLER
+    elif "blocked" in (offers.status, page.status) or buybox_state == ItemState.BLOCKED:
+        observed = ItemState.BLOCKED
+    elif not offers.html and not page.html:
+        # Do not mark URL as bad when we never got HTML
+        logger.warning(
+            f"Transient fetch failure (no HTML) for {item.url}; "
+            f"not counting as URL issue"
+        )
         return
+    else:
+        observed = None
+
+    if observed is None:
+        old = ItemState(health.get(item.url).state)
+        misses = health.record_miss(item.url)
+        logger.warning(
+            f"Miss {misses}/{MAX_UNKNOWN_MISSES} (HTML but no valid price): {item.url}"
+        )
+        observed = ItemState(health.get(item.url).state)
+        if observed != ItemState.DEAD:
+            return
+    else:
+        old, _ = health.record(item.url, observed)
+
+    h = health.get(item.url)
+    if observed == ItemState.DEAD and old != ItemState.DEAD:
+        await notify_subscribers(item, f"🚨 URL ISSUE: {item.url} (dead, {h.misses} misses)")
+        logger.error(f"ISSUE: {item.url} marked dead")
+    logger.info(
+        f"{observed.value} x{h.streak}, next check "
+        f"{datetime.fromtimestamp(h.next_check).strftime('%Y-%m-%d %H:%M')}: {item.url}"
+    )
+
+
+async def evaluate_rules(
+    item: WatchItem, name: str, offers: List[Offer], state: Dict[str, float]
+) -> None:
+    """Check every subscriber's alert rules against one offer table.
+
+    A rule alerts when it starts matching or its best price drops further;
+    the last alerted price is kept under `<url>#rule:<subscriber>:<label>`,
+    only once the alert was delivered.
+    """
+    cur = market_for_key(item.marketplace).currency
+    for sub in item.subscriptions:
+        for rule in sub.rules:
+            key = f"{item.url}#rule:{sub.subscriber.name}:{rule.label}"
+            best = rule.best(offers)
+            if best is None:
+                state.pop(key, None)
+                continue
+
+            last = state.get(key)
+            if last is not None and best.price >= last - 0.01:
+                continue
+
+            failed = await send_to_chats(
+                f"🎯 RULE: {rule.label}\n"
+                f"{name[:80]}\n"
+                f"{item.url}\n"
+                f"*{cur}{best.price:.2f}* from {best.seller[:40]} ({best.condition[:40]})",
+                [sub.subscriber.chat_id],
+            )
+            if failed:
+                continue  # not stored, so the next check alerts again
+            state[key] = best.price
+            logger.info(
+                f"Rule hit [{sub.subscriber.name}: {rule.label}] "
+                f"{cur}{best.price:.2f} {item.url}"
+            )
+
+
+async def check_item(
+    item: WatchItem, ctx: TrackerContext, client: MarketClient, verifying: bool = False
+) -> bool:
+    """Fetch and evaluate one item; returns False if skipped by its schedule."""
+    health, families = ctx.health, ctx.families
+    if not verifying and not health.is_due(item.url):
+        h = health.get(item.url)
+        logger.info(f"Skip ({h.state}, streak {h.streak}): {item.url}")
+        return False
+
+    h = health.items.get(item.url)
+    if (
+        h
+        and h.state == ItemState.BLOCKED.value
+        and h.streak >= BROWSER_AFTER_BLOCKS
+        and ctx.browser.budget_left()
+    ):
+        return await check_item_browser(item, ctx, client, verifying)
+
+    if item.site in SITE_ADAPTERS:
+        return await check_site_item(item, ctx, client, verifying)
 
     logger.info(f"Checking {item.url}")
-    await asyncio.sleep(random.uniform(2, 6))
 
-    # Extract ASIN from URL
-    asin_match = re.search(r"/dp/([A-Z0-9]{10})", item.url)
-    if not asin_match:
+    asin = item_asin(item)
+    if not asin:
         logger.warning(f"Cannot extract ASIN from {item.url}")
-        return
+        return False
 
-    asin = asin_match.group(1)
+    market = client.market
 
     # OFFERS PAGE FIRST
-    offers_url = f"https://www.amazon.com/gp/offer-listing/{asin}"
-    offers_html = fetch_html(offers_url)
-    name, offers_price = None, None
-    if offers_html:
+    offers = await fetch_async(market.offers_url(asin), client)
+    name, offers_price, offers_state = None, None, None
+    offer_table: List[Offer] = []
+    if offers.html:
         logger.debug(f"Checking offers page for {asin}")
-        name, offers_price = get_price_name_offers(offers_html, valid_sellers)
+        offer_table = get_offers_amazon(offers.html, ctx.valid_sellers, market)
+        name, offers_price, offers_state = get_price_name_offers(offer_table)
 
     # BUYBOX AS BACKUP
-    buybox_price = None
-    html = fetch_html(item.url)
-    if html:
-        _, buybox_price = get_price_name_amazon(html, valid_sellers)
+    buybox_price, buybox_state = None, None
+    page = await fetch_async(item.url, client)
+    if page.html:
+        name, buybox_price, buybox_state = get_price_name_amazon(
+            page.html, ctx.valid_sellers, market, ctx.selectors, market_key(asin, market.key)
+        )
+        parent, siblings = get_variant_prices(page.html, market)
+        siblings.pop(asin, None)
+        families.observe(
+            market_key(asin, market.key),
+            parent,
+            {market_key(a, market.key): p for a, p in siblings.items()},
+        )
+    name = name or item.url
+
+    if offer_table and any(s.rules for s in item.subscriptions):
+        await evaluate_rules(item, name, offer_table, ctx.state)
 
     # ALWAYS use LOWEST price from valid sellers (offers page usually wins)
     price = None
@@ -402,48 +887,64 @@ async def check_item(
         price = buybox_price
         price_source = "buybox"
 
-    # NEW: do not mark URL as bad when we never got HTML
-    if price is None and not offers_html and not html:
-        logger.warning(
-            f"Transient fetch failure (no HTML) for {item.url}; "
-            f"not counting as URL issue"
-        )
-        return
-
     if price is None:
-        fails_key = f"{item.url}:fails"
-        fails = state.get(fails_key, 0) + 1
-        state[fails_key] = fails
-        if fails >= 6:
-            msg = f"🚨 URL ISSUE: {item.url} ({fails} polls/404)"
-            await send_telegram(msg)
-            logger.error(f"ISSUE: {item.url} ({fails})")
-            state[cooldown_key] = (
-                datetime.now().timestamp()
-                + timedelta(hours=24).total_seconds()
-            )
-        else:
-            logger.warning(
-                f"Fail {fails}/6 (HTML but no valid price): {item.url}"
-            )
-        return
+        await record_no_price(item, health, offers, page, offers_state, buybox_state)
+        return True
+
+    await apply_price(item, name, price, price_source, ctx, verifying)
+    return True
 
-    # Reset fail counter on success
-    fails_key = f"{item.url}:fails"
-    if fails_key in state:
-        del state[fails_key]
 
-    key = item.url
-    last = state.get(key)
+async def apply_price(
+    item: WatchItem,
+    name: str,
+    price: float,
+    price_source: str,
+    ctx: TrackerContext,
+    verifying: bool = False,
+) -> None:
+    """Record a price observation for an item and send change alerts.
+
+    A change is not trusted on first sight: it goes to the verification
+    queue and only alerts (and updates state) once a re-fetch repeats it.
+    """
+    state = ctx.state
+    cur = market_for_key(item.marketplace).currency
+    old_state, _ = ctx.health.record(item.url, ItemState.HEALTHY)
+
+    last = state.get(item.url)
+    changed = last is not None and abs(price - last) >= 0.01
+
+    if verifying:
+        # Only the queued price counts as confirmed; a third price is not
+        # alerted, and the next regular check queues it afresh
+        pending = ctx.verify.pending.get(item.url)
+        confirmed = changed and pending is not None and abs(price - pending.new_price) < 0.01
+        ctx.verify.resolve(item.url, confirmed=confirmed)
+        if changed and not confirmed:
+            return
+    elif changed:
+        ctx.verify.add(item, last, price, price_source)
+        return
+
+    key = item_key(item) or item.url
+    ctx.index.update(key, name, item.url, price, price_source)
+    ctx.history.append(key, price)
+    if old_state in (ItemState.OOS, ItemState.NO_SELLER):
+        await notify_subscribers(
+            item,
+            f"🟢 BACK ({old_state.value} → in stock)\n{name[:80]}\n{item.url}\n"
+            f"*Now:* {cur}{price:.2f}",
+        )
 
     if last is None:
-        state[key] = price
+        state[item.url] = price
         logger.info(
             f"Initial price ${price:.2f} ({price_source}) - {name[:60]}"
         )
         return
 
-    if abs(price - last) >= 0.01:
+    if changed:
         direction = "🟢 DROPPED" if price < last else "🔴 INCREASED"
         diff = abs(last - price)
         pct = diff / last * 100 if last != 0 else 0.0
@@ -451,55 +952,498 @@ async def check_item(
             f"{direction}\n"
             f"{name[:80]}\n"
             f"{item.url}\n"
-            f"*Old:* ${last:.2f} → *New:* ${price:.2f}\n"
+            f"*Old:* {cur}{last:.2f} → *New:* {cur}{price:.2f}\n"
             f"*{diff:.2f}* ({pct:.1f}%)"
         )
-        await send_telegram(msg)
+        low_days = 0
+        stats = ctx.analytics.get(key)
+        if stats and price < last:
+            low_days = stats.low_days(price)
+            if stats.is_all_time_low(price):
+                msg += f"\n🏆 All-time low ({stats.n} price changes tracked)"
+            elif low_days:
+                msg += f"\n📉 Lowest in {low_days} days"
+            msg += f"\nTypical {cur}{stats.p10:.2f}–{cur}{stats.p90:.2f}, median {cur}{stats.p50:.2f}"
+        # Each subscriber's own thresholds decide who hears about it
+        chats = [
+            s.subscriber.chat_id for s in item.subscriptions
+            if s.wants_change(last, price, low_days)
+        ]
+        await send_to_chats(msg, list(dict.fromkeys(chats)))
         logger.info(
             f"{direction} ${last:.2f}→${price:.2f} "
-            f"({price_source}) {name[:40]}"
+            f"({price_source}, verified) {name[:40]}"
         )
     else:
         logger.info(
             f"Stable price ${price:.2f} ({price_source}) {name[:40]}"
         )
 
-    state[key] = price
+    state[item.url] = price
+
+
+async def drain_verifications(client: MarketClient, ctx: TrackerContext) -> None:
+    """Re-fetch this marketplace's queued changes once their delay has passed."""
+    while True:
+        queued = ctx.verify.for_market(client.market.key)
+        if not queued:
+            return
+        change = queued[0]
+        wait = change.due - time.time()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        logger.info(f"Verifying {change.old_price:.2f}→{change.new_price:.2f}: {change.item.url}")
+        await check_item(change.item, ctx, client, verifying=True)
+        # No price on the re-fetch (blocked / OOS) also means "not confirmed"
+        ctx.verify.resolve(change.item.url, confirmed=False)
+
+
+async def check_site_item(
+    item: WatchItem, ctx: TrackerContext, client: MarketClient, verifying: bool = False
+) -> bool:
+    """One fetch + the retailer adapter's extractor for a non-Amazon item."""
+    adapter = SITE_ADAPTERS[item.site]
+    logger.info(f"Checking [{adapter.name}] {item.url}")
+    page = await fetch_async(item.url, client)
+    if page.status == "gone":
+        ctx.health.record(item.url, ItemState.DEAD)
+        return True
+    if not page.html:
+        if page.status == "blocked":
+            ctx.health.record(item.url, ItemState.BLOCKED)
+        return True
+
+    await apply_site_page(item, ctx, client, adapter, page.html, verifying)
+    return True
+
+
+async def apply_site_page(
+    item: WatchItem, ctx: TrackerContext, client: MarketClient, adapter: SiteAdapter, html: str, verifying: bool
+) -> None:
+    """Run a retailer adapter's extractor on a fetched or browser-rendered page."""
+    name, price, observed = adapter.extract(html)
+    if price is None:
+        if observed == ItemState.BLOCKED:
+            client.on_block()
+        if observed:
+            ctx.health.record(item.url, observed)
+        else:
+            misses = ctx.health.record_miss(item.url)
+            logger.warning(f"No price from {adapter.name} ({misses} misses): {item.url}")
+        return
+
+    await apply_price(item, name, price, adapter.name, ctx, verifying)
+
+
+async def check_item_browser(
+    item: WatchItem, ctx: TrackerContext, client: MarketClient, verifying: bool = False
+) -> bool:
+    """Render the item page in the pooled browser when static fetches keep getting blocked.
+
+    Retailer pages go through their adapter's extractor; Amazon pages
+    through the usual detail-page parsing.
+    """
+    logger.info(f"Browser fallback ({ctx.browser.used + 1}): {item.url}")
+    await client.wait()
+    html = await ctx.browser.fetch(item.url)
+
+    if html and item.site not in SITE_ADAPTERS and looks_like_captcha(html):
+        logger.warning(f"CAPTCHA in browser too: {item.url}")
+        html = None
+    if not html:
+        ctx.health.record(item.url, ItemState.BLOCKED)
+        return True
+
+    if item.site in SITE_ADAPTERS:
+        await apply_site_page(item, ctx, client, SITE_ADAPTERS[item.site], html, verifying)
+        return True
+
+    market = client.market
+    asin = item_asin(item)
+    name, price, page_state = get_price_name_amazon(
+        html, ctx.valid_sellers, market, ctx.selectors, item_key(item)
+    )
+    if asin:
+        parent, siblings = get_variant_prices(html, market)
+        siblings.pop(asin, None)
+        ctx.families.observe(
+            market_key(asin, market.key),
+            parent,
+            {market_key(a, market.key): p for a, p in siblings.items()},
+        )
+
+    if price is None:
+        await record_no_price(
+            item,
+            ctx.health,
+            FetchResult(None, "skipped"),
+            FetchResult(html, "ok"),
+            None,
+            page_state,
+        )
+        return True
+
+    await apply_price(item, name, price, "browser", ctx, verifying)
+    return True
+
+
+def order_by_family(items: List[WatchItem], families: FamilyIndex) -> List[WatchItem]:
+    """Keep siblings adjacent so the first one's page can price the rest."""
+    by_asin: Dict[str, WatchItem] = {}
+    loose: List[WatchItem] = []
+    for item in items:
+        key = item_key(item)
+        if key:
+            by_asin[key] = item
+        else:
+            loose.append(item)
+    ordered = [
+        by_asin[a] for group in families.group(list(by_asin)).values() for a in group
+    ]
+    return ordered + loose
+
+
+async def check_without_fetch(
+    item: WatchItem, ctx: TrackerContext, bulk_prices: Dict[str, float]
+) -> Optional[str]:
+    """Price an item from this cycle's list/family pages; returns the source used."""
+    health, families = ctx.health, ctx.families
+    asin = item_asin(item)
+    if not asin or not health.is_due(item.url):
+        return None
+
+    price, source = bulk_prices.get(asin), "bulk"
+    if price is None:
+        price, source = families.sibling_price(market_key(asin, item.marketplace)), "family"
+    if price is None:
+        return None
+
+    # List and swatch prices carry no seller; items known to lack a valid
+    # seller keep going through the offers page
+    h = health.items.get(item.url)
+    if h and h.state == ItemState.NO_SELLER.value:
+        return None
+    logger.info(f"{source.title()} price ${price:.2f} for {asin} (no fetch)")
+    name = ctx.index.name_for(market_key(asin, item.marketplace)) or item.url
+    await apply_price(item, name, price, source, ctx)
+    return source
+
+
+# ---------- Telegram commands (answered from memory, never fetch) ----------
+
+def parse_item_arg(arg: str) -> Optional[str]:
+    """'b0dvhv7x53' / 'amazon.ca:B0...' -> index key, or None."""
+    market, _, asin = arg.strip().rpartition(":")
+    asin = asin.upper()
+    market = market.lower() or DEFAULT_MARKETPLACE
+    if market not in MARKETPLACES or not ASIN_RE.match(asin):
+        return None
+    return market_key(asin, market)
+
+
+def currency_for_key(key: str) -> str:
+    """Currency symbol for a price-index key: ASIN, 'amazon.ca:ASIN' or a retailer URL."""
+    if "://" in key:
+        adapter = adapter_for_url(key)
+        return adapter.market.currency if adapter else MARKETPLACES[DEFAULT_MARKETPLACE].currency
+    market = MARKETPLACES.get(key.rpartition(":")[0] or DEFAULT_MARKETPLACE)
+    return (market or MARKETPLACES[DEFAULT_MARKETPLACE]).currency
+
+
+def answer_price(ctx: TrackerContext, arg: str) -> str:
+    key = parse_item_arg(arg)
+    if not key:
+        return "Usage: /price <ASIN> or /price amazon.ca:<ASIN>"
+    obs = ctx.index.get(key)
+    if not obs:
+        return f"No observation yet for {key}"
+    cur = currency_for_key(key)
+    low = ctx.history.low(key)
+    low_30 = ctx.history.low(key, since=time.time() - 30 * 86400)
+    age_min = (time.time() - obs.ts) / 60
+    lines = [f"{obs.name[:80]}", obs.url, f"*Now:* {cur}{obs.price:.2f} ({obs.source}, {age_min:.0f} min ago)"]
+    if obs.prev_price:
+        lines.append(f"*Prev:* {cur}{obs.prev_price:.2f} ({obs.change_pct:+.1f}%)")
+    if low is not None:
+        recent = f"{cur}{low_30:.2f}" if low_30 is not None else "n/a"
+        lines.append(f"*Low:* {cur}{low:.2f} all-time, {recent} 30d")
+    stats = ctx.analytics.get(key)
+    if stats:
+        lines.append(
+            f"*Range:* p10 {cur}{stats.p10:.2f} / p50 {cur}{stats.p50:.2f} / "
+            f"p90 {cur}{stats.p90:.2f}, volatility {stats.volatility * 100:.1f}%"
+        )
+    lines.append(f"*State:* {ctx.health.get(obs.url).state}")
+    return "\n".join(lines)
+
+
+def answer_lows(ctx: TrackerContext, n: int = 10) -> str:
+    flags = ctx.analytics.low_flags({k: o.price for k, o in ctx.index.latest.items()})
+    at_low = []
+    for key, days in flags.items():
+        obs = ctx.index.latest[key]
+        stats = ctx.analytics.get(key)
+        if stats.p90 > obs.price:
+            at_low.append((days, (obs.price / stats.p90 - 1) * 100, obs))
+    if not at_low:
+        return "Nothing is at a recent low right now"
+    at_low.sort(key=lambda t: (-t[0], t[1]))
+    return "📉 At low:\n" + "\n".join(
+        f"{days}d  {pct:+.0f}% vs p90  {currency_for_key(o.key)}{o.price:.2f}  {o.name[:40]} ({o.key})"
+        for days, pct, o in at_low[:n]
+    )
+
+
+def answer_movers(ctx: TrackerContext, n: int = 10) -> str:
+    movers = ctx.index.movers(n, since=time.time() - 86400)
+    if not movers:
+        return "No price changes in the last 24h"
+    lines = ["📊 Movers (24h):"]
+    for o in movers:
+        cur = currency_for_key(o.key)
+        lines.append(
+            f"{o.change_pct:+.1f}%  {cur}{o.prev_price:.2f}→{cur}{o.price:.2f}  {o.name[:40]} ({o.key})"
+        )
+    return "\n".join(lines)
+
+
+def answer_add(ctx: TrackerContext, chat_id: str, arg: str) -> str:
+    key = parse_item_arg(arg)
+    if not key:
+        return "Usage: /add <ASIN> or /add amazon.ca:<ASIN>"
+    sub = next((s for s in ctx.subscribers if str(s.chat_id) == chat_id), None)
+    if sub is None:
+        return "This chat has no watchlist"
+
+    market, _, asin = key.rpartition(":")
+    market_obj = MARKETPLACES[market or DEFAULT_MARKETPLACE]
+    url = market_obj.dp_url(asin)
+    if ctx.watchlist.has_subscription(url, sub.name):
+        return f"{key} is already on your watchlist"
+
+    # The text file stays the source of truth; the DB row makes it live now
+    with open(sub.watchlist, "a+") as f:
+        f.seek(0, os.SEEK_END)
+        needs_newline = False
+        if f.tell():
+            f.seek(f.tell() - 1)
+            needs_newline = f.read(1) != "\n"
+        f.write(("\n" if needs_newline else "") + key + "\n")
+    ctx.watchlist.add(sub.name, WatchEntry(url, "amazon", market_obj.key, key))
+    logger.info(f"/add {key} by {sub.name}")
+    return f"✅ Added {key}; first check next cycle"
+
+
+def handle_command(ctx: TrackerContext, chat_id: str, text: str) -> Optional[str]:
+    cmd, _, arg = text.strip().partition(" ")
+    cmd = cmd.split("@")[0].lower()
+    if cmd == "/price":
+        return answer_price(ctx, arg)
+    if cmd == "/lows":
+        return answer_lows(ctx)
+    if cmd == "/movers":
+        return answer_movers(ctx)
+    if cmd == "/add":
+        return answer_add(ctx, chat_id, arg)
+    if cmd in ("/help", "/start"):
+        return "/price <asin>, /lows, /movers, /add <asin>"
+    return None
+
+
+async def command_loop(ctx: TrackerContext) -> None:
+    """Long-poll Telegram for commands from subscriber chats."""
+    bot = Bot(token=TELEGRAM_TOKEN)
+    offset: Optional[int] = None
+    while True:
+        try:
+            updates = await bot.get_updates(
+                offset=offset, timeout=COMMAND_POLL_TIMEOUT, allowed_updates=["message"]
+            )
+        except Exception as e:
+            logger.warning(f"getUpdates failed: {str(e)[:120]}")
+            await asyncio.sleep(COMMAND_POLL_TIMEOUT)
+            continue
+
+        allowed = {str(s.chat_id) for s in ctx.subscribers}
+        for update in updates:
+            offset = update.update_id + 1
+            msg = update.message
+            if not msg or not msg.text or not msg.text.startswith("/"):
+                continue
+            chat_id = str(msg.chat_id)
+            if chat_id not in allowed:
+                logger.info(f"Ignoring command from unknown chat {chat_id}")
+                continue
+            try:
+                reply = handle_command(ctx, chat_id, msg.text)
+                if reply:
+                    await send_telegram(reply, chat_id)
+            except Exception as e:
+                logger.warning(f"Command {msg.text[:30]!r} failed: {e}")
 
 
 # ---------- Main loop: 1x/day polling ----------
 
+def make_client(key: str, learned: Dict[str, float]) -> MarketClient:
+    """Amazon marketplaces share the RATE_* bounds; retailers bring their own."""
+    if key in SITE_ADAPTERS:
+        adapter = SITE_ADAPTERS[key]
+        start, low, high = adapter.rate_start, adapter.rate_min, adapter.rate_max
+    else:
+        start, low, high = RATE_START, RATE_MIN, RATE_MAX
+    return MarketClient(
+        market=market_for_key(key),
+        rate=RateController(
+            rate=min(high, max(low, learned.get(key, start))),
+            min_rate=low,
+            max_rate=high,
+            increase=RATE_INCREASE,
+            decrease=RATE_DECREASE,
+        ),
+        breaker=CircuitBreaker(threshold=BREAKER_THRESHOLD, cooldown=BREAKER_COOLDOWN),
+    )
+
+
+async def poll_marketplace(client: MarketClient, ctx: TrackerContext) -> Dict[str, int]:
+    """One cycle over a single domain; runs concurrently with the others."""
+    tag = client.market.key
+    client.rate.reset_counters()
+    counts = {"checked": 0, "bulk": 0, "family": 0}
+
+    bulk_prices: Dict[str, float] = {}
+    for list_url in BULK_LIST_URLS:
+        if marketplace_for_url(list_url) == client.market:
+            bulk_prices.update(await harvest_list_prices(list_url, client))
+    if bulk_prices:
+        logger.info(f"[{tag}] Bulk lists: {len(bulk_prices)} priced ASINs")
+
+    # Due items come from the DB in batches; each batch is shuffled and
+    # family-ordered on its own, so nothing scales with the watchlist size
+    now = time.time()
+    due = ctx.watchlist.count(tag, due_before=now)
+    done = 0
+    for rows in ctx.watchlist.iter_due(tag, now):
+        batch = [item_from_row(ctx, row) for row in rows]
+        random.shuffle(batch)
+        for item in order_by_family(batch, ctx.families):
+            done += 1
+            logger.info(
+                f"[{tag}] Progress: {done}/{due} @ {client.rate.rate:.0f} req/hr"
+            )
+            source = await check_without_fetch(item, ctx, bulk_prices)
+            if source:
+                counts[source] += 1
+            elif await check_item(item, ctx, client):
+                counts["checked"] += 1
+            ctx.watchlist.set_next_check(item.url, ctx.health.get(item.url).next_check)
+        ctx.watchlist.commit()
+
+    await drain_verifications(client, ctx)
+    return counts
+
+
 async def main() -> None:
-    items = load_watchlist(WATCHLIST_FILE)
-    if not items:
-        logger.info("No Amazon items in watchlist.")
+    subscribers = load_subscribers(SUBSCRIBERS_FILE, TELEGRAM_CHAT_ID, WATCHLIST_FILE)
+    watchlist = WatchlistDB(WATCHLIST_DB)
+    sync_watchlists(watchlist, subscribers)
+    if not watchlist.count():
+        logger.info("No items in watchlist.")
         return
 
-    valid_sellers = load_valid_sellers(VALID_SELLERS_FILE)
-    state = load_state(STATE_FILE)
+    ctx = TrackerContext(
+        state=load_state(STATE_FILE),
+        valid_sellers=load_valid_sellers(VALID_SELLERS_FILE),
+        health=HealthTracker(HEALTH_FILE),
+        families=FamilyIndex(FAMILY_FILE),
+        index=PriceIndex(INDEX_FILE),
+        history=HistoryStore(HISTORY_FILE),
+        verify=VerifyQueue(VERIFY_DELAY),
+        browser=BrowserPool(size=BROWSER_PAGES, max_per_cycle=BROWSER_MAX_PER_CYCLE),
+        selectors=SelectorStats(SELECTOR_STATS_FILE),
+        analytics=PriceAnalytics(ANALYTICS_WINDOWS),
+        subscribers=subscribers,
+        watchlist=watchlist,
+    )
+    state, health, families = ctx.state, ctx.health, ctx.families
+
+    # Fail counters / flat cooldowns now live in the health tracker
+    for k in [k for k in state if k.endswith((":fails", ":cooldown_until"))]:
+        del state[k]
+
+    learned = load_rates(RATE_STATE_FILE)
+    clients: Dict[str, MarketClient] = {}
+    if BROWSER_FALLBACK:
+        await ctx.browser.start()
+
+    # /price, /lows, /movers, /add answered from memory between cycles
+    commands = asyncio.create_task(command_loop(ctx))
 
     from config import POLL_INTERVAL
     interval_hours = POLL_INTERVAL / 3600
-    logger.info(f"🚀 Amazon Tracker - Every {interval_hours:.0f}hr (POLL_INTERVAL={POLL_INTERVAL}s) STARTED!")
+    logger.info(
+        f"🚀 Amazon Tracker - Every {interval_hours:.0f}hr (POLL_INTERVAL={POLL_INTERVAL}s) "
+        f"STARTED! Marketplaces: {', '.join(watchlist.marketplaces()) or 'none'}"
+    )
 
     while True:
         # Run full cycle immediately
-        logger.info(f"🕐 POLLING NOW {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} - {len(items)} items")
-
-        shuffled_items = items.copy()
-        random.shuffle(shuffled_items)
-
-        for i, item in enumerate(shuffled_items):
-            logger.info(f"Progress: {(i+1)/len(items)*100:.0f}%")
-            await check_item(item, state, valid_sellers)
-            if i < len(items) - 1:
-                await asyncio.sleep(random.uniform(4, 10))
-
-        active_items = len([k for k in state if not k.endswith((":fails", ":cooldown"))])
+        sync_watchlists(watchlist, subscribers)
+        item_count = watchlist.count()
+        logger.info(f"🕐 POLLING NOW {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} - {item_count} items")
+        families.start_cycle()
+        ctx.verify.reset_counters()
+        ctx.browser.reset_budget()
+        ctx.selectors.reset_cycle()
+        ctx.analytics.refresh(ctx.history.series)
+
+        markets = watchlist.marketplaces()
+        for k in markets:
+            if k not in clients:
+                clients[k] = make_client(k, learned)
+
+        # Each marketplace and retailer has its own pool, pacing and breaker,
+        # so a block on one domain never stalls the others
+        results = await asyncio.gather(*(poll_marketplace(clients[k], ctx) for k in markets))
+
+        active_items = len([k for k in state if "#rule:" not in k])
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        summary_msg = f"✅ Every {interval_hours:.0f}hr: {active_items}/{len(items)} @ {timestamp}"
+        market_lines = []
+        totals = {"checked": 0, "bulk": 0, "family": 0}
+        total_items_hr = 0.0
+        for key, counts in zip(markets, results):
+            client = clients[key]
+            priced = sum(counts.values())
+            fetches_per_item = client.rate.requests / priced if priced else 2.0
+            items_hr = client.rate.items_per_hour(fetches_per_item)
+            total_items_hr += items_hr
+            market_lines.append(
+                f"  {key}: {items_hr:.0f} items/hr ({client.rate.rate:.0f} req/hr, "
+                f"{client.rate.blocks} blocks{', OPEN' if client.breaker.is_open else ''})"
+            )
+            for k, v in counts.items():
+                totals[k] += v
+        health_counts = health.counts()
+        summary_msg = (
+            f"✅ Every {interval_hours:.0f}hr: {active_items}/{item_count} @ {timestamp}\n"
+            f"⚡ {total_items_hr:.0f} items/hr\n"
+            + "\n".join(market_lines)
+            + f"\n🩺 checked {totals['checked']}, bulk {totals['bulk']}, "
+            f"family {totals['family']}, verified {ctx.verify.confirmed}, "
+            f"discarded {ctx.verify.discarded}, browser {ctx.browser.used}, "
+            f"{ctx.selectors.summary()}, "
+            + ", ".join(f"{k} {v}" for k, v in health_counts.items() if v)
+        )
         await send_telegram(summary_msg)
         save_state(STATE_FILE, state)
+        save_rates(RATE_STATE_FILE, {k: c.rate for k, c in clients.items()})
+        health.save()
+        families.save()
+        ctx.index.save()
+        ctx.history.flush()
+        ctx.selectors.save()
+        if commands.done() and commands.exception():
+            logger.error(f"Command loop died: {commands.exception()}; restarting")
+            commands = asyncio.create_task(command_loop(ctx))
 
         # Sleep for configured interval with ±10% jitter
         jitter_seconds = random.uniform(-POLL_INTERVAL * 0.1, POLL_INTERVAL * 0.1)
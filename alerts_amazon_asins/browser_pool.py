@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+
+import asyncio
+import logging
+from typing import Optional
+
+try:
+    from playwright.async_api import async_playwright
+except ImportError:  # optional: only needed for the CAPTCHA fallback
+    async_playwright = None
+
+logger = logging.getLogger("AmazonTracker")
+
+BLOCKED_RESOURCES = {"image", "font", "media"}
+
+
+# ---------- Long-lived headless browser (CAPTCHA fallback) ----------
+
+class BrowserPool:
+    """One Chromium, one context and a few reusable pages for the whole run.
+
+    Launching a browser per item is what made the Playwright tracker
+    unusable on the Pi. Here the launch cost is paid once, images, fonts
+    and media are never downloaded, and `max_per_cycle` bounds how many
+    items can take this path.
+    """
+
+    def __init__(self, size: int = 2, max_per_cycle: int = 10, timeout_ms: int = 45000):
+        self.size = size
+        self.max_per_cycle = max_per_cycle
+        self.timeout_ms = timeout_ms
+        self.used = 0
+        self._pw = None
+        self._browser = None
+        self._context = None
+        self._pages: Optional[asyncio.Queue] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self._context is not None
+
+    def budget_left(self) -> bool:
+        return self.enabled and self.used < self.max_per_cycle
+
+    def reset_budget(self) -> None:
+        self.used = 0
+
+    async def start(self) -> None:
+        if async_playwright is None:
+            logger.info("Playwright not installed; browser fallback disabled")
+            return
+        try:
+            self._pw = await async_playwright().start()
+            self._browser = await self._pw.chromium.launch(
+                headless=True,
+                args=[
+                    "--no-sandbox",
+                    "--disable-dev-shm-usage",
+                    "--disable-gpu",
+                    "--disable-background-timer-throttling",
+                ],
+            )
+            self._context = await self._browser.new_context(
+                user_agent=(
+                    "Mozilla/5.0 (X11; Linux aarch64) AppleWebKit/537.36 "
+                    "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+                ),
+                locale="en-US",
+            )
+            await self._context.route("**/*", self._filter)
+            self._pages = asyncio.Queue()
+            for _ in range(self.size):
+                await self._pages.put(await self._context.new_page())
+            logger.info(f"Browser pool started with {self.size} pages")
+        except Exception as e:
+            logger.warning(f"Browser pool failed to start: {e}")
+            await self.close()
+
+    async def _filter(self, route) -> None:
+        if route.request.resource_type in BLOCKED_RESOURCES:
+            await route.abort()
+        else:
+            await route.continue_()
+
+    async def fetch(self, url: str) -> Optional[str]:
+        """Render one URL on a pooled page and return its HTML."""
+        if not self.enabled:
+            return None
+        self.used += 1
+        page = await self._pages.get()
+        try:
+            await page.goto(url, wait_until="domcontentloaded", timeout=self.timeout_ms)
+            return await page.content()
+        except Exception as e:
+            logger.warning(f"Browser fetch failed {url}: {str(e)[:120]}")
+            # A crashed/hung page is replaced rather than reused
+            try:
+                await page.close()
+                page = await self._context.new_page()
+            except Exception:
+                pass
+            return None
+        finally:
+            await self._pages.put(page)
+
+    async def close(self) -> None:
+        for closer in (self._context, self._browser):
+            if closer is not None:
+                try:
+                    await closer.close()
+                except Exception:
+                    pass
+        if self._pw is not None:
+            await self._pw.stop()
+        self._pw = self._browser = self._context = None
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+
+import struct
+from array import array
+from bisect import bisect_right
+from typing import List, Optional, Tuple
+
+assert array("I").itemsize == 4 and array("i").itemsize == 4
+
+_HEADER = struct.Struct("<IIii")     # runs, last_ts, min cents, max cents
+
+
+def to_cents(price: float) -> int:
+    return int(round(price * 100))
+
+
+# ---------- Run-length price series ----------
+
+class PriceSeries:
+    """One item's price history as change points only.
+
+    A run starts at `ts[i]` with price `cents[i]` and lasts until the next
+    change point (or `last_ts` for the current one). An hourly-polled item
+    whose price moves a few times a month costs a few dozen 8-byte runs a
+    year instead of thousands of tuples of Python floats.
+    """
+
+    __slots__ = ("ts", "cents", "last_ts", "_min", "_max")
+
+    def __init__(self) -> None:
+        self.ts = array("I")
+        self.cents = array("i")
+        self.last_ts = 0
+        self._min = 0
+        self._max = 0
+
+    def __len__(self) -> int:
+        return len(self.ts)
+
+    def append(self, ts: float, price: float) -> bool:
+        """Record an observation; returns True when it starts a new run."""
+        ts, c = int(ts), to_cents(price)
+        self.last_ts = max(self.last_ts, ts)
+        if self.cents and self.cents[-1] == c:
+            return False
+        if self.ts and ts < self.ts[-1]:
+            return False    # out-of-order observation inside a known run
+        if not self.cents:
+            self._min = self._max = c
+        else:
+            self._min = min(self._min, c)
+            self._max = max(self._max, c)
+        self.ts.append(ts)
+        self.cents.append(c)
+        return True
+
+    @property
+    def current(self) -> Optional[float]:
+        return self.cents[-1] / 100 if self.cents else None
+
+    @property
+    def low(self) -> Optional[float]:
+        return self._min / 100 if self.cents else None
+
+    @property
+    def high(self) -> Optional[float]:
+        return self._max / 100 if self.cents else None
+
+    def _first_run(self, since: float) -> int:
+        """Index of the run in effect at `since` (0 if it predates the series)."""
+        return max(bisect_right(self.ts, int(since)) - 1, 0)
+
+    def at(self, ts: float) -> Optional[float]:
+        i = bisect_right(self.ts, int(ts)) - 1
+        return self.cents[i] / 100 if i >= 0 else None
+
+    def low_since(self, since: float) -> Optional[float]:
+        if not self.cents or since > self.last_ts:
+            return None
+        return min(self.cents[self._first_run(since):]) / 100
+
+    def high_since(self, since: float) -> Optional[float]:
+        if not self.cents or since > self.last_ts:
+            return None
+        return max(self.cents[self._first_run(since):]) / 100
+
+    def runs(self) -> List[Tuple[int, float]]:
+        return [(t, c / 100) for t, c in zip(self.ts, self.cents)]
+
+    # Bulk (de)serialization: header + raw array bytes, no per-point work
+
+    def to_bytes(self) -> bytes:
+        return (
+            _HEADER.pack(len(self.ts), self.last_ts, self._min, self._max)
+            + self.ts.tobytes()
+            + self.cents.tobytes()
+        )
+
+    @classmethod
+    def from_bytes(cls, buf: memoryview, offset: int = 0) -> Tuple["PriceSeries", int]:
+        n, last_ts, lo, hi = _HEADER.unpack_from(buf, offset)
+        offset += _HEADER.size
+        s = cls()
+        s.ts.frombytes(buf[offset:offset + 4 * n])
+        offset += 4 * n
+        s.cents.frombytes(buf[offset:offset + 4 * n])
+        offset += 4 * n
+        s.last_ts, s._min, s._max = last_ts, lo, hi
+        return s, offset
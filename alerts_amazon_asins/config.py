@@ -4,3 +4,52 @@ WATCHLIST_FILE = "amazon_watchlist.txt"
 STATE_FILE = "amazon_state.json"
 POLL_INTERVAL = 3600
 VALID_SELLERS_FILE = "valid_sellers.txt"
+
+# AIMD request pacing (requests/hour, shared by offers + /dp fetches)
+RATE_STATE_FILE = "amazon_rate.json"
+RATE_START = 300
+RATE_MIN = 60
+RATE_MAX = 900
+RATE_INCREASE = 5
+RATE_DECREASE = 0.5
+
+# Per-item health (healthy / oos / no_valid_seller / blocked / dead)
+HEALTH_FILE = "amazon_health.json"
+
+# Learned variant -> parent ASIN links (one family page serves many variants)
+FAMILY_FILE = "amazon_families.json"
+
+# Public wish lists / list pages harvested once per cycle (one fetch, many prices)
+BULK_LIST_URLS = []
+BULK_LIST_MAX_PAGES = 20
+
+# Per-marketplace circuit breaker (consecutive blocks before pausing a domain)
+BREAKER_THRESHOLD = 3
+BREAKER_COOLDOWN = 900
+
+# Per-person watchlists: [{"name": ..., "chat_id": ..., "watchlist": ..., "min_drop_pct": 0}]
+# Missing file = TELEGRAM_CHAT_ID watching WATCHLIST_FILE
+SUBSCRIBERS_FILE = "subscribers.json"
+
+# /price /lows /movers /add: latest-observation snapshot + full history
+INDEX_FILE = "amazon_index.json"
+HISTORY_FILE = "amazon_history.bin"   # an existing amazon_history.csv is imported once
+COMMAND_POLL_TIMEOUT = 30
+
+# Seconds a detected price change waits before its confirming re-fetch
+VERIFY_DELAY = 300
+
+# Optional Playwright fallback for items whose static fetch keeps hitting CAPTCHA
+BROWSER_FALLBACK = False
+BROWSER_PAGES = 2
+BROWSER_MAX_PER_CYCLE = 10
+BROWSER_AFTER_BLOCKS = 2
+
+# Learned per-item seller/price selectors and aggregate hit stats
+SELECTOR_STATS_FILE = "amazon_selectors.json"
+
+# "Lowest in N days" windows computed over the price history each cycle
+ANALYTICS_WINDOWS = [7, 30, 90, 365]
+
+# Indexed watchlist; the text watchlists are re-imported into it when edited
+WATCHLIST_DB = "amazon_watchlist.db"
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass, asdict
+from enum import Enum
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger("AmazonTracker")
+
+
+class ItemState(str, Enum):
+    HEALTHY = "healthy"
+    OOS = "oos"
+    NO_SELLER = "no_valid_seller"
+    BLOCKED = "blocked"
+    DEAD = "dead"
+
+
+# (first re-check delay, max delay) in seconds; doubles per repeat observation
+RECHECK_SCHEDULE: Dict[ItemState, Tuple[float, float]] = {
+    ItemState.OOS: (6 * 3600, 3 * 86400),
+    ItemState.NO_SELLER: (6 * 3600, 3 * 86400),
+    ItemState.BLOCKED: (2 * 3600, 12 * 3600),
+    ItemState.DEAD: (24 * 3600, 14 * 86400),
+}
+
+# HTML-but-no-price misses before an otherwise healthy item is declared dead
+MAX_UNKNOWN_MISSES = 6
+
+
+@dataclass
+class ItemHealth:
+    state: str = ItemState.HEALTHY.value
+    streak: int = 0
+    misses: int = 0
+    since: float = 0.0
+    next_check: float = 0.0
+
+
+# ---------- Per-item health state machine ----------
+
+class HealthTracker:
+    """Tracks healthy / OOS / no-seller / blocked / dead state per item URL.
+
+    Non-healthy states back off exponentially so fetches are not spent on
+    items that cannot produce a price.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.items: Dict[str, ItemHealth] = {}
+        self._load()
+
+    def _load(self) -> None:
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path) as f:
+                raw = json.load(f)
+            self.items = {url: ItemHealth(**rec) for url, rec in raw.items()}
+            logger.info(f"Loaded health for {len(self.items)} items")
+        except Exception as e:
+            logger.info(f"Failed to load health {self.path}: {e}")
+
+    def save(self) -> None:
+        tmp = self.path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump({u: asdict(h) for u, h in self.items.items()}, f, indent=2)
+        os.replace(tmp, self.path)
+
+    def get(self, url: str) -> ItemHealth:
+        return self.items.setdefault(url, ItemHealth(since=time.time()))
+
+    def is_due(self, url: str, now: Optional[float] = None) -> bool:
+        h = self.items.get(url)
+        if h is None:
+            return True
+        return (now or time.time()) >= h.next_check
+
+    def record(
+        self, url: str, state: ItemState, now: Optional[float] = None
+    ) -> Tuple[ItemState, ItemState]:
+        """Apply an observation; returns (old_state, new_state)."""
+        now = now or time.time()
+        h = self.get(url)
+        old = ItemState(h.state)
+
+        if state == old:
+            h.streak += 1
+        else:
+            h.state = state.value
+            h.streak = 1
+            h.since = now
+
+        if state == ItemState.HEALTHY:
+            h.misses = 0
+            h.next_check = 0.0
+        else:
+            base, cap = RECHECK_SCHEDULE[state]
+            h.next_check = now + min(cap, base * 2 ** (h.streak - 1))
+
+        if old != state:
+            logger.info(f"Health {old.value} -> {state.value}: {url}")
+        return old, state
+
+    def record_miss(self, url: str, now: Optional[float] = None) -> int:
+        """HTML came back but no rule classified it; returns the miss count."""
+        h = self.get(url)
+        h.misses += 1
+        if h.misses >= MAX_UNKNOWN_MISSES:
+            self.record(url, ItemState.DEAD, now)
+        elif h.state != ItemState.HEALTHY.value:
+            # Keep backing off in whatever state we were already in
+            self.record(url, ItemState(h.state), now)
+        return h.misses
+
+    def counts(self) -> Dict[str, int]:
+        out: Dict[str, int] = {s.value: 0 for s in ItemState}
+        for h in self.items.values():
+            out[h.state] = out.get(h.state, 0) + 1
+        return out
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+
+import asyncio
+import logging
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from rate_control import RateController, CircuitBreaker
+
+logger = logging.getLogger("AmazonTracker")
+
+
+# ---------- Marketplaces ----------
+
+@dataclass(frozen=True)
+class Marketplace:
+    key: str              # "amazon.com", also the watchlist prefix ("amazon.ca:B0...")
+    domain: str           # "www.amazon.com"
+    currency: str
+    decimal: str          # decimal separator used in prices
+    thousands: str        # grouping separator(s)
+    accept_language: str
+
+    def dp_url(self, asin: str) -> str:
+        return f"https://{self.domain}/dp/{asin}"
+
+    def offers_url(self, asin: str) -> str:
+        return f"https://{self.domain}/gp/offer-listing/{asin}"
+
+
+MARKETPLACES: Dict[str, Marketplace] = {
+    m.key: m
+    for m in (
+        Marketplace("amazon.com", "www.amazon.com", "$", ".", ",", "en-US,en;q=0.5"),
+        Marketplace("amazon.ca", "www.amazon.ca", "$", ".", ",", "en-CA,en;q=0.8,fr-CA;q=0.5"),
+        Marketplace("amazon.co.uk", "www.amazon.co.uk", "£", ".", ",", "en-GB,en;q=0.5"),
+        Marketplace("amazon.de", "www.amazon.de", "€", ",", ".  ", "de-DE,de;q=0.8,en;q=0.5"),
+    )
+}
+
+DEFAULT_MARKETPLACE = "amazon.com"
+
+
+def marketplace_for_url(url: str) -> Optional[Marketplace]:
+    host = urlparse(url).netloc.lower()
+    for m in MARKETPLACES.values():
+        if host == m.domain or host == m.key:
+            return m
+    return None
+
+
+def parse_price_locale(text: str, market: Optional[Marketplace] = None) -> Optional[float]:
+    """Parse '1,234.56' / '1.234,56' / '1 234,56' using the marketplace's separators."""
+    market = market or MARKETPLACES[DEFAULT_MARKETPLACE]
+    dec = re.escape(market.decimal)
+    grp = "[" + re.escape(market.thousands) + "]"
+    m = re.search(rf"\d{{1,3}}(?:{grp}\d{{3}})*{dec}\d{{2}}", text)
+    if not m:
+        return None
+    digits = re.sub(grp, "", m.group(0)).replace(market.decimal, ".")
+    try:
+        return float(digits)
+    except ValueError:
+        return None
+
+
+# ---------- Per-domain client: pool + rate limiter + circuit breaker ----------
+
+@dataclass
+class MarketClient:
+    """Everything one marketplace polls with; never shared across domains."""
+    market: Marketplace
+    rate: RateController
+    breaker: CircuitBreaker
+    session: requests.Session = field(default_factory=requests.Session)
+
+    def __post_init__(self) -> None:
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=4)
+        self.session.mount("https://", adapter)
+
+    def on_success(self) -> None:
+        self.rate.on_success()
+        self.breaker.on_success()
+
+    def on_block(self) -> None:
+        self.rate.on_block()
+        self.breaker.on_block(self.market.key)
+
+    async def wait(self) -> None:
+        """Hold while this domain's breaker is open, then take a rate slot."""
+        remaining = self.breaker.remaining()
+        if remaining > 0:
+            logger.warning(
+                f"[{self.market.key}] circuit open, pausing {remaining/60:.0f} min"
+            )
+            await asyncio.sleep(remaining)
+        await self.rate.wait()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+
+import re
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+
+@dataclass
+class Offer:
+    seller: str        # lower-cased seller name as shown on the offers page
+    price: float
+    condition: str     # lower-cased, e.g. "new", "used - like new"
+    valid_seller: bool
+
+
+# Condition classes an offer heading starts with; rules compare classes
+CONDITION_CLASSES = ("new", "used", "renewed", "collectible")
+CONDITION_ALIASES = {"refurbished": "renewed"}
+
+
+def condition_class(text: str) -> Tuple[str, str]:
+    """'Used - Like New' -> ('used', 'like new'); 'Amazon Renewed' -> ('renewed', '')."""
+    text = re.sub(r"\s+", " ", text.lower()).strip()
+    head, _, detail = text.partition(" - ")
+    for word in re.findall(r"[a-z]+", head):
+        word = CONDITION_ALIASES.get(word, word)
+        if word in CONDITION_CLASSES:
+            return word, detail.strip()
+    return head.strip(), detail.strip()
+
+
+@dataclass
+class AlertRule:
+    """`seller:condition<price` from a watchlist line.
+
+    seller is a case-insensitive substring; an empty seller (":new<80")
+    means "any seller in valid_sellers.txt". A bare condition ("new<80")
+    is read as ":new<80". condition names a class (new, used,
+    renewed, collectible), optionally narrowed by a sub-condition prefix
+    ("used - like new", "used - very"); an empty condition means any.
+    The price must be strictly below max_price.
+    """
+    seller: str
+    condition: str
+    max_price: float
+
+    @property
+    def label(self) -> str:
+        who = self.seller or "valid seller"
+        what = f" {self.condition}" if self.condition else ""
+        return f"{who}{what} < ${self.max_price:.2f}"
+
+    def matches(self, offer: Offer) -> bool:
+        if self.seller:
+            if self.seller not in offer.seller:
+                return False
+        elif not offer.valid_seller:
+            return False
+        if self.condition:
+            rule_class, rule_detail = condition_class(self.condition)
+            offer_class, offer_detail = condition_class(offer.condition)
+            if rule_class != offer_class or not offer_detail.startswith(rule_detail):
+                return False
+        return offer.price < self.max_price
+
+    def best(self, offers: List[Offer]) -> Optional[Offer]:
+        hits = [o for o in offers if self.matches(o)]
+        return min(hits, key=lambda o: o.price) if hits else None
+
+
+RULE_RE = re.compile(
+    r"^\s*(?P<seller>[^:<]*?)\s*(?::\s*(?P<cond>[^<]*?)\s*)?<\s*\$?(?P<price>\d+(?:\.\d+)?)\s*$"
+)
+
+
+def parse_rule(text: str) -> Optional[AlertRule]:
+    """'amazon warehouse:used - like new<45' -> AlertRule, or None if malformed."""
+    m = RULE_RE.match(text)
+    if not m:
+        return None
+    seller = m.group("seller").strip().lower()
+    condition = (m.group("cond") or "").strip().lower()
+    # "new<80" means ":new<80"; no seller is called "new" or "used - good"
+    head = seller.partition(" - ")[0].strip()
+    if m.group("cond") is None and CONDITION_ALIASES.get(head, head) in CONDITION_CLASSES:
+        seller, condition = "", seller
+    return AlertRule(seller=seller, condition=condition, max_price=float(m.group("price")))
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+
+import logging
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+from compact_series import PriceSeries
+
+logger = logging.getLogger("AmazonTracker")
+
+DAY = 86400
+
+
+@dataclass
+class SeriesStats:
+    """One item's history summary as of the start of the cycle.
+
+    Percentiles, pct_rank and volatility weight each run by its duration.
+    """
+    n: int                          # price runs (change points)
+    last: float
+    low: float
+    window_lows: Dict[int, float]   # days -> lowest price in that window, if covered
+    p10: float
+    p50: float
+    p90: float
+    pct_rank: float                 # % of time at or below `last`
+    volatility: float               # time-weighted std of run-to-run relative change
+
+    def low_days(self, price: float) -> int:
+        """Longest configured window in which `price` would be the lowest."""
+        days = [d for d, low in self.window_lows.items() if price <= low + 0.005]
+        return max(days) if days else 0
+
+    def is_all_time_low(self, price: float) -> bool:
+        return price <= self.low + 0.005
+
+
+# ---------- Vectorized per-cycle history analytics ----------
+
+class PriceAnalytics:
+    """Rolling lows, percentiles and volatility for every series at once.
+
+    All series are concatenated into one (ts, price) array with segment
+    offsets, so each statistic is a single reduceat/bincount pass instead
+    of a Python loop per item. refresh() runs once per cycle; alerts then
+    compare a new price against the precomputed window lows in O(1).
+    """
+
+    def __init__(self, windows: Sequence[int] = (7, 30, 90, 365)):
+        self.windows = sorted(windows)
+        self.index: Dict[str, int] = {}
+        self.columns: Dict[str, np.ndarray] = {}
+
+    def refresh(self, series: Dict[str, PriceSeries], now: Optional[float] = None) -> None:
+        started = time.perf_counter()
+        now = now or time.time()
+        keys = [k for k, s in series.items() if len(s)]
+        self.index = {k: i for i, k in enumerate(keys)}
+        if not keys:
+            self.columns = {}
+            return
+
+        # The runs' array('I')/array('i') buffers are viewed, not copied per point
+        lengths = np.fromiter((len(series[k]) for k in keys), dtype=np.int64, count=len(keys))
+        ts = np.concatenate([np.frombuffer(series[k].ts, dtype=np.uint32) for k in keys])
+        price = np.concatenate(
+            [np.frombuffer(series[k].cents, dtype=np.int32) for k in keys]
+        ) / 100
+        starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        seg = np.repeat(np.arange(len(keys)), lengths)
+        last_idx = starts + lengths - 1
+        last = price[last_idx]
+
+        # A run counts toward a window if it was still in effect inside it
+        ends = np.empty(len(ts), dtype=np.float64)
+        ends[:-1] = ts[1:]
+        ends[last_idx] = np.fromiter(
+            (series[k].last_ts for k in keys), dtype=np.float64, count=len(keys)
+        )
+
+        # A window only has a low once the history reaches back to its start,
+        # so three days of data never claim "lowest in 365 days"
+        first = ts[starts]
+        cols = {"n": lengths, "last": last, "low": np.minimum.reduceat(price, starts)}
+        for days in self.windows:
+            since = now - days * DAY
+            in_window = np.where(ends >= since, price, np.inf)
+            low = np.minimum.reduceat(in_window, starts)
+            cols[f"low_{days}"] = np.where(first <= since, low, np.inf)
+
+        # Every statistic below weights a run by how long it was in effect,
+        # so an hour-long glitch price counts for an hour, not one vote
+        dur = np.maximum(ends - ts, 1.0)
+        total = np.bincount(seg, weights=dur, minlength=len(keys))
+
+        # Percentiles: sort by (series, price), then find where each segment's
+        # cumulative time crosses q% of its total (cumsum is global, increasing)
+        order = np.lexsort((price, seg))
+        sorted_price = price[order]
+        cum = np.cumsum(dur[order])
+        before = cum[starts] - dur[order][starts]
+        for q in (10, 50, 90):
+            idx = np.searchsorted(cum, before + total * (q / 100), side="left")
+            cols[f"p{q}"] = sorted_price[np.clip(idx, starts, last_idx)]
+
+        at_or_below = np.bincount(
+            seg, weights=dur * (price <= last[seg] + 0.005), minlength=len(keys)
+        )
+        cols["pct_rank"] = at_or_below / total * 100
+
+        # Volatility over consecutive points of the same series only; each
+        # step is weighted by the shorter of the two runs it joins, so a
+        # brief glitch and its recovery both count for the glitch's length
+        same = seg[1:] == seg[:-1]
+        step = np.diff(price)[same] / np.maximum(price[:-1][same], 0.01)
+        w = np.minimum(dur[:-1], dur[1:])[same]
+        step_seg = seg[1:][same]
+        w0 = np.bincount(step_seg, weights=w, minlength=len(keys))
+        s1 = np.bincount(step_seg, weights=w * step, minlength=len(keys))
+        s2 = np.bincount(step_seg, weights=w * step * step, minlength=len(keys))
+        with np.errstate(invalid="ignore", divide="ignore"):
+            var = s2 / w0 - (s1 / w0) ** 2
+        cols["volatility"] = np.sqrt(np.clip(np.nan_to_num(var), 0, None))
+
+        self.columns = cols
+        logger.info(
+            f"Analytics: {len(keys)} series, {len(price)} runs "
+            f"in {(time.perf_counter() - started) * 1000:.0f} ms"
+        )
+
+    def get(self, key: str) -> Optional[SeriesStats]:
+        i = self.index.get(key)
+        if i is None:
+            return None
+        c = self.columns
+        return SeriesStats(
+            n=int(c["n"][i]),
+            last=float(c["last"][i]),
+            low=float(c["low"][i]),
+            window_lows={
+                d: float(c[f"low_{d}"][i])
+                for d in self.windows
+                if np.isfinite(c[f"low_{d}"][i])
+            },
+            p10=float(c["p10"][i]),
+            p50=float(c["p50"][i]),
+            p90=float(c["p90"][i]),
+            pct_rank=float(c["pct_rank"][i]),
+            volatility=float(c["volatility"][i]),
+        )
+
+    def low_flags(self, prices: Dict[str, float]) -> Dict[str, int]:
+        """key -> longest window (days) each current price is the low of, vectorized."""
+        keys = [k for k in prices if k in self.index]
+        if not keys:
+            return {}
+        idx = np.fromiter((self.index[k] for k in keys), dtype=np.int64, count=len(keys))
+        cur = np.fromiter((prices[k] for k in keys), dtype=np.float64, count=len(keys))
+        flags = np.zeros(len(keys), dtype=np.int64)
+        for days in self.windows:
+            low = self.columns[f"low_{days}"][idx]
+            hit = np.isfinite(low) & (cur <= low + 0.005)
+            flags = np.where(hit, days, flags)
+        return {k: int(f) for k, f in zip(keys, flags) if f}
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+
+import logging
+import os
+import struct
+import time
+from typing import Dict, List, Optional, Set
+
+from compact_series import PriceSeries
+
+logger = logging.getLogger("AmazonTracker")
+
+_MAGIC = b"PHS2"
+_MAGIC_V1 = b"PHS1"
+_COUNT = struct.Struct("<I")
+_KEYLEN = struct.Struct("<H")
+_TOUCH = struct.Struct("<HII")      # _TOUCH_MARK, seen at, count; then count u32 ids
+_TOUCH_MARK = 0xFFFF                # never a key length
+_ID = struct.Struct("<I")
+
+# Compact once superseded records outweigh the live ones by this factor
+_COMPACT_RATIO = 2
+
+
+# ---------- Compact price history ----------
+
+class HistoryStore:
+    """Every item's price history as run-length PriceSeries, one binary file.
+
+    The file is a log of records. A series record (key, series) replaces
+    any earlier one for that key and is written only when the series
+    starts a new run. Items whose price merely held get one touch record
+    per flush: the flush's latest observation time plus the ids (order of
+    first appearance in the file) of the series seen, 4 bytes each, which
+    moves their last_ts forward on load. Once superseded records pile up
+    the file is rewritten from the live series. Older PHS1 files and an
+    older `ts,key,price` CSV next to the file are imported the first time.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.series: Dict[str, PriceSeries] = {}
+        self._dirty: Set[str] = set()       # started a new run since the last flush
+        self._touched: Set[str] = set()     # only last_ts moved since the last flush
+        self._ids: Dict[str, int] = {}
+        self._live: Dict[str, int] = {}     # key -> size of its newest series record
+        self._file_size = 0
+        self._rewrite = True
+        self._load()
+
+    def _load(self) -> None:
+        if os.path.exists(self.path):
+            with open(self.path, "rb") as f:
+                buf = memoryview(f.read())
+            magic = bytes(buf[:4])
+            if magic not in (_MAGIC, _MAGIC_V1):
+                logger.warning(f"{self.path} is not a history file; starting empty")
+                return
+            offset, count = 4, None
+            if magic == _MAGIC_V1:
+                (count,), offset = _COUNT.unpack_from(buf, 4), 4 + _COUNT.size
+            keys: List[str] = []
+            records = 0
+            while offset < len(buf) and records != count:
+                try:
+                    end = self._read_record(buf, offset, keys)
+                except (struct.error, ValueError, IndexError, UnicodeDecodeError) as e:
+                    logger.warning(f"{self.path}: truncated record at byte {offset} ({e})")
+                    break
+                offset, records = end, records + 1
+            else:
+                # Clean PHS2 file: later flushes can append to it
+                self._rewrite = magic != _MAGIC
+            self._ids = {key: i for i, key in enumerate(keys)}
+            self._file_size = offset
+            runs = sum(len(s) for s in self.series.values())
+            logger.info(f"Loaded {runs} price runs for {len(self.series)} items")
+            return
+
+        legacy = os.path.splitext(self.path)[0] + ".csv"
+        if not os.path.exists(legacy):
+            return
+        rows = 0
+        with open(legacy) as f:
+            for line in f:
+                try:
+                    ts, key, price = line.rstrip("\n").split(",")
+                    self.append(key, float(price), float(ts))
+                    rows += 1
+                except ValueError:
+                    continue
+        logger.info(f"Imported {rows} CSV history rows for {len(self.series)} items")
+
+    def _read_record(self, buf: memoryview, offset: int, keys: List[str]) -> int:
+        """Apply the record at `offset`; returns the offset after it."""
+        (klen,) = _KEYLEN.unpack_from(buf, offset)
+        if klen == _TOUCH_MARK:
+            _, seen, n = _TOUCH.unpack_from(buf, offset)
+            end = offset + _TOUCH.size + n * _ID.size
+            if end > len(buf):
+                raise ValueError("touch record runs past the end of the file")
+            for (i,) in _ID.iter_unpack(buf[offset + _TOUCH.size:end]):
+                series = self.series[keys[i]]
+                series.last_ts = max(series.last_ts, seen)
+            return end
+
+        key = bytes(buf[offset + _KEYLEN.size:offset + _KEYLEN.size + klen]).decode()
+        series, end = PriceSeries.from_bytes(buf, offset + _KEYLEN.size + klen)
+        if end > len(buf):
+            raise ValueError("record runs past the end of the file")
+        if key not in self.series:
+            keys.append(key)
+        self.series[key], self._live[key] = series, end - offset
+        return end
+
+    def append(self, key: str, price: float, ts: Optional[float] = None) -> None:
+        series = self.series.get(key)
+        if series is None:
+            series = self.series[key] = PriceSeries()
+        last_ts = series.last_ts
+        if series.append(ts or time.time(), price):
+            self._dirty.add(key)
+        elif series.last_ts != last_ts:
+            self._touched.add(key)
+
+    def _record(self, key: str) -> bytes:
+        raw = key.encode()
+        return _KEYLEN.pack(len(raw)) + raw + self.series[key].to_bytes()
+
+    def flush(self) -> None:
+        if not self._dirty and not self._touched and not self._rewrite:
+            return
+        records = {key: self._record(key) for key in self._dirty}
+        added = sum(len(r) for r in records.values())
+        live = sum(self._live.values()) + added - sum(self._live.get(k, 0) for k in records)
+        touched = self._touched - self._dirty
+        if touched:
+            added += _TOUCH.size + _ID.size * len(touched)
+        if self._rewrite or self._file_size + added > _COMPACT_RATIO * (live + len(_MAGIC)):
+            self._compact()
+            return
+
+        # New keys get the next ids, in the order their records are written
+        for key in records:
+            self._ids.setdefault(key, len(self._ids))
+        parts = list(records.values())
+        if touched:
+            ids = sorted(self._ids[k] for k in touched)
+            seen = max(self.series[k].last_ts for k in touched)
+            parts.append(_TOUCH.pack(_TOUCH_MARK, seen, len(ids)) + b"".join(_ID.pack(i) for i in ids))
+        with open(self.path, "ab") as f:
+            f.write(b"".join(parts))
+        for key, record in records.items():
+            self._live[key] = len(record)
+        self._file_size += added
+        self._dirty.clear()
+        self._touched.clear()
+
+    def _compact(self) -> None:
+        records = {key: self._record(key) for key in self.series}
+        tmp = self.path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(_MAGIC + b"".join(records.values()))
+        os.replace(tmp, self.path)
+        self._ids = {key: i for i, key in enumerate(records)}
+        self._live = {key: len(r) for key, r in records.items()}
+        self._file_size = len(_MAGIC) + sum(self._live.values())
+        self._dirty.clear()
+        self._touched.clear()
+        self._rewrite = False
+
+    def low(self, key: str, since: Optional[float] = None) -> Optional[float]:
+        series = self.series.get(key)
+        if series is None:
+            return None
+        return series.low if since is None else series.low_since(since)
+
+    def high(self, key: str, since: Optional[float] = None) -> Optional[float]:
+        series = self.series.get(key)
+        if series is None:
+            return None
+        return series.high if since is None else series.high_since(since)
+
+    def at(self, key: str, ts: float) -> Optional[float]:
+        series = self.series.get(key)
+        return series.at(ts) if series else None
+
+    def keys(self) -> List[str]:
+        return list(self.series)
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional
+
+logger = logging.getLogger("AmazonTracker")
+
+
+@dataclass
+class Observation:
+    key: str               # "B0..." or "amazon.ca:B0..."
+    name: str
+    url: str
+    price: float
+    prev_price: Optional[float]
+    ts: float
+    changed_ts: float
+    source: str
+
+    @property
+    def change_pct(self) -> float:
+        if not self.prev_price:
+            return 0.0
+        return (self.price - self.prev_price) / self.prev_price * 100
+
+
+# ---------- In-memory latest-observation index ----------
+
+class PriceIndex:
+    """Latest observation per item, answered from memory (no fetches).
+
+    Snapshotted to disk once per cycle so lookups work right after restart.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.latest: Dict[str, Observation] = {}
+        if os.path.exists(path):
+            try:
+                with open(path) as f:
+                    self.latest = {k: Observation(**v) for k, v in json.load(f).items()}
+                logger.info(f"Loaded index with {len(self.latest)} observations")
+            except Exception as e:
+                logger.info(f"Failed to load index {path}: {e}")
+
+    def save(self) -> None:
+        tmp = self.path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump({k: asdict(o) for k, o in self.latest.items()}, f)
+        os.replace(tmp, self.path)
+
+    def update(self, key: str, name: str, url: str, price: float, source: str) -> None:
+        now = time.time()
+        old = self.latest.get(key)
+        if old is None:
+            self.latest[key] = Observation(key, name, url, price, None, now, now, source)
+            return
+        if name and name != url:
+            old.name = name
+        if abs(old.price - price) >= 0.01:
+            old.prev_price = old.price
+            old.changed_ts = now
+        old.price = price
+        old.ts = now
+        old.source = source
+
+    def get(self, key: str) -> Optional[Observation]:
+        return self.latest.get(key)
+
+    def name_for(self, key: str) -> Optional[str]:
+        obs = self.latest.get(key)
+        return obs.name if obs else None
+
+    def movers(self, n: int = 10, since: Optional[float] = None) -> List[Observation]:
+        changed = [
+            o for o in self.latest.values()
+            if o.prev_price and (since is None or o.changed_ts >= since)
+        ]
+        return sorted(changed, key=lambda o: abs(o.change_pct), reverse=True)[:n]
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+
+import asyncio
+import json
+import logging
+import os
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Dict
+
+logger = logging.getLogger("AmazonTracker")
+
+
+# ---------- AIMD request pacing ----------
+
+@dataclass
+class RateController:
+    """Additive-increase / multiplicative-decrease pacing for Amazon fetches.
+
+    `rate` is in requests per hour. Every clean response nudges it up by
+    `increase`; every 503 / CAPTCHA multiplies it by `decrease`.
+    """
+    rate: float
+    min_rate: float
+    max_rate: float
+    increase: float
+    decrease: float
+    jitter: float = 0.3
+    requests: int = 0
+    blocks: int = 0
+    _next_at: float = field(default=0.0, repr=False)
+
+    def interval(self) -> float:
+        return 3600.0 / self.rate
+
+    def on_success(self) -> None:
+        self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def on_block(self) -> None:
+        old = self.rate
+        self.rate = max(self.min_rate, self.rate * self.decrease)
+        self.blocks += 1
+        # Push the next slot out right away instead of waiting for the
+        # caller's next wait() to pick up the lower rate
+        self._next_at = max(self._next_at, time.monotonic() + self.interval())
+        logger.warning(f"AIMD: block -> rate {old:.0f} -> {self.rate:.0f} req/hr")
+
+    async def wait(self) -> None:
+        """Sleep until the next request slot, then reserve it."""
+        now = time.monotonic()
+        delay = max(0.0, self._next_at - now)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        spacing = self.interval() * random.uniform(1 - self.jitter, 1 + self.jitter)
+        self._next_at = time.monotonic() + spacing
+        self.requests += 1
+
+    def items_per_hour(self, fetches_per_item: float) -> float:
+        return self.rate / max(fetches_per_item, 1.0)
+
+    def reset_counters(self) -> None:
+        self.requests = 0
+        self.blocks = 0
+
+
+def load_rates(path: str) -> Dict[str, float]:
+    """Learned req/hr per marketplace; a bare {"rate": x} file is amazon.com's."""
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path) as f:
+            raw = json.load(f)
+        if "rate" in raw:
+            raw = {"amazon.com": raw}
+        rates = {k: float(v["rate"]) for k, v in raw.items()}
+        logger.info(
+            "Loaded learned rates: "
+            + ", ".join(f"{k} {r:.0f}/hr" for k, r in rates.items())
+        )
+        return rates
+    except Exception as e:
+        logger.info(f"Failed to load rate {path}: {e}")
+        return {}
+
+
+def save_rates(path: str, controllers: Dict[str, RateController]) -> None:
+    tmp = path + ".tmp"
+    now = time.time()
+    with open(tmp, "w") as f:
+        json.dump(
+            {k: {"rate": round(c.rate, 2), "updated": now} for k, c in controllers.items()},
+            f,
+            indent=2,
+        )
+    os.replace(tmp, path)
+
+
+# ---------- Per-domain circuit breaker ----------
+
+@dataclass
+class CircuitBreaker:
+    """Stops hitting a domain after `threshold` consecutive blocks.
+
+    While open, callers wait out the cooldown. The first request after it
+    expires is a probe: a clean response closes the breaker, another block
+    re-opens it with double the cooldown.
+    """
+    threshold: int = 3
+    cooldown: float = 900.0
+    max_cooldown: float = 4 * 3600.0
+    failures: int = 0
+    open_until: float = 0.0
+    _current: float = 0.0
+
+    def remaining(self) -> float:
+        return max(0.0, self.open_until - time.monotonic())
+
+    @property
+    def is_open(self) -> bool:
+        return self.remaining() > 0
+
+    def on_success(self) -> None:
+        self.failures = 0
+        self._current = 0.0
+
+    def on_block(self, name: str = "") -> None:
+        self.failures += 1
+        if self.failures < self.threshold or self.is_open:
+            return
+        self._current = min(self.max_cooldown, (self._current or self.cooldown / 2) * 2)
+        self.open_until = time.monotonic() + self._current
+        logger.warning(
+            f"Circuit OPEN {name} after {self.failures} blocks "
+            f"for {self._current/60:.0f} min"
+        )
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+
+import json
+import logging
+import os
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger("AmazonTracker")
+
+# Consecutive misses before an item forgets its learned selector
+ITEM_MAX_MISSES = 3
+
+
+# ---------- Per-item selector learning + aggregate hit stats ----------
+
+class SelectorStats:
+    """Remembers which seller/price selector wins for each item.
+
+    The learned winner is tried first within its own tier, so a deal price
+    still beats a learned buybox selector; tiers and the selectors inside
+    them otherwise keep their fixed order. A winner is replaced as soon as
+    another selector wins, and one that misses ITEM_MAX_MISSES times in a
+    row with nothing else hitting is forgotten. Aggregate hits/tries per
+    selector are written to disk, so a cycle where learned selectors stop
+    hitting shows a layout change before the price alerts go quiet.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.items: Dict[str, Dict[str, List]] = {}       # key -> kind -> [selector, misses]
+        self.totals: Dict[str, Dict[str, int]] = {}       # selector -> {"hits", "tries"}
+        self.cycle: Dict[str, Dict[str, int]] = {}
+        self.learned_hits = 0
+        self.learned_tries = 0
+        if os.path.exists(path):
+            try:
+                with open(path) as f:
+                    raw = json.load(f)
+                self.items = raw.get("items", {})
+                self.totals = raw.get("totals", {})
+                logger.info(f"Loaded selector stats for {len(self.items)} items")
+            except Exception as e:
+                logger.info(f"Failed to load selector stats {path}: {e}")
+
+    def save(self) -> None:
+        tmp = self.path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(
+                {
+                    "totals": self.totals,
+                    "cycle": self.cycle,
+                    "learned": {"hits": self.learned_hits, "tries": self.learned_tries},
+                    "items": self.items,
+                },
+                f,
+                indent=2,
+            )
+        os.replace(tmp, self.path)
+
+    def reset_cycle(self) -> None:
+        self.cycle = {}
+        self.learned_hits = 0
+        self.learned_tries = 0
+
+    def plan(
+        self, key: Optional[str], kind: str, tiers: List[Tuple[List[str], str]]
+    ) -> List[Tuple[str, str]]:
+        """(selector, tier) in try order: tiers as given, learned winner first in its tier."""
+        rec = self.items.get(key, {}).get(kind) if key else None
+        winner = rec[0] if rec else None
+        plan: List[Tuple[str, str]] = []
+        for selectors, tier in tiers:
+            if winner in selectors:
+                plan.append((winner, tier))
+            plan.extend((sel, tier) for sel in selectors if sel != winner)
+        return plan
+
+    def record(self, key: Optional[str], kind: str, selector: str, hit: bool) -> None:
+        for bucket in (self.totals, self.cycle):
+            t = bucket.setdefault(selector, {"hits": 0, "tries": 0})
+            t["tries"] += 1
+            t["hits"] += hit
+        if not key:
+            return
+
+        rec = self.items.get(key, {}).get(kind)
+        if rec and rec[0] == selector:
+            self.learned_tries += 1
+            self.learned_hits += hit
+            if hit:
+                rec[1] = 0
+                return
+            rec[1] += 1
+            if rec[1] >= ITEM_MAX_MISSES:
+                logger.info(f"Forgetting {kind} selector {selector} for {key}")
+                del self.items[key][kind]
+        elif hit:
+            self.items.setdefault(key, {})[kind] = [selector, 0]
+
+    def summary(self) -> str:
+        if not self.learned_tries:
+            return "selectors n/a"
+        return (
+            f"selectors {self.learned_hits}/{self.learned_tries} learned hits"
+        )
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+
+import logging
+import re
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from bs4 import BeautifulSoup
+
+from item_health import ItemState
+from marketplaces import MARKETPLACES, Marketplace
+
+logger = logging.getLogger("AmazonTracker")
+
+# name, price, observed state (BLOCKED / OOS) when there is no price
+Extraction = Tuple[str, Optional[float], Optional[ItemState]]
+
+
+@dataclass(frozen=True)
+class SiteAdapter:
+    """One non-Amazon retailer: which URLs it owns, how to read them, how fast."""
+    name: str                       # watchlist/site key, e.g. "bestbuy"
+    hosts: Tuple[str, ...]          # host suffixes, e.g. ("bestbuy.com",)
+    extract: Callable[[str], Extraction]
+    market: Marketplace             # locale + request headers for the domain
+    rate_start: float = 120         # requests/hour
+    rate_min: float = 30
+    rate_max: float = 300
+
+    def owns(self, url: str) -> bool:
+        host = urlparse(url).netloc.lower()
+        return any(host == h or host.endswith("." + h) for h in self.hosts)
+
+
+SITE_ADAPTERS: Dict[str, SiteAdapter] = {}
+
+
+def register_adapter(adapter: SiteAdapter) -> SiteAdapter:
+    if adapter.name in SITE_ADAPTERS or adapter.name in MARKETPLACES:
+        raise ValueError(f"Duplicate site adapter: {adapter.name}")
+    SITE_ADAPTERS[adapter.name] = adapter
+    return adapter
+
+
+def adapter_for_url(url: str) -> Optional[SiteAdapter]:
+    for adapter in SITE_ADAPTERS.values():
+        if adapter.owns(url):
+            return adapter
+    return None
+
+
+def market_for_key(key: str) -> Marketplace:
+    """Marketplace for an item's `marketplace` field, Amazon or retailer."""
+    if key in MARKETPLACES:
+        return MARKETPLACES[key]
+    return SITE_ADAPTERS[key].market
+
+
+# ---------- Shared extraction helpers ----------
+
+def parse_price(text: str) -> Optional[float]:
+    m = re.search(r"(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)", text)
+    if not m:
+        return None
+    return float(m.group(1).replace(",", ""))
+
+
+def page_name(soup: BeautifulSoup, fallback: str) -> str:
+    h1 = soup.find("h1")
+    if h1:
+        return h1.get_text(strip=True)[:80]
+    t = soup.find("title")
+    return t.get_text(strip=True)[:80] if t else fallback
+
+
+def first_selector_price(soup: BeautifulSoup, selectors: List[str]) -> Optional[float]:
+    for sel in selectors:
+        for el in soup.select(sel):
+            p = parse_price(el.get_text())
+            if p is not None:
+                return p
+    return None
+
+
+def max_outright_price(lines: List[str]) -> Optional[float]:
+    """Largest '$' price that is not a monthly instalment (carrier pages)."""
+    prices = []
+    for ln in lines:
+        low = ln.lower()
+        if "$" not in ln or "/mo" in low or "per month" in low:
+            continue
+        p = parse_price(ln)
+        if p:
+            prices.append(p)
+    return max(prices) if prices else None
+
+
+# ---------- Retailer extractors ----------
+
+def extract_bestbuy(html: str) -> Extraction:
+    soup = BeautifulSoup(html, "html.parser")
+    price = first_selector_price(
+        soup,
+        [
+            "[data-testid='priceView-hero-price'] span",
+            ".priceView-hero-price span",
+            ".pricing-price__regular-price",
+            ".price-block__primary-price",
+        ],
+    )
+    return page_name(soup, "Best Buy Product"), price, None
+
+
+def extract_walmart(html: str) -> Extraction:
+    soup = BeautifulSoup(html, "html.parser")
+    name = page_name(soup, "Walmart Product")
+    text = soup.get_text(" ", strip=True)
+    if "Robot or human" in text:
+        return name, None, ItemState.BLOCKED
+    price = first_selector_price(
+        soup,
+        [
+            "[data-automation-id='product-price']",
+            ".w-price--current",
+            ".price-group .price",
+            ".prod-PriceToPay span",
+        ],
+    )
+    return name, price, None
+
+
+def extract_metro(html: str) -> Extraction:
+    soup = BeautifulSoup(html, "html.parser")
+    candidates = []
+    for label_text in ["Full price", "Retail price", "List price", "One-time payment"]:
+        for label in soup.find_all(string=re.compile(label_text, re.I)):
+            p = parse_price(label.parent.get_text(" ", strip=True))
+            if p:
+                candidates.append(p)
+    price = max(candidates) if candidates else max_outright_price(
+        soup.get_text("\n", strip=True).splitlines()
+    )
+    return page_name(soup, "Metro Product"), price, None
+
+
+def extract_straighttalk(html: str) -> Extraction:
+    soup = BeautifulSoup(html, "html.parser")
+    segments = [
+        el.get_text(" ", strip=True)
+        for sel in (".product-price", "[id*='price']")
+        for el in soup.select(sel)
+    ]
+    # Selector hits carry no '$' guarantee, so only the instalment filter applies
+    candidates = [
+        p for p in (parse_price(s) for s in segments
+                    if "/mo" not in s.lower() and "per month" not in s.lower())
+        if p
+    ]
+    price = max(candidates) if candidates else max_outright_price(
+        soup.get_text("\n", strip=True).splitlines()
+    )
+    return page_name(soup, "Straight Talk Product"), price, None
+
+
+def _us_site(name: str, domain: str) -> Marketplace:
+    return Marketplace(name, f"www.{domain}", "$", ".", ",", "en-US,en;q=0.5")
+
+
+register_adapter(SiteAdapter("bestbuy", ("bestbuy.com",), extract_bestbuy, _us_site("bestbuy", "bestbuy.com")))
+register_adapter(
+    SiteAdapter(
+        "walmart", ("walmart.com",), extract_walmart, _us_site("walmart", "walmart.com"),
+        rate_start=60, rate_min=20, rate_max=180,   # quickest to show "Robot or human"
+    )
+)
+register_adapter(SiteAdapter("metro", ("metrobyt-mobile.com",), extract_metro, _us_site("metro", "metrobyt-mobile.com")))
+register_adapter(SiteAdapter("straighttalk", ("straighttalk.com",), extract_straighttalk, _us_site("straighttalk", "straighttalk.com")))
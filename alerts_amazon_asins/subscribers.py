@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+
+import json
+import logging
+import os
+from dataclasses import dataclass, field
+from typing import List
+
+from offer_rules import AlertRule
+
+logger = logging.getLogger("AmazonTracker")
+
+
+# ---------- Subscribers (one watchlist + thresholds per person) ----------
+
+@dataclass
+class Subscriber:
+    name: str
+    chat_id: str
+    watchlist: str
+    min_drop_pct: float = 0.0      # ignore drops smaller than this
+    notify_increases: bool = True
+    min_low_days: int = 0          # only drops that are the lowest in this many days
+
+
+@dataclass
+class Subscription:
+    """One subscriber's interest in one watched item."""
+    subscriber: Subscriber
+    rules: List[AlertRule] = field(default_factory=list)
+
+    def wants_change(self, old: float, new: float, low_days: int = 0) -> bool:
+        if new > old:
+            return self.subscriber.notify_increases
+        pct = (old - new) / old * 100 if old else 100.0
+        return pct >= self.subscriber.min_drop_pct and low_days >= self.subscriber.min_low_days
+
+
+def load_subscribers(path: str, default_chat_id: str, default_watchlist: str) -> List[Subscriber]:
+    """Read subscribers.json; without it, the single TELEGRAM_CHAT_ID owner."""
+    default = [Subscriber(name="owner", chat_id=default_chat_id, watchlist=default_watchlist)]
+    if not os.path.exists(path):
+        return default
+    try:
+        with open(path) as f:
+            subs = [Subscriber(**rec) for rec in json.load(f)]
+    except Exception as e:
+        logger.warning(f"Failed to load subscribers {path}: {e}; using owner only")
+        return default
+    logger.info(f"Loaded {len(subs)} subscribers")
+    return subs
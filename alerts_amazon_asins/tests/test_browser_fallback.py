@@ -0,0 +1,27 @@
+import asyncio
+
+import amazon_price_tracker as apt
+import browser_pool
+from browser_pool import BrowserPool
+
+
+def test_captcha_detection():
+    assert apt.looks_like_captcha("<title>Robot Check</title>")
+    assert apt.looks_like_captcha("Enter the characters you see below")
+    assert not apt.looks_like_captcha("<span id='productTitle'>Widget</span>")
+
+
+def test_pool_without_playwright_stays_disabled(monkeypatch):
+    monkeypatch.setattr(browser_pool, "async_playwright", None)
+    pool = BrowserPool(max_per_cycle=1)
+    asyncio.run(pool.start())
+    assert not pool.enabled and not pool.budget_left()
+
+
+def test_budget_is_per_cycle():
+    pool = BrowserPool(max_per_cycle=2)
+    pool._context = object()    # pretend the browser launched
+    pool.used = 2
+    assert not pool.budget_left()
+    pool.reset_budget()
+    assert pool.budget_left()
@@ -0,0 +1,55 @@
+from item_health import MAX_UNKNOWN_MISSES, RECHECK_SCHEDULE, HealthTracker, ItemState
+
+URL = "https://www.amazon.com/dp/B000000001"
+T0 = 1_000_000.0
+
+
+def tracker(tmp_path):
+    return HealthTracker(str(tmp_path / "health.json"))
+
+
+def test_new_items_are_due_and_healthy(tmp_path):
+    t = tracker(tmp_path)
+    assert t.is_due(URL)
+    assert t.get(URL).state == ItemState.HEALTHY.value
+
+
+def test_repeated_state_backs_off_exponentially_up_to_cap(tmp_path):
+    t = tracker(tmp_path)
+    base, cap = RECHECK_SCHEDULE[ItemState.OOS]
+    assert t.record(URL, ItemState.OOS, now=T0) == (ItemState.HEALTHY, ItemState.OOS)
+    assert t.get(URL).next_check == T0 + base
+    t.record(URL, ItemState.OOS, now=T0)
+    assert t.get(URL).next_check == T0 + 2 * base
+    for _ in range(10):
+        t.record(URL, ItemState.OOS, now=T0)
+    assert t.get(URL).next_check == T0 + cap
+    assert not t.is_due(URL, now=T0 + cap - 1)
+    assert t.is_due(URL, now=T0 + cap)
+
+
+def test_healthy_observation_resets_streak_and_schedule(tmp_path):
+    t = tracker(tmp_path)
+    t.record(URL, ItemState.BLOCKED, now=T0)
+    t.record(URL, ItemState.BLOCKED, now=T0)
+    assert t.record(URL, ItemState.HEALTHY, now=T0 + 10) == (ItemState.BLOCKED, ItemState.HEALTHY)
+    h = t.get(URL)
+    assert h.streak == 1 and h.next_check == 0 and h.since == T0 + 10
+
+
+def test_unclassified_misses_eventually_mark_dead(tmp_path):
+    t = tracker(tmp_path)
+    for _ in range(MAX_UNKNOWN_MISSES - 1):
+        t.record_miss(URL, now=T0)
+    assert t.get(URL).state == ItemState.HEALTHY.value
+    t.record_miss(URL, now=T0)
+    assert t.get(URL).state == ItemState.DEAD.value
+
+
+def test_save_and_reload(tmp_path):
+    t = tracker(tmp_path)
+    t.record(URL, ItemState.NO_SELLER, now=T0 + 5)
+    t.save()
+    again = tracker(tmp_path)
+    assert again.get(URL).state == ItemState.NO_SELLER.value
+    assert again.counts()[ItemState.NO_SELLER.value] == 1
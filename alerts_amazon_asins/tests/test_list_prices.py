@@ -0,0 +1,41 @@
+import asyncio
+from types import SimpleNamespace
+
+import amazon_price_tracker as apt
+
+PAGE_1 = (
+    "<ul>"
+    '<li data-itemid="1" data-price="24.5" '
+    'data-reposition-action-params="{&quot;itemExternalId&quot;:&quot;ASIN:B000000001|ATVPDKIKX0DER&quot;}"></li>'
+    '<li data-itemid="2" data-price="-Infinity"><a href="/dp/B000000002/ref=x">gone</a></li>'
+    '<li data-itemid="3"><a href="/dp/B000000003">x</a>'
+    '<span class="a-price"><span class="a-offscreen">$1,099.00</span></span></li>'
+    "</ul>"
+    '<input name="showMoreUrl" value="/hz/wishlist/page2">'
+)
+PAGE_2 = '<ul><li data-price="5"><a href="/gp/product/B000000004">no dp link</a></li></ul>'
+
+
+def test_list_page_parse():
+    prices, next_path = apt.get_list_prices(PAGE_1)
+    assert prices == {"B000000001": 24.5, "B000000003": 1099.0}
+    assert next_path == "/hz/wishlist/page2"
+    assert apt.get_list_prices(PAGE_2) == ({}, None)
+
+
+def test_harvest_follows_pages(monkeypatch):
+    pages = {
+        "https://www.amazon.com/hz/wishlist/ls/X": PAGE_1,
+        "https://www.amazon.com/hz/wishlist/page2": PAGE_2.replace("/gp/product/", "/dp/"),
+    }
+    fetched = []
+
+    async def fake_fetch(url, client):
+        fetched.append(url)
+        return apt.FetchResult(pages.get(url), "ok" if url in pages else "error")
+
+    monkeypatch.setattr(apt, "fetch_async", fake_fetch)
+    client = SimpleNamespace(market=None)
+    prices = asyncio.run(apt.harvest_list_prices("https://www.amazon.com/hz/wishlist/ls/X", client))
+    assert prices == {"B000000001": 24.5, "B000000003": 1099.0, "B000000004": 5.0}
+    assert len(fetched) == 2
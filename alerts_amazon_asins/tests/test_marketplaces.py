@@ -0,0 +1,16 @@
+from marketplaces import MARKETPLACES, marketplace_for_url, parse_price_locale
+
+
+def test_marketplace_for_url():
+    assert marketplace_for_url("https://www.amazon.ca/dp/B0000000AA").key == "amazon.ca"
+    assert marketplace_for_url("https://amazon.co.uk/dp/B0000000AA").key == "amazon.co.uk"
+    assert marketplace_for_url("https://www.bestbuy.com/site/x") is None
+
+
+def test_parse_price_locale():
+    assert parse_price_locale("$1,234.56") == 1234.56
+    assert parse_price_locale("£19.99", MARKETPLACES["amazon.co.uk"]) == 19.99
+    de = MARKETPLACES["amazon.de"]
+    assert parse_price_locale("1.234,56 €", de) == 1234.56
+    assert parse_price_locale("1 234,56 €", de) == 1234.56
+    assert parse_price_locale("no price here") is None
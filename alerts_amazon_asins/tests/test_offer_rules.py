@@ -0,0 +1,58 @@
+from offer_rules import Offer, condition_class, parse_rule
+
+
+def offer(seller="amazon.com", price=50.0, condition="new", valid=True):
+    return Offer(seller, price, condition, valid)
+
+
+def test_parse_rule_forms():
+    r = parse_rule("Amazon Warehouse:Used - Like New<$45.50")
+    assert (r.seller, r.condition, r.max_price) == ("amazon warehouse", "used - like new", 45.5)
+    r = parse_rule("<30")
+    assert (r.seller, r.condition, r.max_price) == ("", "", 30.0)
+    assert parse_rule("amazon.com:new") is None
+
+
+def test_condition_classes():
+    assert condition_class("Used - Like New") == ("used", "like new")
+    assert condition_class("new") == ("new", "")
+    assert condition_class("Amazon Renewed") == ("renewed", "")
+    assert condition_class("Refurbished - Excellent") == ("renewed", "excellent")
+
+
+def test_new_rule_does_not_match_used_like_new():
+    rule = parse_rule("amazon.com:new<80")
+    assert not rule.matches(offer(condition="used - like new"))
+    assert rule.matches(offer(condition="new"))
+
+
+def test_sub_condition_is_a_prefix():
+    rule = parse_rule(":used - very<80")
+    assert rule.matches(offer(condition="used - very good"))
+    assert not rule.matches(offer(condition="used - good"))
+    assert parse_rule(":used<80").matches(offer(condition="used - acceptable"))
+
+
+def test_price_must_be_strictly_below():
+    rule = parse_rule("amazon.com<50")
+    assert not rule.matches(offer(price=50))
+    assert rule.matches(offer(price=49.99))
+    assert rule.label == "amazon.com < $50.00"
+
+
+def test_empty_seller_needs_a_valid_seller_and_best_is_cheapest():
+    rule = parse_rule("<100")
+    offers = [offer("random", 10, valid=False), offer("amazon.com", 60), offer("woot", 40)]
+    assert rule.best(offers).seller == "woot"
+    assert rule.best([offer(price=200)]) is None
+
+
+def test_bare_condition_is_a_condition_not_a_seller():
+    for text in ("new<80", "New < $80", "refurbished<80"):
+        rule = parse_rule(text)
+        assert rule.seller == "" and rule.condition in ("new", "refurbished")
+    assert parse_rule("new<80").matches(offer(price=70))
+    assert not parse_rule("new<80").matches(offer(condition="used - like new", price=70))
+    rule = parse_rule("used - good<30")
+    assert (rule.seller, rule.condition) == ("", "used - good")
+    assert parse_rule("newegg<80").seller == "newegg"
@@ -0,0 +1,77 @@
+from compact_series import PriceSeries
+from price_analytics import DAY, PriceAnalytics
+
+NOW = 1_700_000_000
+
+
+def series(*points):
+    s = PriceSeries()
+    for ts, price in points:
+        s.append(ts, price)
+    return s
+
+
+def test_short_history_does_not_claim_long_windows():
+    a = PriceAnalytics()
+    a.refresh({"K": series((NOW - 3 * DAY, 50.0), (NOW - DAY, 45.0))}, now=NOW)
+    stats = a.get("K")
+    assert stats.window_lows == {}
+    assert stats.low_days(40.0) == 0
+    assert a.low_flags({"K": 40.0}) == {}
+    assert stats.is_all_time_low(40.0)
+
+
+def test_windows_clipped_to_series_age():
+    a = PriceAnalytics()
+    a.refresh({"K": series((NOW - 40 * DAY, 50.0), (NOW - 20 * DAY, 45.0), (NOW, 45.0))}, now=NOW)
+    stats = a.get("K")
+    assert stats.window_lows == {7: 45.0, 30: 45.0}
+    assert stats.low_days(44.0) == 30
+    assert a.low_flags({"K": 44.0}) == {"K": 30}
+
+
+def test_window_low_ignores_runs_that_ended_before_it():
+    a = PriceAnalytics()
+    a.refresh(
+        {"K": series((NOW - 100 * DAY, 30.0), (NOW - 60 * DAY, 50.0), (NOW - 2 * DAY, 48.0))},
+        now=NOW,
+    )
+    assert a.get("K").window_lows == {7: 48.0, 30: 48.0, 90: 30.0}
+
+
+def test_percentiles_and_rank_are_time_weighted():
+    # 90 days at 100, then a one-hour dip to 10, then back to 100 for a day
+    s = series(
+        (NOW - 91 * DAY, 100.0),
+        (NOW - DAY - 3600, 10.0),
+        (NOW - DAY, 100.0),
+        (NOW, 100.0),
+    )
+    a = PriceAnalytics()
+    a.refresh({"K": s}, now=NOW)
+    stats = a.get("K")
+    assert stats.n == 3
+    assert (stats.p10, stats.p50, stats.p90) == (100.0, 100.0, 100.0)
+    assert stats.pct_rank == 100.0
+
+
+def test_pct_rank_is_share_of_time():
+    s = series((NOW - 30 * DAY, 40.0), (NOW - 10 * DAY, 60.0), (NOW, 60.0))
+    a = PriceAnalytics()
+    a.refresh({"A": s, "B": series((NOW - 30 * DAY, 40.0), (NOW - 10 * DAY, 20.0), (NOW, 20.0))}, now=NOW)
+    assert a.get("A").pct_rank == 100.0
+    assert round(a.get("B").pct_rank, 3) == round(10 / 30 * 100, 3)
+    assert a.get("A").p10 == 40.0 and a.get("A").p90 == 60.0
+    assert a.get("B").p10 == 20.0 and a.get("B").p50 == 40.0
+
+
+def test_brief_glitch_barely_moves_volatility():
+    steady = series((NOW - 60 * DAY, 100.0), (NOW - 30 * DAY, 90.0), (NOW, 90.0))
+    glitch = series(
+        (NOW - 60 * DAY, 100.0), (NOW - 30 * DAY, 90.0),
+        (NOW - DAY - 60, 9.0), (NOW - DAY, 90.0), (NOW, 90.0),
+    )
+    a = PriceAnalytics()
+    a.refresh({"S": steady, "G": glitch}, now=NOW)
+    assert a.get("S").volatility == 0.0
+    assert a.get("G").volatility < 1.0
@@ -0,0 +1,114 @@
+import os
+
+from compact_series import PriceSeries
+from price_history import HistoryStore
+
+T0 = 1_700_000_000
+
+
+def test_series_keeps_change_points_only():
+    s = PriceSeries()
+    assert s.append(T0, 10.0)
+    assert not s.append(T0 + 60, 10.0)
+    assert s.append(T0 + 120, 12.5)
+    assert s.runs() == [(T0, 10.0), (T0 + 120, 12.5)]
+    assert (s.low, s.high, s.current, s.last_ts) == (10.0, 12.5, 12.5, T0 + 120)
+    assert s.at(T0 + 90) == 10.0 and s.at(T0 - 1) is None
+    assert s.low_since(T0 + 120) == 12.5
+    assert s.low_since(T0 + 121) is None
+
+
+def test_series_bytes_round_trip():
+    s = PriceSeries()
+    for i, p in enumerate((5.0, 4.0, 6.0)):
+        s.append(T0 + i, p)
+    copy, end = PriceSeries.from_bytes(memoryview(s.to_bytes()))
+    assert end == len(s.to_bytes())
+    assert copy.runs() == s.runs() and (copy.low, copy.high) == (4.0, 6.0)
+
+
+def test_flush_appends_only_changed_series(tmp_path):
+    path = str(tmp_path / "h.bin")
+    store = HistoryStore(path)
+    for i in range(20):
+        store.append(f"K{i}", 10.0 + i, T0)
+    store.flush()
+    size = os.path.getsize(path)
+
+    store.append("K3", 1.0, T0 + 60)
+    store.flush()
+    grown = os.path.getsize(path) - size
+    assert 0 < grown < size / 10
+
+    store.flush()
+    assert os.path.getsize(path) - size == grown
+
+    reloaded = HistoryStore(path)
+    assert reloaded.series["K3"].runs() == [(T0, 13.0), (T0 + 60, 1.0)]
+    assert len(reloaded.series) == 20
+
+
+def test_flush_compacts_superseded_records(tmp_path):
+    path = str(tmp_path / "h.bin")
+    store = HistoryStore(path)
+    store.append("K", 1.0, T0)
+    store.flush()
+    for i in range(1, 50):
+        store.append("K", 1.0 + i, T0 + i)
+        store.flush()
+    live = len(store._record("K")) + 4
+    assert os.path.getsize(path) <= 2 * live + len(store._record("K"))
+    assert HistoryStore(path).series["K"].runs() == store.series["K"].runs()
+
+
+def test_truncated_tail_is_dropped_and_rewritten(tmp_path):
+    path = str(tmp_path / "h.bin")
+    store = HistoryStore(path)
+    store.append("A", 1.0, T0)
+    store.flush()
+    store.append("B", 2.0, T0)
+    store.flush()
+    with open(path, "r+b") as f:
+        f.truncate(os.path.getsize(path) - 3)
+
+    store = HistoryStore(path)
+    assert list(store.series) == ["A"]
+    store.append("A", 3.0, T0 + 1)
+    store.flush()
+    assert HistoryStore(path).series["A"].runs() == [(T0, 1.0), (T0 + 1, 3.0)]
+
+
+def test_unchanged_prices_append_only_a_touch_record(tmp_path):
+    path = str(tmp_path / "h.bin")
+    store = HistoryStore(path)
+    for i in range(1000):
+        store.append(f"K{i}", 10.0, T0)
+    store.flush()
+    size = os.path.getsize(path)
+
+    for cycle in range(1, 6):
+        for i in range(1000):
+            store.append(f"K{i}", 10.0, T0 + 60 * cycle)
+        store.flush()
+        assert os.path.getsize(path) - size == cycle * (10 + 4 * 1000)
+
+    reloaded = HistoryStore(path)
+    assert reloaded.series["K7"].last_ts == T0 + 300
+    assert reloaded.series["K7"].runs() == [(T0, 10.0)]
+
+
+def test_touch_ids_survive_compaction(tmp_path):
+    path = str(tmp_path / "h.bin")
+    store = HistoryStore(path)
+    store.append("A", 1.0, T0)
+    store.append("B", 2.0, T0)
+    store.flush()
+    for i in range(1, 30):
+        store.append("A", 1.0 + i, T0 + i)
+        store.flush()
+    store.append("B", 2.0, T0 + 100)
+    store.flush()
+
+    reloaded = HistoryStore(path)
+    assert reloaded.series["B"].last_ts == T0 + 100
+    assert reloaded.series["A"].last_ts == T0 + 29
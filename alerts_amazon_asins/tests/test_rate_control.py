@@ -0,0 +1,65 @@
+import asyncio
+import json
+
+from rate_control import CircuitBreaker, RateController, load_rates, save_rates
+
+
+def make(rate=100.0):
+    return RateController(rate=rate, min_rate=20, max_rate=120, increase=10, decrease=0.5)
+
+
+def test_success_adds_up_to_max():
+    c = make()
+    c.on_success()
+    assert c.rate == 110
+    c.on_success()
+    c.on_success()
+    assert c.rate == 120
+
+
+def test_block_multiplies_down_to_min_and_delays_next_slot():
+    c = make()
+    c.on_block()
+    assert c.rate == 50 and c.blocks == 1
+    assert c._next_at > 0
+    c.on_block()
+    c.on_block()
+    assert c.rate == 20
+
+
+def test_wait_reserves_a_slot_and_counts_requests():
+    c = RateController(rate=3_600_000, min_rate=1, max_rate=3_600_000, increase=1, decrease=0.5)
+    asyncio.run(c.wait())
+    asyncio.run(c.wait())
+    assert c.requests == 2
+    c.reset_counters()
+    assert c.requests == 0 and c.blocks == 0
+
+
+def test_rates_round_trip_and_legacy_file(tmp_path):
+    path = str(tmp_path / "rates.json")
+    save_rates(path, {"amazon.com": make(80), "amazon.ca": make(40)})
+    assert load_rates(path) == {"amazon.com": 80, "amazon.ca": 40}
+
+    with open(path, "w") as f:
+        json.dump({"rate": 55}, f)
+    assert load_rates(path) == {"amazon.com": 55}
+    assert load_rates(str(tmp_path / "missing.json")) == {}
+
+
+def test_breaker_opens_after_threshold_and_doubles_cooldown():
+    b = CircuitBreaker(threshold=2, cooldown=100, max_cooldown=300)
+    b.on_block()
+    assert not b.is_open
+    b.on_block()
+    assert b.is_open and b._current == 100
+
+    b.open_until = 0  # cooldown over; the probe is blocked again
+    b.on_block()
+    assert b._current == 200
+    b.open_until = 0
+    b.on_block()
+    assert b._current == 300
+
+    b.on_success()
+    assert b.failures == 0 and b._current == 0
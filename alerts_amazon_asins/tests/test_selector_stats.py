@@ -0,0 +1,47 @@
+import amazon_price_tracker as apt
+from selector_stats import ITEM_MAX_MISSES, SelectorStats
+
+TIERS = [(["#deal", "#deal2"], "deal"), (["#box", "#box2"], "buybox"), (["#fb"], "fallback")]
+
+PAGE = (
+    "<html><body><span id='productTitle'>A Reasonably Long Product Title</span>"
+    "<a id='sellerProfileTriggerId'>Amazon.com</a>"
+    "<div id='priceblock_dealprice'><span class='a-offscreen'>$19.99</span></div>"
+    "<div id='price_inside_buybox'><span class='a-offscreen'>$24.99</span></div>"
+    "</body></html>"
+)
+
+
+def test_plan_without_winner_keeps_fixed_order(tmp_path):
+    stats = SelectorStats(str(tmp_path / "s.json"))
+    for _ in range(5):
+        stats.record("K", "price", "#deal", False)
+    assert [sel for sel, _ in stats.plan("K", "price", TIERS)] == [
+        "#deal", "#deal2", "#box", "#box2", "#fb",
+    ]
+
+
+def test_learned_winner_only_leads_its_own_tier(tmp_path):
+    stats = SelectorStats(str(tmp_path / "s.json"))
+    stats.record("K", "price", "#box2", True)
+    assert stats.plan("K", "price", TIERS) == [
+        ("#deal", "deal"), ("#deal2", "deal"),
+        ("#box2", "buybox"), ("#box", "buybox"),
+        ("#fb", "fallback"),
+    ]
+
+
+def test_winner_forgotten_after_repeated_misses(tmp_path):
+    stats = SelectorStats(str(tmp_path / "s.json"))
+    stats.record("K", "price", "#box2", True)
+    for _ in range(ITEM_MAX_MISSES):
+        stats.record("K", "price", "#box2", False)
+    assert "price" not in stats.items["K"]
+
+
+def test_deal_price_beats_learned_buybox_selector(tmp_path):
+    stats = SelectorStats(str(tmp_path / "s.json"))
+    stats.record("K", "price", "#price_inside_buybox span.a-offscreen", True)
+    _, price, state = apt.get_price_name_amazon(PAGE, {"amazon.com"}, selectors=stats, key="K")
+    assert (price, state) == (19.99, apt.ItemState.HEALTHY)
+    assert stats.items["K"]["price"][0] == "#priceblock_dealprice"
@@ -0,0 +1,93 @@
+import asyncio
+from types import SimpleNamespace
+
+import amazon_price_tracker as apt
+from item_health import HealthTracker, ItemState
+from site_adapters import adapter_for_url, extract_walmart, market_for_key
+
+WALMART_URL = "https://www.walmart.com/ip/widget/123"
+WALMART_PAGE = (
+    "<html><head><title>Widget - Walmart.com</title></head><body>"
+    "<span data-automation-id='product-price'>$19.99</span></body></html>"
+)
+
+
+def test_adapter_lookup_and_markets():
+    assert adapter_for_url(WALMART_URL).name == "walmart"
+    assert adapter_for_url("https://www.amazon.com/dp/B000000001") is None
+    assert market_for_key("walmart").currency == "$"
+    assert market_for_key("amazon.ca").key == "amazon.ca"
+
+
+def test_walmart_extractor():
+    name, price, state = extract_walmart(WALMART_PAGE)
+    assert price == 19.99 and state is None
+    assert extract_walmart("<p>Robot or human?</p>")[2] == ItemState.BLOCKED
+
+
+class FakeBrowser:
+    def __init__(self, html):
+        self.html = html
+        self.used = 0
+
+    def budget_left(self):
+        return True
+
+    async def fetch(self, url):
+        self.used += 1
+        return self.html
+
+
+class FakeClient:
+    market = None
+
+    async def wait(self):
+        pass
+
+    def on_block(self):
+        pass
+
+
+def test_blocked_retailer_item_rendered_in_browser_uses_its_adapter(tmp_path, monkeypatch):
+    health = HealthTracker(str(tmp_path / "health.json"))
+    for _ in range(apt.BROWSER_AFTER_BLOCKS):
+        health.record(WALMART_URL, ItemState.BLOCKED, now=1.0)
+    ctx = SimpleNamespace(health=health, families=None, browser=FakeBrowser(WALMART_PAGE))
+    applied = []
+
+    async def apply_price(item, name, price, source, ctx, verifying):
+        applied.append((price, source))
+
+    monkeypatch.setattr(apt, "apply_price", apply_price)
+    item = apt.WatchItem(site="walmart", url=WALMART_URL, marketplace="walmart")
+    assert asyncio.run(apt.check_item(item, ctx, FakeClient(), verifying=True))
+    assert ctx.browser.used == 1
+    assert applied == [(19.99, "walmart")]
+
+
+class FakeResponse:
+    status_code = 200
+
+    def __init__(self, text):
+        self.text = text
+
+    def raise_for_status(self):
+        pass
+
+
+def test_retailer_recaptcha_markup_is_not_a_block(monkeypatch):
+    page = WALMART_PAGE.replace("</body>", "<script src='https://www.google.com/recaptcha/api.js'></script></body>")
+    client = apt.make_client("walmart", {})
+    monkeypatch.setattr(client.session, "get", lambda *a, **kw: FakeResponse(page))
+    rate = client.rate.rate
+    assert apt.fetch_page(WALMART_URL, client) == apt.FetchResult(page, "ok")
+    assert client.rate.rate >= rate and not client.breaker.is_open
+
+
+def test_amazon_captcha_page_is_still_a_block(monkeypatch):
+    client = apt.make_client("amazon.com", {})
+    monkeypatch.setattr(client.session, "get", lambda *a, **kw: FakeResponse("<title>Robot Check</title>"))
+    monkeypatch.setattr(apt.time, "sleep", lambda s: None)
+    rate = client.rate.rate
+    assert apt.fetch_page("https://www.amazon.com/dp/B000000001", client).status == "blocked"
+    assert client.rate.rate < rate
@@ -0,0 +1,57 @@
+import asyncio
+
+import amazon_price_tracker as apt
+from offer_rules import Offer, parse_rule
+from subscribers import Subscriber, Subscription
+
+
+def item_for(*chats):
+    subs = [
+        Subscription(Subscriber(name=c, chat_id=c, watchlist=""), [parse_rule("<100")])
+        for c in chats
+    ]
+    return apt.WatchItem(site="amazon", url="https://www.amazon.com/dp/B000000001", subscriptions=subs)
+
+
+def fake_telegram(monkeypatch, failing=()):
+    sent = []
+
+    async def send(msg, chat_id=None):
+        if chat_id in failing:
+            raise RuntimeError("Forbidden: bot was blocked by the user")
+        sent.append(chat_id)
+
+    monkeypatch.setattr(apt, "send_telegram", send)
+    return sent
+
+
+def test_failing_chat_does_not_stop_other_rule_alerts(monkeypatch):
+    sent = fake_telegram(monkeypatch, failing={"blocked"})
+    item = item_for("blocked", "ok")
+    state = {}
+    offers = [Offer("amazon.com", 50.0, "new", True)]
+    asyncio.run(apt.evaluate_rules(item, "Widget", offers, state))
+    assert sent == ["ok"]
+    assert list(state) == [f"{item.url}#rule:ok:valid seller < $100.00"]
+
+    # The blocked chat is retried on the next check; "ok" is not re-alerted
+    sent.clear()
+    asyncio.run(apt.evaluate_rules(item, "Widget", offers, state))
+    assert sent == []
+    sent = fake_telegram(monkeypatch)
+    asyncio.run(apt.evaluate_rules(item, "Widget", offers, state))
+    assert sent == ["blocked"] and len(state) == 2
+
+
+def test_send_to_chats_tries_every_chat(monkeypatch):
+    sent = fake_telegram(monkeypatch, failing={"a"})
+    assert asyncio.run(apt.send_to_chats("hi", ["a", "b", "c"])) == ["a"]
+    assert sent == ["b", "c"]
+
+
+def test_subscription_thresholds():
+    sub = Subscription(Subscriber("x", "1", "", min_drop_pct=10, notify_increases=False, min_low_days=30))
+    assert not sub.wants_change(100, 110)
+    assert not sub.wants_change(100, 95, low_days=90)
+    assert not sub.wants_change(100, 80, low_days=7)
+    assert sub.wants_change(100, 80, low_days=30)
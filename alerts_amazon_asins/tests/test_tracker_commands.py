@@ -0,0 +1,76 @@
+import time
+from types import SimpleNamespace
+
+import amazon_price_tracker as apt
+from item_health import HealthTracker
+from price_analytics import PriceAnalytics
+from price_history import HistoryStore
+from price_index import PriceIndex
+
+DAY = 86400
+
+
+def make_ctx(tmp_path):
+    return SimpleNamespace(
+        index=PriceIndex(str(tmp_path / "index.json")),
+        history=HistoryStore(str(tmp_path / "history.bin")),
+        analytics=PriceAnalytics(),
+        health=HealthTracker(str(tmp_path / "health.json")),
+    )
+
+
+def test_price_without_recent_history_says_na(tmp_path):
+    ctx = make_ctx(tmp_path)
+    key = "B000000001"
+    ctx.history.append(key, 25.0, ts=time.time() - 60 * DAY)
+    ctx.index.update(key, "Old widget", "https://www.amazon.com/dp/B000000001", 25.0, "buybox")
+    ctx.analytics.refresh(ctx.history.series, now=time.time() - 45 * DAY)
+    reply = apt.answer_price(ctx, key)
+    assert "*Low:* $25.00 all-time, n/a 30d" in reply
+
+
+def test_currency_follows_the_marketplace(tmp_path):
+    assert apt.currency_for_key("B000000001") == "$"
+    assert apt.currency_for_key("amazon.co.uk:B000000001") == "£"
+    assert apt.currency_for_key("amazon.de:B000000001") == "€"
+    assert apt.currency_for_key("https://www.bestbuy.com/site/x/123.p") == "$"
+
+    ctx = make_ctx(tmp_path)
+    key = "amazon.de:B000000002"
+    now = time.time()
+    for days, price in ((40, 100.0), (30, 90.0), (20, 80.0)):
+        ctx.history.append(key, price, ts=now - days * DAY)
+    ctx.history.append(key, 60.0, ts=now - 1)
+    ctx.index.update(key, "Kaffeemaschine", "https://www.amazon.de/dp/B000000002", 80.0, "buybox")
+    ctx.index.update(key, "Kaffeemaschine", "https://www.amazon.de/dp/B000000002", 60.0, "buybox")
+    ctx.analytics.refresh(ctx.history.series, now=now)
+    assert "€80.00→€60.00" in apt.answer_movers(ctx)
+    assert "€60.00" in apt.answer_lows(ctx)
+
+
+def add_ctx(tmp_path, text):
+    from subscribers import Subscriber
+    from watchlist_db import WatchlistDB
+
+    path = tmp_path / "watchlist.txt"
+    path.write_text(text)
+    return SimpleNamespace(
+        subscribers=[Subscriber("alice", "42", str(path))],
+        watchlist=WatchlistDB(str(tmp_path / "w.db")),
+    ), path
+
+
+def test_add_keeps_entries_on_separate_lines(tmp_path):
+    ctx, path = add_ctx(tmp_path, "B000000001")   # no trailing newline
+    assert apt.answer_add(ctx, "42", "B000000002").startswith("✅")
+    assert path.read_text() == "B000000001\nB000000002\n"
+    assert [e.target for e in apt.load_watchlist(str(path))] == ["B000000001", "B000000002"]
+
+    apt.answer_add(ctx, "42", "amazon.ca:B000000003")
+    assert path.read_text().splitlines() == ["B000000001", "B000000002", "amazon.ca:B000000003"]
+
+
+def test_add_to_empty_watchlist(tmp_path):
+    ctx, path = add_ctx(tmp_path, "")
+    apt.answer_add(ctx, "42", "B000000002")
+    assert path.read_text() == "B000000002\n"
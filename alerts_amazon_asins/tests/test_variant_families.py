@@ -0,0 +1,37 @@
+import amazon_price_tracker as apt
+from variant_families import FamilyIndex
+
+PAGE = (
+    '<script>var data = {"parentAsin" : "B0PARENT01"};</script><ul>'
+    '<li data-defaultasin="B0CHILD001" class="swatchSelect">'
+    '<span class="twisterSwatchPrice">$19.99</span></li>'
+    '<li data-defaultasin="B0CHILD002" class="swatchUnavailable">'
+    '<span class="twisterSwatchPrice">$17.99</span></li>'
+    '<li data-asin="B0CHILD003" data-dp-url="/dp/B0CHILD003">'
+    '<span class="a-size-mini">$9,999.00</span></li>'
+    '<li data-asin="B0OTHER001">not a swatch</li>'
+    "</ul>"
+)
+
+
+def test_variant_prices_from_twister():
+    parent, siblings = apt.get_variant_prices(PAGE)
+    assert parent == "B0PARENT01"
+    assert siblings == {"B0CHILD001": 19.99, "B0CHILD002": None, "B0CHILD003": None}
+
+
+def test_family_index_groups_and_persists(tmp_path):
+    path = str(tmp_path / "families.json")
+    families = FamilyIndex(path)
+    families.start_cycle()
+    families.observe("B0CHILD001", *apt.get_variant_prices(PAGE))
+    assert families.sibling_price("B0CHILD001") == 19.99
+    assert families.sibling_price("B0CHILD002") is None
+    families.save()
+
+    reloaded = FamilyIndex(path)
+    assert reloaded.group(["B0CHILD001", "B0CHILD003", "B0LONELY01"]) == {
+        "B0PARENT01": ["B0CHILD001", "B0CHILD003"],
+        "B0LONELY01": ["B0LONELY01"],
+    }
+    assert reloaded.cycle_prices == {}
@@ -0,0 +1,92 @@
+import asyncio
+from types import SimpleNamespace
+
+import amazon_price_tracker as apt
+from item_health import HealthTracker
+from price_analytics import PriceAnalytics
+from price_history import HistoryStore
+from price_index import PriceIndex
+from subscribers import Subscriber, Subscription
+from verify_queue import VerifyQueue
+
+
+def item(url, marketplace="amazon.com"):
+    return SimpleNamespace(url=url, marketplace=marketplace)
+
+
+def test_first_change_wins_and_markets_are_separate():
+    q = VerifyQueue(delay=60)
+    q.add(item("a"), 10, 8, "buybox")
+    q.add(item("a"), 10, 7, "buybox")
+    q.add(item("b", "amazon.ca"), 20, 15, "deal")
+    assert q.pending["a"].new_price == 8
+    assert [p.item.url for p in q.for_market("amazon.com")] == ["a"]
+    assert q.is_pending("b")
+
+
+def test_resolve_counts_confirmed_and_discarded():
+    q = VerifyQueue(delay=0)
+    q.add(item("a"), 10, 8, "buybox")
+    q.add(item("b"), 10, 8, "buybox")
+    assert q.resolve("a", confirmed=True).new_price == 8
+    q.resolve("b", confirmed=False)
+    assert q.resolve("missing", confirmed=True) is None
+    assert (q.confirmed, q.discarded) == (1, 1)
+    assert not q.pending
+
+URL = "https://www.amazon.com/dp/B000000001"
+
+
+def tracker(tmp_path, monkeypatch, refetched):
+    """ctx + watched item at $100, with the re-fetch returning `refetched`."""
+    sent = []
+
+    async def send(msg, chat_id=None):
+        sent.append(msg)
+
+    async def recheck(item, ctx, client, verifying=False):
+        await apt.apply_price(item, "Widget", refetched, "buybox", ctx, verifying=verifying)
+        return True
+
+    monkeypatch.setattr(apt, "send_telegram", send)
+    monkeypatch.setattr(apt, "check_item", recheck)
+    ctx = SimpleNamespace(
+        state={URL: 100.0},
+        health=HealthTracker(str(tmp_path / "health.json")),
+        verify=VerifyQueue(delay=0),
+        index=PriceIndex(str(tmp_path / "index.json")),
+        history=HistoryStore(str(tmp_path / "history.bin")),
+        analytics=PriceAnalytics(),
+    )
+    watch = apt.WatchItem(site="amazon", url=URL, subscriptions=[Subscription(Subscriber("a", "1", ""))])
+    client = SimpleNamespace(market=SimpleNamespace(key="amazon.com"))
+    return ctx, watch, client, sent
+
+
+def test_change_alerts_only_after_the_refetch_repeats_it(tmp_path, monkeypatch):
+    ctx, watch, client, sent = tracker(tmp_path, monkeypatch, refetched=50.0)
+    asyncio.run(apt.apply_price(watch, "Widget", 50.0, "buybox", ctx))
+    assert sent == [] and ctx.state[URL] == 100.0 and ctx.verify.is_pending(URL)
+
+    asyncio.run(apt.drain_verifications(client, ctx))
+    assert len(sent) == 1 and "→ *New:* $50.00" in sent[0]
+    assert ctx.state[URL] == 50.0
+    assert (ctx.verify.confirmed, ctx.verify.discarded) == (1, 0)
+
+
+def test_refetch_with_a_third_price_is_not_confirmed(tmp_path, monkeypatch):
+    ctx, watch, client, sent = tracker(tmp_path, monkeypatch, refetched=101.0)
+    asyncio.run(apt.apply_price(watch, "Widget", 50.0, "buybox", ctx))
+    asyncio.run(apt.drain_verifications(client, ctx))
+    assert sent == []
+    assert ctx.state[URL] == 100.0
+    assert (ctx.verify.confirmed, ctx.verify.discarded) == (0, 1)
+    assert not ctx.verify.pending
+
+
+def test_refetch_back_at_old_price_is_discarded(tmp_path, monkeypatch):
+    ctx, watch, client, sent = tracker(tmp_path, monkeypatch, refetched=100.0)
+    asyncio.run(apt.apply_price(watch, "Widget", 50.0, "buybox", ctx))
+    asyncio.run(apt.drain_verifications(client, ctx))
+    assert sent == [] and ctx.state[URL] == 100.0
+    assert ctx.verify.discarded == 1
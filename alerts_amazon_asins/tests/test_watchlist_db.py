@@ -0,0 +1,65 @@
+import os
+
+import amazon_price_tracker as apt
+from subscribers import Subscriber
+from watchlist_db import WatchEntry, WatchlistDB
+
+URL = "https://www.amazon.com/dp/B000000001"
+
+
+def entry(priority=0, tags=(), url=URL):
+    return WatchEntry(url, "amazon", "amazon.com", url[-10:], [], priority, list(tags))
+
+
+def item_row(db, url=URL):
+    return db.conn.execute("SELECT priority, tags FROM items WHERE url = ?", (url,)).fetchone()
+
+
+def test_reimport_can_lower_priority_and_clear_tags(tmp_path):
+    db = WatchlistDB(str(tmp_path / "w.db"))
+    db.import_entries("alice", [entry(5, ["gpu"])], "a.txt", 1.0)
+    assert item_row(db) == (5, "gpu")
+    db.import_entries("alice", [entry(1)], "a.txt", 2.0)
+    assert item_row(db) == (1, "")
+
+
+def test_add_keeps_existing_priority_and_tags(tmp_path):
+    db = WatchlistDB(str(tmp_path / "w.db"))
+    db.import_entries("alice", [entry(5, ["gpu"])], "a.txt", 1.0)
+    db.add("bob", entry())
+    assert item_row(db) == (5, "gpu")
+    assert db.has_subscription(URL, "bob")
+
+
+def test_reimport_drops_removed_urls(tmp_path):
+    db = WatchlistDB(str(tmp_path / "w.db"))
+    other = "https://www.amazon.com/dp/B000000002"
+    db.import_entries("alice", [entry(), entry(url=other)], "a.txt", 1.0)
+    db.import_entries("alice", [entry()], "a.txt", 2.0)
+    assert item_row(db, other) is None
+    assert db.count() == 1
+
+
+def test_sync_removes_deleted_subscribers_and_files(tmp_path):
+    db = WatchlistDB(str(tmp_path / "w.db"))
+    a, b = tmp_path / "a.txt", tmp_path / "b.txt"
+    a.write_text("B000000001\n")
+    b.write_text("B000000002\n")
+    alice = Subscriber("alice", "1", str(a))
+    bob = Subscriber("bob", "2", str(b))
+    apt.sync_watchlists(db, [alice, bob])
+    assert db.count() == 2
+
+    os.unlink(a)
+    apt.sync_watchlists(db, [alice, bob])
+    assert [e.target for e in db.export_entries("alice")] == []
+    assert db.count() == 1
+
+    apt.sync_watchlists(db, [alice])
+    assert db.count() == 0
+    assert db.conn.execute("SELECT count(*) FROM imports").fetchone()[0] == 0
+
+    # A re-created file with the old mtime is imported again
+    b.write_text("B000000002\n")
+    apt.sync_watchlists(db, [alice, bob])
+    assert db.count() == 1
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+
+import json
+import logging
+import os
+from typing import Dict, List, Optional
+
+logger = logging.getLogger("AmazonTracker")
+
+
+# ---------- Variant families (parent ASIN -> watched children) ----------
+
+class FamilyIndex:
+    """Remembers which watched ASINs share a parent listing.
+
+    The parent map is persisted so that grouping works from the first cycle
+    after a restart. Sibling prices seen on a family page are kept only for
+    the current cycle.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.parent_of: Dict[str, str] = {}
+        self.cycle_prices: Dict[str, Optional[float]] = {}
+        if os.path.exists(path):
+            try:
+                with open(path) as f:
+                    self.parent_of = json.load(f)
+                logger.info(f"Loaded {len(self.parent_of)} variant->parent links")
+            except Exception as e:
+                logger.info(f"Failed to load families {path}: {e}")
+
+    def save(self) -> None:
+        tmp = self.path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.parent_of, f, indent=2, sort_keys=True)
+        os.replace(tmp, self.path)
+
+    def start_cycle(self) -> None:
+        self.cycle_prices = {}
+
+    def observe(
+        self, asin: str, parent: Optional[str], siblings: Dict[str, Optional[float]]
+    ) -> None:
+        """Record a detail page's parent ASIN and the sibling prices it listed."""
+        if parent:
+            self.parent_of[asin] = parent
+            for sib in siblings:
+                self.parent_of[sib] = parent
+        for sib, price in siblings.items():
+            if price is not None:
+                self.cycle_prices[sib] = price
+
+    def sibling_price(self, asin: str) -> Optional[float]:
+        return self.cycle_prices.get(asin)
+
+    def group(self, asins: List[str]) -> Dict[str, List[str]]:
+        """Group ASINs by known parent; unknown parents form their own group."""
+        groups: Dict[str, List[str]] = {}
+        for asin in asins:
+            groups.setdefault(self.parent_of.get(asin, asin), []).append(asin)
+        return groups
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger("AmazonTracker")
+
+
+@dataclass
+class PendingChange:
+    item: Any              # WatchItem (kept loose to avoid an import cycle)
+    old_price: float
+    new_price: float
+    source: str
+    due: float
+
+
+# ---------- Deferred verification of price changes ----------
+
+class VerifyQueue:
+    """Price changes wait here until a targeted re-fetch confirms them.
+
+    Only the changed items are re-fetched; a change that does not survive
+    the second look (bad selector hit, coupon price) never alerts.
+    """
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.pending: Dict[str, PendingChange] = {}
+        self.confirmed = 0
+        self.discarded = 0
+
+    def add(self, item: Any, old_price: float, new_price: float, source: str) -> None:
+        if item.url in self.pending:
+            return
+        self.pending[item.url] = PendingChange(
+            item, old_price, new_price, source, time.time() + self.delay
+        )
+        logger.info(
+            f"Verify queued: {old_price:.2f}→{new_price:.2f} ({source}) {item.url}"
+        )
+
+    def is_pending(self, url: str) -> bool:
+        return url in self.pending
+
+    def for_market(self, marketplace: str) -> List[PendingChange]:
+        return sorted(
+            (p for p in self.pending.values() if p.item.marketplace == marketplace),
+            key=lambda p: p.due,
+        )
+
+    def resolve(self, url: str, confirmed: bool) -> Optional[PendingChange]:
+        change = self.pending.pop(url, None)
+        if change is None:
+            return None
+        if confirmed:
+            self.confirmed += 1
+        else:
+            self.discarded += 1
+            logger.info(
+                f"Verify discarded: {change.old_price:.2f}→{change.new_price:.2f} "
+                f"did not repeat for {url}"
+            )
+        return change
+
+    def reset_counters(self) -> None:
+        self.confirmed = 0
+        self.discarded = 0
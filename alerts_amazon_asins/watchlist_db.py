@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+
+import logging
+import sqlite3
+import sys
+from dataclasses import dataclass, field
+from typing import Iterator, List, Optional, Tuple
+
+logger = logging.getLogger("AmazonTracker")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    id          INTEGER PRIMARY KEY,
+    url         TEXT NOT NULL UNIQUE,
+    site        TEXT NOT NULL,
+    marketplace TEXT NOT NULL,
+    target      TEXT NOT NULL,            -- watchlist text form: ASIN, amazon.ca:ASIN or URL
+    priority    INTEGER NOT NULL DEFAULT 0,
+    tags        TEXT NOT NULL DEFAULT '',
+    next_check  REAL NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS items_due ON items (marketplace, priority DESC, id);
+
+CREATE TABLE IF NOT EXISTS subscriptions (
+    item_id    INTEGER NOT NULL REFERENCES items(id) ON DELETE CASCADE,
+    subscriber TEXT NOT NULL,
+    rules      TEXT NOT NULL DEFAULT '',  -- rule texts joined by ' | '
+    PRIMARY KEY (item_id, subscriber)
+);
+
+CREATE TABLE IF NOT EXISTS imports (
+    path  TEXT PRIMARY KEY,
+    mtime REAL NOT NULL
+);
+"""
+
+
+@dataclass
+class WatchEntry:
+    """One parsed watchlist line, before it is bound to live objects."""
+    url: str
+    site: str
+    marketplace: str
+    target: str
+    rules: List[str] = field(default_factory=list)
+    priority: int = 0
+    tags: List[str] = field(default_factory=list)
+
+    def to_line(self) -> str:
+        parts = [self.target, *self.rules]
+        if self.priority:
+            parts.append(f"priority={self.priority}")
+        if self.tags:
+            parts.append(f"tags={','.join(self.tags)}")
+        return " | ".join(parts)
+
+
+# ---------- SQLite-backed watchlist ----------
+
+class WatchlistDB:
+    """Watched items and who subscribes to them, in one indexed table pair.
+
+    Nothing is held in memory between queries: pollers walk the due items
+    of one marketplace with a keyset cursor (priority, id) in small
+    batches, so memory and startup time stay flat as the watchlist grows.
+    The text watchlists remain the editing format and are re-imported
+    whenever their mtime changes.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def commit(self) -> None:
+        self.conn.commit()
+
+    # Import / export
+
+    def needs_import(self, path: str, mtime: float) -> bool:
+        row = self.conn.execute("SELECT mtime FROM imports WHERE path = ?", (path,)).fetchone()
+        return row is None or row[0] != mtime
+
+    def import_entries(
+        self, subscriber: str, entries: List[WatchEntry], path: str, mtime: float
+    ) -> None:
+        """Make `subscriber`'s subscriptions exactly `entries`, in one transaction."""
+        with self.conn:
+            self.conn.execute("DELETE FROM subscriptions WHERE subscriber = ?", (subscriber,))
+            for e in entries:
+                self._upsert(subscriber, e)
+            self.conn.execute(
+                "DELETE FROM items WHERE id NOT IN (SELECT item_id FROM subscriptions)"
+            )
+            self.conn.execute(
+                "INSERT OR REPLACE INTO imports (path, mtime) VALUES (?, ?)", (path, mtime)
+            )
+        logger.info(f"Imported {len(entries)} watchlist entries for {subscriber} from {path}")
+
+    def _upsert(self, subscriber: str, e: WatchEntry, overwrite: bool = True) -> None:
+        """Insert or update one item and `subscriber`'s rules for it.
+
+        With `overwrite`, priority and tags are replaced by the entry's, so
+        an edited watchlist can lower a priority or clear its tags; without
+        it an existing item keeps them.
+        """
+        conflict = (
+            "DO UPDATE SET priority = excluded.priority, tags = excluded.tags"
+            if overwrite else "DO NOTHING"
+        )
+        self.conn.execute(
+            "INSERT INTO items (url, site, marketplace, target, priority, tags) "
+            f"VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT(url) {conflict}",
+            (e.url, e.site, e.marketplace, e.target, e.priority, ",".join(e.tags)),
+        )
+        self.conn.execute(
+            "INSERT OR REPLACE INTO subscriptions (item_id, subscriber, rules) "
+            "SELECT id, ?, ? FROM items WHERE url = ?",
+            (subscriber, " | ".join(e.rules), e.url),
+        )
+
+    def forget_import(self, subscriber: str, path: str) -> None:
+        """Drop everything imported from `path`, whose file is gone."""
+        if self.conn.execute("SELECT 1 FROM imports WHERE path = ?", (path,)).fetchone() is None:
+            return
+        with self.conn:
+            self.conn.execute("DELETE FROM subscriptions WHERE subscriber = ?", (subscriber,))
+            self.conn.execute(
+                "DELETE FROM items WHERE id NOT IN (SELECT item_id FROM subscriptions)"
+            )
+            self.conn.execute("DELETE FROM imports WHERE path = ?", (path,))
+        logger.info(f"Removed {subscriber}'s watchlist entries; {path} no longer exists")
+
+    def prune(self, subscribers: List[str], paths: List[str]) -> None:
+        """Drop removed subscribers' subscriptions and imports, and items nobody watches."""
+        sub_marks = ",".join("?" * len(subscribers))
+        path_marks = ",".join("?" * len(paths))
+        with self.conn:
+            self.conn.execute(
+                f"DELETE FROM subscriptions WHERE subscriber NOT IN ({sub_marks})", subscribers
+            )
+            self.conn.execute(f"DELETE FROM imports WHERE path NOT IN ({path_marks})", paths)
+            self.conn.execute(
+                "DELETE FROM items WHERE id NOT IN (SELECT item_id FROM subscriptions)"
+            )
+
+    def add(self, subscriber: str, entry: WatchEntry) -> None:
+        with self.conn:
+            self._upsert(subscriber, entry, overwrite=False)
+
+    def export_entries(self, subscriber: str) -> Iterator[WatchEntry]:
+        cur = self.conn.execute(
+            "SELECT i.url, i.site, i.marketplace, i.target, s.rules, i.priority, i.tags "
+            "FROM items i JOIN subscriptions s ON s.item_id = i.id "
+            "WHERE s.subscriber = ? ORDER BY i.id",
+            (subscriber,),
+        )
+        for url, site, market, target, rules, priority, tags in cur:
+            yield WatchEntry(
+                url, site, market, target,
+                rules.split(" | ") if rules else [],
+                priority,
+                tags.split(",") if tags else [],
+            )
+
+    # Queries
+
+    def count(self, marketplace: Optional[str] = None, due_before: Optional[float] = None) -> int:
+        sql, args = "SELECT count(*) FROM items WHERE 1", []
+        if marketplace:
+            sql += " AND marketplace = ?"
+            args.append(marketplace)
+        if due_before is not None:
+            sql += " AND next_check <= ?"
+            args.append(due_before)
+        return self.conn.execute(sql, args).fetchone()[0]
+
+    def marketplaces(self) -> List[str]:
+        return [r[0] for r in self.conn.execute("SELECT DISTINCT marketplace FROM items")]
+
+    def has_subscription(self, url: str, subscriber: str) -> bool:
+        return self.conn.execute(
+            "SELECT 1 FROM items i JOIN subscriptions s ON s.item_id = i.id "
+            "WHERE i.url = ? AND s.subscriber = ?",
+            (url, subscriber),
+        ).fetchone() is not None
+
+    def subscriptions(self, item_id: int) -> List[Tuple[str, str]]:
+        """(subscriber name, rules text) for one item."""
+        return self.conn.execute(
+            "SELECT subscriber, rules FROM subscriptions WHERE item_id = ?", (item_id,)
+        ).fetchall()
+
+    def iter_due(
+        self, marketplace: str, now: float, batch: int = 200
+    ) -> Iterator[List[Tuple]]:
+        """Batches of due (id, url, site, marketplace, priority, tags) rows.
+
+        Keyset pagination, not an open cursor, so next_check updates made
+        while a batch is being checked never make the walk skip or repeat.
+        """
+        last_priority, last_id = None, -1
+        while True:
+            if last_priority is None:
+                rows = self.conn.execute(
+                    "SELECT id, url, site, marketplace, priority, tags FROM items "
+                    "WHERE marketplace = ? AND next_check <= ? "
+                    "ORDER BY priority DESC, id LIMIT ?",
+                    (marketplace, now, batch),
+                ).fetchall()
+            else:
+                rows = self.conn.execute(
+                    "SELECT id, url, site, marketplace, priority, tags FROM items "
+                    "WHERE marketplace = ? AND next_check <= ? "
+                    "AND (priority < ? OR (priority = ? AND id > ?)) "
+                    "ORDER BY priority DESC, id LIMIT ?",
+                    (marketplace, now, last_priority, last_priority, last_id, batch),
+                ).fetchall()
+            if not rows:
+                return
+            yield rows
+            last_id, last_priority = rows[-1][0], rows[-1][4]
+
+    def set_next_check(self, url: str, next_check: float) -> None:
+        self.conn.execute("UPDATE items SET next_check = ? WHERE url = ?", (next_check, url))
+
+
+if __name__ == "__main__":
+    # python3 watchlist_db.py export <subscriber>  -> text watchlist on stdout
+    from config import WATCHLIST_DB
+
+    if len(sys.argv) != 3 or sys.argv[1] != "export":
+        sys.exit("usage: watchlist_db.py export <subscriber>")
+    db = WatchlistDB(WATCHLIST_DB)
+    for entry in db.export_entries(sys.argv[2]):
+        print(entry.to_line())
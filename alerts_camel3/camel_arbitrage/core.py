@@ -5,12 +5,16 @@ from datetime import datetime
 import sys
 
 sys.path.insert(0, os.path.dirname(__file__) + "/..")
+sys.path.insert(0, os.path.dirname(__file__) + "/../..")
 import constants
+from common.deal_filter import DealFilter
 
 class ArbitrageScanner:
     def __init__(self):
         self.seen_file = constants.SEEN_FILE
         self.seen_asins = self._load_seen()
+        # Top-drops entries carry no title yet, so rules match on the ASIN
+        self.deal_filter = DealFilter(constants.RULES_FILE, text_fields=("title", "asin"))
 
     def _load_seen(self):
         seen = set()
@@ -80,8 +84,8 @@ class ArbitrageScanner:
                 if new_deals:
                     print(f"🚨 {len(new_deals)} NEW B-ASIN DEALS!")
                     
-                    # Send each deal as a separate message
-                    for deal in new_deals:
+                    # Send each deal that passes the rules as a separate message
+                    for deal in self.deal_filter.filter(new_deals):
                         notifier.send_alert(deal)
                     
                     # Add to seen and save ATOMICALLY
@@ -93,6 +97,7 @@ class ArbitrageScanner:
             else:
                 print("ℹ️ No deals parsed")
             
+            print(f"📏 Rules: {self.deal_filter.summary()}")
             print(f"⏱️ Next in {constants.POLL_INTERVAL}s")
             time.sleep(constants.POLL_INTERVAL)
 
@@ -3,3 +3,5 @@ CC_BOT_TOKEN = ""
 CC_CHAT_ID = ""
 POLL_INTERVAL = 100
 SEEN_FILE = "/home/piblack/projects/camel-arbitrage/seen_asins.txt"
+# Deal filter rules (see common/deal_filter.py); no file means every deal passes
+RULES_FILE = "/home/piblack/projects/camel-arbitrage/camel_rules.txt"
@@ -10,6 +10,8 @@ SD_SEENFILE = "sd_seen_urls.txt"
 # Telegram bot + chat for Slickdeals alerts (NEW BOT)
 SD_BOTTOKEN = ""
 SD_CHATID = ""
+# Every chat that gets the alerts (group ids are negative)
+SD_CHATIDS = [SD_CHATID]
 
 # Your Slickdeals referral user id
 SD_USERID = ""
@@ -17,7 +19,68 @@ SD_USERID = ""
 # Minimum likes threshold
 MIN_LIKES = 0
 
-# Polling interval in seconds
+# Deal filter rules (see common/deal_filter.py), hot-reloaded on change;
+# without the file: junk keywords excluded, likes >= MIN_LIKES
+SD_RULES_FILE = "sd_rules.txt"
+
+# Saved keyword searches, one query per line ("query | minutes" to override
+# the interval); all share the seen log and a request budget per minute
+SD_SEARCHES_FILE = "sd_searches.txt"
+SD_SEARCHES_STATE = "sd_searches_state.json"
+SD_SEARCH_INTERVAL = 900
+SD_SEARCH_BUDGET = 20
+SD_SEARCH_BURST = 5
+
+# Optional WebSub push: subscribe SD_RSS_URLS at SD_PUSH_HUB; the hub POSTs
+# updates to SD_PUSH_CALLBACK, a public URL forwarded (reverse proxy or
+# tunnel) to the local listener. While every subscription is live, the
+# feeds are polled only every SD_PUSH_SAFETY_INTERVAL seconds. Empty hub =
+# polling only. Push needs SD_PUSH_SECRET: pushes are HMAC-checked with it
+# and unsigned ones dropped.
+SD_PUSH_HUB = ""
+SD_PUSH_CALLBACK = ""
+SD_PUSH_LISTEN_HOST = "127.0.0.1"
+SD_PUSH_LISTEN_PORT = 8765
+SD_PUSH_SECRET = ""
+SD_PUSH_SAFETY_INTERVAL = 1800
+
+# Polling interval in seconds, used until the arrival profile has data
 POLLINTERVAL = 180
 
-TIMEFORMAT = "%Y-%m-%d %H:%M:%S"
\ No newline at end of file
+# Adaptive polling: the next poll is when SD_POLL_TARGET new items are
+# expected, from a learned per-feed hour-of-day profile, within these bounds
+SD_POLL_MIN = 60
+SD_POLL_MAX = 900
+SD_POLL_TARGET = 1.0
+SD_POLL_ALPHA = 0.2
+SD_POLL_PROFILE = "sd_poll_profile.json"
+
+TIMEFORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Feeds are fetched in parallel; each one gets its own timeout
+SD_FEED_TIMEOUT = 20
+SD_FETCH_WORKERS = 8
+
+# Seen log: hour-bucketed, append-only; SD_SEENFILE is imported once if present
+SD_SEEN_LOG = "sd_seen.log"
+SD_SEEN_HOURS = 24
+
+# Thread-page enrichment (price, store, score) for new alerts: a few
+# fetches at a time, cached by thread id; alerts wait at most
+# SD_ENRICH_BUDGET seconds for it
+SD_ENRICH_WORKERS = 3
+SD_ENRICH_BUDGET = 2.0
+SD_ENRICH_CACHE_SIZE = 500
+SD_ENRICH_CACHE_TTL = 1800
+
+# Trending tier: like counts of the top SD_TREND_SCAN items per feed are kept
+# in a ring of SD_TREND_SLOTS samples per thread; a thread gaining
+# SD_TREND_MIN_GAIN likes within SD_TREND_WINDOW seconds alerts again
+SD_TREND_SCAN = 50
+SD_TREND_SLOTS = 16
+SD_TREND_WINDOW = 1200
+SD_TREND_MIN_GAIN = 50
+SD_TREND_TTL = 6 * 3600
+
+# Per-chat alert queue; when full, new alerts for that chat are dropped
+SD_SEND_QUEUE = 100
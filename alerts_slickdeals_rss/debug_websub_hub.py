@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+
+"""Local stand-in WebSub hub, for checking push mode without Slickdeals.
+
+    python3 debug_websub_hub.py              run the hub on :8766
+
+The hub verifies subscribers with a challenge GET and, on a publish ping
+(hub.mode=publish, hub.url=<topic>), fetches the topic and POSTs it to
+every subscriber, signed with their secret. Topics may be file:// URLs.
+tests/test_websub.py runs a PushReceiver round trip against it.
+"""
+
+import hashlib
+import hmac
+import secrets
+import threading
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+import requests
+
+HUB_PORT = 8766
+subscribers = {}  # topic -> {callback: secret}
+
+
+class HubHandler(BaseHTTPRequestHandler):
+    def log_message(self, fmt, *args):
+        print(f"[hub] {fmt % args}")
+
+    def do_POST(self):
+        form = parse_qs(self.rfile.read(int(self.headers.get("Content-Length", 0))).decode())
+        mode = form.get("hub.mode", [""])[0]
+        if mode == "subscribe":
+            self.send_response(202)
+            self.end_headers()
+            threading.Thread(target=verify, args=(form,), daemon=True).start()
+        elif mode == "publish":
+            self.send_response(204)
+            self.end_headers()
+            threading.Thread(target=publish, args=(form["hub.url"][0],), daemon=True).start()
+        else:
+            self.send_response(400)
+            self.end_headers()
+
+
+def verify(form):
+    topic, callback = form["hub.topic"][0], form["hub.callback"][0]
+    challenge = secrets.token_hex(8)
+    params = {
+        "hub.mode": "subscribe",
+        "hub.topic": topic,
+        "hub.challenge": challenge,
+        "hub.lease_seconds": form.get("hub.lease_seconds", ["3600"])[0],
+    }
+    r = requests.get(callback, params=params, timeout=5)
+    if r.status_code == 200 and r.text == challenge:
+        subscribers.setdefault(topic, {})[callback] = form.get("hub.secret", [""])[0]
+        print(f"[hub] Verified {callback} for {topic}")
+    else:
+        print(f"[hub] Verification failed for {callback}: HTTP {r.status_code}")
+
+
+def publish(topic):
+    with urllib.request.urlopen(topic) as f:
+        body = f.read()
+    for callback, secret in subscribers.get(topic, {}).items():
+        headers = {"Content-Type": "application/rss+xml", "Link": f'<{topic}>; rel="self"'}
+        if secret:
+            headers["X-Hub-Signature"] = "sha256=" + hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+        r = requests.post(callback, data=body, headers=headers, timeout=5)
+        print(f"[hub] Delivered {len(body)} bytes to {callback}: HTTP {r.status_code}")
+
+
+def serve(port=HUB_PORT):
+    server = ThreadingHTTPServer(("127.0.0.1", port), HubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    print(f"[hub] Stand-in hub on http://127.0.0.1:{HUB_PORT}/")
+    serve()
+    threading.Event().wait()
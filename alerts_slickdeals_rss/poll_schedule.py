@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+
+import json
+import os
+import time
+from datetime import datetime
+
+HOUR = 3600
+STEP = 30  # resolution, in seconds, of the next-poll search
+
+
+class PollSchedule:
+    """Picks the next poll time from each feed's learned hour-of-day profile.
+
+    Every feed has 24 bins of new items per hour. After a poll, the items a
+    feed gained over the elapsed time give one rate sample for the hour
+    the poll window fell in, folded in with an EWMA. The next poll is the
+    earliest time, within [min_interval, max_interval], by which the summed
+    rates predict `target` new items. Until a feed has some data the fixed
+    `default_interval` is used. The profile is saved as JSON after every
+    poll, so restarts keep what was learned.
+    """
+
+    def __init__(self, path, default_interval, min_interval, max_interval, target=1.0, alpha=0.2):
+        self.path = path
+        self.default_interval = default_interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.target = target
+        self.alpha = alpha
+        self.rates = {}  # feed -> [items/hour or None] * 24
+        self.last_poll = None
+        self.last_links = {}
+        if os.path.exists(path):
+            try:
+                with open(path) as f:
+                    self.rates = json.load(f)
+                print(f"[schedule] Loaded hour-of-day profile for {len(self.rates)} feeds")
+            except Exception as e:
+                print(f"[schedule] Could not load {path}: {e}")
+
+    def observe(self, feed_links, now=None):
+        """Fold one poll into the profile; feed_links maps feed -> links (None = failed).
+
+        A feed's arrivals are the links it did not return on the previous
+        poll. The seen store only holds alerted links, so it would count
+        filtered-out items again on every poll.
+        """
+        now = now or time.time()
+        started, self.last_poll = self.last_poll, now
+        previous, self.last_links = self.last_links, {
+            feed: set(links) for feed, links in feed_links.items() if links is not None
+        }
+        if started is None:
+            return  # first poll of a run: nothing to compare against
+        elapsed = now - started
+        if elapsed > 2 * self.max_interval:
+            return  # too long to say which hour the items arrived in
+
+        hour = datetime.fromtimestamp(started + elapsed / 2).hour
+        for feed, links in self.last_links.items():
+            if feed not in previous:
+                continue
+            sample = len(links - previous[feed]) * HOUR / elapsed
+            bins = self.rates.setdefault(feed, [None] * 24)
+            old = bins[hour]
+            bins[hour] = sample if old is None else self.alpha * sample + (1 - self.alpha) * old
+        self._save()
+
+    def _rate(self, bins, hour):
+        """Items/hour for one feed at `hour`; unlearned hours use the feed's mean."""
+        if bins[hour] is not None:
+            return bins[hour]
+        known = [r for r in bins if r is not None]
+        return sum(known) / len(known) if known else None
+
+    def total_rate(self, hour):
+        rates = [self._rate(bins, hour) for bins in self.rates.values()]
+        rates = [r for r in rates if r is not None]
+        return sum(rates) if rates else None
+
+    def next_interval(self, now=None):
+        """(seconds until the next poll, expected new items by then)."""
+        now = now or time.time()
+        if self.total_rate(datetime.fromtimestamp(now).hour) is None:
+            return self.default_interval, None
+
+        expected, t = 0.0, 0
+        while t < self.max_interval:
+            rate = self.total_rate(datetime.fromtimestamp(now + t).hour)
+            expected += rate * STEP / HOUR
+            t += STEP
+            if t >= self.min_interval and expected >= self.target:
+                break
+        return max(t, self.min_interval), expected
+
+    def _save(self):
+        tmp = self.path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.rates, f)
+        os.replace(tmp, self.path)
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+
+import json
+import os
+import time
+import zlib
+from urllib.parse import quote_plus
+
+SEARCH_URL = "https://slickdeals.net/newsearch.php?searcharea=deals&searchin=first&q={q}&rss=1"
+MIN_INTERVAL = 60
+
+
+class SavedSearch:
+    """One keyword search feed and its schedule / conditional-request state."""
+
+    def __init__(self, query, interval):
+        self.query = query
+        self.interval = interval
+        self.url = SEARCH_URL.format(q=quote_plus(query))
+        # Stable per-query offset, so searches added together don't fire together
+        self.offset = zlib.crc32(query.encode()) % max(1, interval)
+        self.next_due = None
+        self.etag = None
+        self.last_modified = None
+        self.failures = 0
+
+    def headers(self):
+        h = {}
+        if self.etag:
+            h["If-None-Match"] = self.etag
+        if self.last_modified:
+            h["If-Modified-Since"] = self.last_modified
+        return h
+
+
+class RequestBudget:
+    """Non-blocking token bucket shared by every saved search."""
+
+    def __init__(self, per_minute, burst):
+        self.rate = per_minute / 60
+        self.capacity = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    def take(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+    def wait_time(self):
+        return max(0.0, (1 - self.tokens) / self.rate)
+
+
+class SearchRegistry:
+    """Saved Slickdeals searches, read from a text file, one per line:
+
+        rtx 4070                 searched every default_interval seconds
+        lego star wars | 30      every 30 minutes
+
+    Intervals under a minute (e.g. `| 0`) are raised to one minute.
+
+    The file is re-read when its mtime changes. Each search is first due
+    at its own offset into its interval, then every interval after its
+    last fetch; failures back off exponentially. due() hands out only as
+    many searches as the shared request budget allows, most overdue
+    first, so hundreds of searches become a steady trickle. ETag and
+    Last-Modified are kept per search (and saved to `state_path`) for
+    conditional requests.
+    """
+
+    def __init__(self, path, state_path, default_interval, budget):
+        self.path = path
+        self.state_path = state_path
+        self.default_interval = default_interval
+        self.budget = budget
+        self.searches = {}
+        self._mtime = None
+        self._state = {}
+        if os.path.exists(state_path):
+            try:
+                with open(state_path) as f:
+                    self._state = json.load(f)
+            except Exception as e:
+                print(f"[search] Could not load {state_path}: {e}")
+        self.reload_if_changed()
+
+    def __len__(self):
+        return len(self.searches)
+
+    def reload_if_changed(self):
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            return
+        if mtime == self._mtime:
+            return
+        self._mtime = mtime
+
+        searches = {}
+        with open(self.path) as f:
+            for line in f:
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                query, _, minutes = (p.strip() for p in line.partition("|"))
+                interval = int(minutes) * 60 if minutes.isdigit() else self.default_interval
+                if interval < MIN_INTERVAL:
+                    print(f"[search] {query!r}: interval under a minute, using 1 minute")
+                    interval = MIN_INTERVAL
+                old = self.searches.get(query)
+                if old is not None and old.interval == interval:
+                    searches[query] = old
+                    continue
+                search = searches[query] = SavedSearch(query, interval)
+                state = self._state.get(query, {})
+                search.etag = state.get("etag")
+                search.last_modified = state.get("last_modified")
+        self.searches = searches
+        print(f"[search] Loaded {len(searches)} saved searches from {self.path}")
+
+    def due(self, now=None):
+        """Searches to fetch now, most overdue first, within the request budget."""
+        now = now or time.time()
+        self.reload_if_changed()
+        for s in self.searches.values():
+            if s.next_due is None:
+                s.next_due = now - now % s.interval + s.offset
+                if s.next_due < now:
+                    s.next_due += s.interval
+        overdue = sorted((s for s in self.searches.values() if s.next_due <= now), key=lambda s: s.next_due)
+        picked = []
+        for s in overdue:
+            if not self.budget.take():
+                break
+            picked.append(s)
+        return picked
+
+    def done(self, search, ok, now=None):
+        now = now or time.time()
+        if ok:
+            search.failures = 0
+            search.next_due = now + search.interval
+        else:
+            search.failures += 1
+            search.next_due = now + min(search.interval * 2 ** search.failures, 6 * 3600)
+
+    def next_wakeup(self, now=None):
+        """Seconds until the next search could be fetched (None if there are none)."""
+        now = now or time.time()
+        pending = [s.next_due for s in self.searches.values() if s.next_due is not None]
+        if not pending:
+            return None if not self.searches else 0.0
+        return max(min(pending) - now, self.budget.wait_time(), 0.0)
+
+    def save(self):
+        state = {
+            q: {"etag": s.etag, "last_modified": s.last_modified}
+            for q, s in self.searches.items()
+            if s.etag or s.last_modified
+        }
+        if state == self._state:
+            return
+        tmp = self.state_path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(state, f)
+        os.replace(tmp, self.state_path)
+        self._state = state
@@ -1,13 +1,26 @@
 #!/usr/bin/env python3
 
+import io
+import os
 import re
+import sys
 import time
-import os
 import requests
 import xml.etree.ElementTree as ET
-from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
 
 import constants as const
+from seen_store import SeenStore
+from poll_schedule import PollSchedule
+from saved_searches import RequestBudget, SearchRegistry
+from telegram_fanout import FanoutSender
+from thread_enrich import ThreadEnricher, thread_id
+from trending import LikeVelocity
+from websub import PushReceiver
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from common.deal_filter import DealFilter
 
 
 def referral_link(original_link: str, user_id: str) -> str:
@@ -16,222 +29,363 @@ def referral_link(original_link: str, user_id: str) -> str:
     to a short referral form:
     https://slickdeals.net/sh/thread-{thread_id}/e/3/c/deal-details/u/{user_id}/
     """
-    match = re.search(r"/f/(\d+)", original_link)
-    if match:
-        thread_id = match.group(1)
-        return f"https://slickdeals.net/sh/thread-{thread_id}/e/3/c/deal-details/u/{user_id}/"
+    tid = thread_id(original_link)
+    if tid:
+        return f"https://slickdeals.net/sh/thread-{tid}/e/3/c/deal-details/u/{user_id}/"
     return original_link
 
-def load_sd_seen(max_age_hours: int = 24):
-    """
-    Load seen URLs from SD_SEENFILE, auto-purging records older than max_age_hours.
-    File format (3 lines per record):
-      1: URL
-      2: title || likes=N || YYYY-MM-DD HH:MM:SS
-      3: ---
+def fetch_rss(i, rss_url, seen, counts=None):
+    """Stream + parse one feed; runs on a worker thread.
+
+    The body is parsed straight off the socket, so once the parser stops at
+    an already-seen item (and has SD_TREND_SCAN like counts) the rest of
+    the feed is never downloaded.
     """
-    seen = set()
-    fresh_lines = []
-    cutoff = datetime.now() - timedelta(hours=max_age_hours)
+    print(f"[DEBUG] Fetching RSS #{i}: {rss_url.split('?')[0]}...")
+    with requests.get(
+        rss_url,
+        timeout=const.SD_FEED_TIMEOUT,
+        headers={"User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X)"},
+        stream=True,
+    ) as resp:
+        resp.raise_for_status()
+        resp.raw.decode_content = True
+        return parse_items(resp.raw, source=f"RSS#{i}", seen=seen, counts=counts)
 
-    if not os.path.exists(const.SD_SEENFILE):
-        return seen
 
-    with open(const.SD_SEENFILE) as f:
-        lines = f.read().splitlines()
+def fetch_all_rss(seen=frozenset()):
+    """Fetch every feed in SD_RSS_URLS concurrently, merging as each arrives.
 
-    for i in range(0, len(lines), 3):
-        if i + 1 >= len(lines):
-            continue
-        url = lines[i].strip()
-        meta = lines[i + 1].strip()
-        parts = [p.strip() for p in meta.split("||")]
-        ts_str = parts[-1] if parts else ""
+    Returns (unique items, {feed url: its links, or None if it failed},
+    [(link, title, likes)] of every item scanned, highest count per link).
+    """
+    feed_links = {url: None for url in const.SD_RSS_URLS}
+    feed_counts = {url: [] for url in const.SD_RSS_URLS}
+    seen_links = set()
+    unique_items = []
+    total = 0
+    started = time.monotonic()
 
-        try:
-            ts = datetime.strptime(ts_str, const.TIMEFORMAT)
-        except Exception:
-            # If parsing fails, keep the record but don't add to seen
-            fresh_lines.extend(lines[i : i + 3])
-            continue
+    workers = max(1, min(len(const.SD_RSS_URLS), const.SD_FETCH_WORKERS))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(fetch_rss, i, url, seen, feed_counts[url]): (i, url)
+            for i, url in enumerate(const.SD_RSS_URLS, 1)
+        }
+        for fut in as_completed(futures):
+            i, url = futures[fut]
+            try:
+                items = fut.result()
+            except Exception as e:
+                print(f"[DEBUG] RSS#{i} failed: {e}")
+                continue
+            feed_links[url] = [item["link"] for item in items]
+            total += len(items)
+            for item in items:
+                if item["link"] not in seen_links:
+                    seen_links.add(item["link"])
+                    unique_items.append(item)
 
-        if ts < cutoff:
-            # Too old → drop
-            continue
+    print(
+        f"[DEBUG] Combined {total} → {len(unique_items)} unique deals "
+        f"from {len(const.SD_RSS_URLS)} feeds in {time.monotonic() - started:.1f}s"
+    )
+    counts = {}
+    for url, rows in feed_counts.items():
+        for link, title, likes in rows:
+            if likes >= counts.get(link, (None, -1))[1]:
+                counts[link] = (title, likes)
+    return unique_items, feed_links, [(link, t, n) for link, (t, n) in counts.items()]
 
-        fresh_lines.extend(lines[i : i + 3])
-        seen.add(url)
+def fetch_search(search, seen):
+    """Conditional GET of one saved-search feed; runs on a worker thread."""
+    headers = {"User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X)", **search.headers()}
+    with requests.get(search.url, timeout=const.SD_FEED_TIMEOUT, headers=headers, stream=True) as resp:
+        if resp.status_code == 304:
+            return []
+        resp.raise_for_status()
+        resp.raw.decode_content = True
+        items = parse_items(resp.raw, source=f"search:{search.query}", seen=seen)
+        # Only a fully parsed body may be skipped with a 304 next time
+        search.etag = resp.headers.get("ETag")
+        search.last_modified = resp.headers.get("Last-Modified")
+        return items
 
-    with open(const.SD_SEENFILE, "w") as f:
-        for line in fresh_lines:
-            f.write(line + "\n")
 
-    print(
-        f"[seen] Loaded {len(seen)} URLs, kept {len(fresh_lines)//3} records in {const.SD_SEENFILE}"
-    )
-    return seen
-
-
-def append_sd_seen(new_items):
-    """Append new records to SD_SEENFILE."""
-    if not new_items:
-        return
-    with open(const.SD_SEENFILE, "a") as f:
-        for it in new_items:
-            ts = datetime.now().strftime(const.TIMEFORMAT)
-            meta = f"{it['title']} || likes={it['likes']} || {ts}"
-            f.write(it["link"] + "\n")  # store the original SD link as key
-            f.write(meta + "\n")
-            f.write("---\n")
-    print(f"[seen] Appended {len(new_items)} records to {const.SD_SEENFILE}")
-
-
-def fetch_all_rss():
-    """Fetch BOTH Frontpage + Popular RSS feeds."""
-    all_items = []
-    
-    for i, rss_url in enumerate(const.SD_RSS_URLS, 1):
-        print(f"[DEBUG] Fetching RSS #{i}: {rss_url.split('?')[0]}...")
-        try:
-            resp = requests.get(
-                rss_url,
-                timeout=20,
-                headers={"User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X)"},
-            )
-            resp.raise_for_status()
-            items = parse_items(resp.text, source=f"RSS#{i}")
-            all_items.extend(items)
-        except Exception as e:
-            print(f"[DEBUG] RSS#{i} failed: {e}")
-    
-    # FIXED: Efficient set-based deduplication (no dead code)
-    seen_links = set()
+def fetch_searches(registry, seen, skip_links=frozenset()):
+    """Fetch the saved searches that are due and within budget, concurrently."""
+    due = registry.due()
+    if not due:
+        return []
+    links = set(skip_links)
     unique_items = []
-    for item in all_items:
-        link = item['link']
-        if link not in seen_links:
-            seen_links.add(link)
-            unique_items.append(item)
-    
-    print(f"[DEBUG] Combined {len(all_items)} → {len(unique_items)} unique deals")
+    workers = max(1, min(len(due), const.SD_FETCH_WORKERS))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(fetch_search, s, seen): s for s in due}
+        for fut in as_completed(futures):
+            search = futures[fut]
+            try:
+                items = fut.result()
+            except Exception as e:
+                print(f"[search] {search.query!r} failed: {e}")
+                registry.done(search, ok=False)
+                continue
+            registry.done(search, ok=True)
+            for item in items:
+                if item["link"] not in links:
+                    links.add(item["link"])
+                    unique_items.append(item)
+    registry.save()
+    print(f"[search] Fetched {len(due)}/{len(registry)} saved searches, {len(unique_items)} new items")
     return unique_items
 
-def parse_items(xml_text, source):
-    """Parse single RSS feed. Returns ALL items (MIN_LIKES=0 strategy)."""
-    ns = {'slash': 'http://purl.org/rss/1.0/modules/slash/'}
-    root = ET.fromstring(xml_text)
-    all_items = root.findall('.//item')
-    print(f"[DEBUG] {source}: {len(all_items)} items found")
-    
-    items = []
-    junk_keywords = ['Sample', 'Survey', 'Giveaway', 'Sweepstakes', 'YMMV']
-    
-    for idx, item in enumerate(all_items[:20]):  # Limit to newest 20
-        title = (item.findtext('title') or '').strip()
-        link = (item.findtext('link') or '').strip()
-        
-        # Bulletproof likes parsing - defaults to 0
-        likestext = "0"
-        try:
-            comments_elem = (item.find('comments') or 
-                           item.find('{http://purl.org/rss/1.0/modules/slash/}comments'))
-            if comments_elem is not None and comments_elem.text:
-                likestext = comments_elem.text
-            likes = int(likestext) if likestext.isdigit() else 0
-        except:
-            likes = 0
-        
-        if not link:
+
+SLASH_NS = "{http://purl.org/rss/1.0/modules/slash/}"
+
+# Used until SD_RULES_FILE exists; the file replaces them entirely
+DEFAULT_RULES = "\n".join([
+    *(f"exclude keyword {kw}" for kw in ('Sample', 'Survey', 'Giveaway', 'Sweepstakes', 'YMMV')),
+    f"min likes {const.MIN_LIKES}",
+])
+
+
+def iter_feed(stream):
+    """Yield (title, link, likes) per <item>, newest first, clearing as it goes."""
+    channel = None
+    for event, elem in ET.iterparse(stream, events=("start", "end")):
+        if event == "start":
+            if elem.tag == "channel":
+                channel = elem
             continue
-            
-        # Quality filters
-        if likes < const.MIN_LIKES:
+        if elem.tag != "item":
             continue
-            
-        if any(kw in title.upper() for kw in junk_keywords):
+
+        title = (elem.findtext('title') or '').strip()
+        link = (elem.findtext('link') or '').strip()
+        likestext = (elem.findtext(SLASH_NS + 'comments') or elem.findtext('comments') or '').strip()
+        likes = int(likestext) if likestext.isdigit() else 0
+
+        # Drop the finished item so memory stays flat however long the feed is
+        elem.clear()
+        if channel is not None:
+            channel.remove(elem)
+        yield title, link, likes
+
+
+def parse_items(stream, source, seen=frozenset(), counts=None):
+    """Parse one feed until the first already-seen link (max 20 new items).
+
+    With a `counts` list, (link, title, likes) of the first SD_TREND_SCAN
+    items, seen or not, are appended to it, reading past the first seen
+    item if need be; those counts feed the trending tier.
+    """
+    items = []
+    scanned = 0
+    done_new = False
+
+    for title, link, likes in iter_feed(stream):
+        if not link:
             continue
-            
-        # Optional: Price filter (uncomment if wanted)
-        # if '$' not in title:
-        #     continue
-            
-        items.append({
-            'title': title,
-            'link': link, 
-            'likes': likes,
-            'ref_link': referral_link(link, const.SD_USERID),
-            'source': source
-        })
-        
-    print(f"[DEBUG] {source}: {len(items)} qualifying {const.MIN_LIKES}+ likes")
+        if counts is not None and len(counts) < const.SD_TREND_SCAN:
+            counts.append((link, title, likes))
+
+        if not done_new:
+            if link in seen:
+                done_new = True  # everything below this one was handled on an earlier poll
+            else:
+                scanned += 1
+                items.append({
+                    'title': title,
+                    'link': link,
+                    'likes': likes,
+                    'ref_link': referral_link(link, const.SD_USERID),
+                    'source': source
+                })
+                if scanned >= 20:  # Limit to newest 20
+                    done_new = True
+        if done_new and (counts is None or len(counts) >= const.SD_TREND_SCAN):
+            break
+
+    print(f"[DEBUG] {source}: {scanned} new items")
     return items
 
 
+def dedupe(items):
+    """Drop repeated links, keeping the first item for each."""
+    links = set()
+    return [it for it in items if not (it["link"] in links or links.add(it["link"]))]
+
+
 def filter_new(items, seen):
     """Return only items whose original link is not in seen."""
     return [it for it in items if it["link"] not in seen]
 
-def send_sd_alerts(items):
-    """Send EACH URL as SEPARATE message to ALL chats WITH LINK PREVIEWS."""
-    if not items:
-        return
-        
-    api_url = f"https://api.telegram.org/bot{const.SD_BOTTOKEN}/sendMessage"
-    
+def details_line(item):
+    """'\n💲 $19.99 at Amazon · +42' from enrichment, or '' when nothing came back."""
+    parts = []
+    if item.get("price") is not None:
+        parts.append(f"💲 ${item['price']:,.2f}")
+    if item.get("store"):
+        store = re.sub(r"[*_`\[]", "", item["store"])  # Markdown control characters
+        parts.append(f"at {store}")
+    if item.get("score") is not None:
+        parts.append(f"· {item['score']:+d}")
+    return "\n" + " ".join(parts) if parts else ""
+
+def send_sd_alerts(items, sender):
+    """Queue EACH URL as a SEPARATE message to ALL chats WITH LINK PREVIEWS.
+
+    Delivery, pacing and 429 retries happen on the sender's own thread.
+    """
     for item in items:
-        ref_link = item["ref_link"]
-        title_short = item["title"][:100]
-        
-        # Send to EVERY chat ID (group + private)
-        for chat_id in const.SD_CHATIDS:
-            try:
-                text = f"🔥 {title_short}\n{ref_link}"
-                
-                r = requests.post(api_url, data={
-                    "chat_id": chat_id,
-                    "text": text,
-                    "parse_mode": "Markdown",
-                    "disable_web_page_preview": False,
-                }, timeout=10)
-                print(f"[telegram] → {chat_id}: {title_short[:50]}... (w/ preview)")
-                
-                time.sleep(0.5)  # Rate limit protection
-                
-            except Exception as e:
-                print(f"[telegram] {chat_id} ERROR: {e}")
+        sender.submit(f"🔥 {item['title'][:100]}{details_line(item)}\n{item['ref_link']}")
+
+def send_trending_alerts(items, sender):
+    for item in items:
+        sender.submit(
+            f"📈 Trending +{item['gain']} in {item['minutes']} min ({item['likes']} 👍): "
+            f"{item['title'][:100]}{details_line(item)}\n{item['ref_link']}"
+        )
 
 def main():
     print(
-        f"Slickdeals RSS Poller: likes >= {const.MIN_LIKES} → referral alerts via dedicated bot"
+        f"Slickdeals RSS Poller: rules from {const.SD_RULES_FILE} → referral alerts via dedicated bot"
+    )
+
+    deal_filter = DealFilter(const.SD_RULES_FILE, DEFAULT_RULES)
+
+    sender = FanoutSender(const.SD_BOTTOKEN, const.SD_CHATIDS, const.SD_SEND_QUEUE).start()
+    enricher = ThreadEnricher(
+        const.SD_ENRICH_WORKERS,
+        const.SD_ENRICH_BUDGET,
+        const.SD_ENRICH_CACHE_SIZE,
+        const.SD_ENRICH_CACHE_TTL,
+        timeout=const.SD_FEED_TIMEOUT,
+    )
+    seen = SeenStore(
+        const.SD_SEEN_LOG,
+        max_age_hours=const.SD_SEEN_HOURS,
+        legacy_path=const.SD_SEENFILE,
+        timeformat=const.TIMEFORMAT,
+    )
+    schedule = PollSchedule(
+        const.SD_POLL_PROFILE,
+        default_interval=const.POLLINTERVAL,
+        min_interval=const.SD_POLL_MIN,
+        max_interval=const.SD_POLL_MAX,
+        target=const.SD_POLL_TARGET,
+        alpha=const.SD_POLL_ALPHA,
+    )
+
+    velocity = LikeVelocity(
+        const.SD_TREND_WINDOW,
+        const.SD_TREND_MIN_GAIN,
+        slots=const.SD_TREND_SLOTS,
+        ttl=const.SD_TREND_TTL,
     )
 
-    seen = load_sd_seen(max_age_hours=24)
+    searches = SearchRegistry(
+        const.SD_SEARCHES_FILE,
+        const.SD_SEARCHES_STATE,
+        default_interval=const.SD_SEARCH_INTERVAL,
+        budget=RequestBudget(const.SD_SEARCH_BUDGET, const.SD_SEARCH_BURST),
+    )
+
+    push = None
+    if const.SD_PUSH_HUB and const.SD_PUSH_CALLBACK and not const.SD_PUSH_SECRET:
+        print("[push] SD_PUSH_SECRET is empty; push disabled, polling only")
+    elif const.SD_PUSH_HUB and const.SD_PUSH_CALLBACK:
+        push = PushReceiver(
+            const.SD_PUSH_HUB,
+            const.SD_PUSH_CALLBACK,
+            const.SD_PUSH_LISTEN_HOST,
+            const.SD_PUSH_LISTEN_PORT,
+            secret=const.SD_PUSH_SECRET,
+        ).start()
+        for url in const.SD_RSS_URLS:
+            push.subscribe(url)
 
+    next_feeds = 0.0
     while True:
+        polled_feeds = time.time() >= next_feeds
         try:
-            items = fetch_all_rss()
-            new_hot = filter_new(items, seen)
+            seen.expire()
+            items, trending = [], []
+            if push:
+                push.renew()
+                for topic, body, received in push.drain():
+                    pushed = parse_items(io.BytesIO(body), source="push", seen=seen)
+                    print(
+                        f"[push] {len(pushed)} new items from {(topic or 'hub').split('?')[0]} "
+                        f"({time.time() - received:.1f}s after delivery)"
+                    )
+                    items += pushed
+            if polled_feeds:
+                next_feeds = time.time() + const.POLLINTERVAL  # kept if this poll fails
+                polled, feed_links, counts = fetch_all_rss(seen)
+                schedule.observe(feed_links)
+                items += polled
+                trending = velocity.observe(counts)
+            try:
+                items += fetch_searches(searches, seen, {it["link"] for it in items})
+            except Exception as e:
+                # A broken search must not hold back the feeds or their alerts
+                print("[search] Error:", e)
+            new_hot = deal_filter.filter(filter_new(dedupe(items), seen))
 
             if new_hot:
                 print(f"[poll] {len(new_hot)} new hot items")
-                append_sd_seen(new_hot)  # mark as seen first
+                enricher.enrich(new_hot)
+                for it in new_hot:  # mark as seen first
+                    seen.add(it["link"], f"{it['title']} || likes={it['likes']}")
                 for it in new_hot:
                     print(f"  {it['likes']} 👍  {it['title']}")
                     print(f"    {it['ref_link']}")
-                send_sd_alerts(new_hot)
-                for it in new_hot:
-                    seen.add(it["link"])
+                send_sd_alerts(new_hot, sender)
 
-            else:
+            elif polled_feeds:
                 print("[poll] No new hot items")
 
+            # Trending tier: seen deals whose likes are climbing fast alert again
+            just_sent = {it["link"] for it in new_hot}
+            trending = deal_filter.filter([it for it in trending if it["link"] not in just_sent])
+            if trending:
+                print(f"[trend] {len(trending)} trending items")
+                for it in trending:
+                    it["ref_link"] = referral_link(it["link"], const.SD_USERID)
+                    print(f"  +{it['gain']} in {it['minutes']}m ({it['likes']} 👍)  {it['title']}")
+                enricher.enrich(trending)
+                send_trending_alerts(trending, sender)
+
         except Exception as e:
             print("[poll] Error:", e)
 
-        now = datetime.now().strftime("%H:%M:%S")
-        print(f"[poll] Next poll in {const.POLLINTERVAL}s... ({now})")
-        time.sleep(const.POLLINTERVAL)
+        if polled_feeds:
+            print(f"[telegram] {sender.stats()}")
+            print(f"[enrich] {enricher.stats()}")
+            print(f"[rules] {deal_filter.summary()}")
+            print(f"[trend] Tracking like counts for {len(velocity)} threads")
+            interval, expected = schedule.next_interval()
+            if push and push.active():
+                # Pushes carry the news; polling is only the safety net
+                interval = max(interval, const.SD_PUSH_SAFETY_INTERVAL)
+                print(f"[push] received={push.received} rejected={push.rejected}")
+            next_feeds = time.time() + interval
+            now = datetime.now().strftime("%H:%M:%S")
+            if expected is None:
+                print(f"[poll] Next poll in {interval}s, no arrival profile yet... ({now})")
+            else:
+                print(f"[poll] Next poll in {interval}s, expecting {expected:.1f} new items... ({now})")
 
+        # Saved searches wake the loop between feed polls
+        wait = next_feeds - time.time()
+        search_wait = searches.next_wakeup()
+        if search_wait is not None:
+            wait = min(wait, search_wait)
+        if push:
+            push.wait(max(1.0, wait))
+        else:
+            time.sleep(max(1.0, wait))
 
 if __name__ == "__main__":
     main()
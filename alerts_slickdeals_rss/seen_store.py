@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+
+import os
+import threading
+import time
+from datetime import datetime
+
+HOUR = 3600
+
+
+class SeenStore:
+    """Seen Slickdeals links, bucketed by the hour they were first seen.
+
+    Lookup and insert are dict/set operations. Expiry drops whole hour
+    buckets on every poll, so memory stays bounded by max_age_hours. The
+    log is append-only:
+
+        @<hour>            bucket marker (hours since the epoch)
+        <link>\t<meta>     one record per line
+
+    Startup only parses the integer on each marker line, and skips expired
+    buckets without looking at their records. Once more than half the log
+    is expired, a background thread rewrites it with the live buckets.
+    """
+
+    def __init__(self, path, max_age_hours=24, legacy_path=None, timeformat=None):
+        self.path = path
+        self.max_age_hours = max_age_hours
+        self.links = {}      # link -> hour bucket
+        self.buckets = {}    # hour bucket -> {link: meta}
+        self._lock = threading.Lock()
+        self._log_bucket = None
+        self._log_records = 0
+        self._compacting = None
+        self._pending = None  # lines appended while a compaction is running
+
+        if os.path.exists(path):
+            self._load()
+        elif legacy_path and os.path.exists(legacy_path):
+            self._import_legacy(legacy_path, timeformat)
+            self._rewrite()
+        print(f"[seen] Loaded {len(self.links)} URLs in {len(self.buckets)} hour buckets from {path}")
+
+    def __contains__(self, link):
+        return link in self.links
+
+    def __len__(self):
+        return len(self.links)
+
+    def _cutoff(self, now=None):
+        return int((now or time.time()) // HOUR) - self.max_age_hours
+
+    def _load(self):
+        cutoff = self._cutoff()
+        bucket = None
+        with open(self.path) as f:
+            for line in f:
+                self._log_records += 1
+                if line.startswith("@"):
+                    bucket = self._log_bucket = int(line[1:])
+                    continue
+                if bucket is None or bucket <= cutoff:
+                    continue
+                link, _, meta = line.rstrip("\n").partition("\t")
+                self.buckets.setdefault(bucket, {})[link] = meta
+                self.links[link] = bucket
+
+    def _import_legacy(self, legacy_path, timeformat):
+        """One-time import of the old 3-lines-per-record sd_seen_urls.txt."""
+        cutoff = self._cutoff()
+        with open(legacy_path) as f:
+            lines = f.read().splitlines()
+        for i in range(0, len(lines) - 1, 3):
+            link = lines[i].strip()
+            meta = lines[i + 1].strip()
+            try:
+                ts = datetime.strptime(meta.split("||")[-1].strip(), timeformat)
+            except Exception:
+                continue
+            bucket = int(ts.timestamp() // HOUR)
+            if bucket > cutoff:
+                self.buckets.setdefault(bucket, {})[link] = meta.rpartition("||")[0].strip()
+                self.links[link] = bucket
+
+    def add(self, link, meta=""):
+        if link in self.links:
+            return
+        bucket = int(time.time() // HOUR)
+        with self._lock:
+            lines = []
+            if bucket != self._log_bucket:
+                lines.append(f"@{bucket}\n")
+                self._log_bucket = bucket
+            lines.append(f"{link}\t{meta}\n")
+            self.buckets.setdefault(bucket, {})[link] = meta
+            self.links[link] = bucket
+            with open(self.path, "a") as f:
+                f.writelines(lines)
+            if self._pending is not None:
+                self._pending.extend(lines)
+        self._log_records += len(lines)
+
+    def expire(self, now=None):
+        """Drop every bucket older than max_age_hours; compact if the log is mostly dead."""
+        cutoff = self._cutoff(now)
+        dropped = 0
+        with self._lock:
+            for bucket in [b for b in self.buckets if b <= cutoff]:
+                for link in self.buckets.pop(bucket):
+                    del self.links[link]
+                    dropped += 1
+        if dropped:
+            print(f"[seen] Expired {dropped} URLs, {len(self.links)} remain")
+
+        live = len(self.links) + len(self.buckets)
+        if self._log_records > 2 * live + 100 and self._compacting is None:
+            self._compacting = threading.Thread(target=self._compact, daemon=True)
+            self._compacting.start()
+
+    def _snapshot(self):
+        lines = []
+        for bucket in sorted(self.buckets):
+            lines.append(f"@{bucket}\n")
+            lines.extend(f"{link}\t{meta}\n" for link, meta in self.buckets[bucket].items())
+        return lines
+
+    def _rewrite(self):
+        lines = self._snapshot()
+        tmp = self.path + ".tmp"
+        with open(tmp, "w") as f:
+            f.writelines(lines)
+        os.replace(tmp, self.path)
+        self._log_records = len(lines)
+        self._log_bucket = max(self.buckets, default=None)
+
+    def _compact(self):
+        try:
+            with self._lock:
+                lines = self._snapshot()
+                self._pending = []
+                # Appends from here on continue after the snapshot's last marker
+                self._log_bucket = max(self.buckets, default=None)
+            tmp = self.path + ".tmp"
+            with open(tmp, "w") as f:
+                f.writelines(lines)
+            with self._lock:
+                # Records appended meanwhile follow the snapshot, markers included
+                with open(tmp, "a") as f:
+                    f.writelines(self._pending)
+                os.replace(tmp, self.path)
+                self._log_records = len(lines) + len(self._pending)
+                self._pending = None
+            print(f"[seen] Compacted {self.path} to {self._log_records} lines")
+        except Exception as e:
+            print(f"[seen] Compaction failed: {e}")
+            with self._lock:
+                self._pending = None
+        finally:
+            self._compacting = None
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+
+import asyncio
+import statistics
+import threading
+import time
+from collections import deque
+
+import requests
+
+# Telegram Bot API limits: ~30 msg/s overall, 1 msg/s per private chat,
+# 20 msg/min per group
+GLOBAL_RATE = 30
+PRIVATE_RATE = 1.0
+GROUP_RATE = 20 / 60
+MAX_RETRIES = 3
+DEFAULT_RETRY_AFTER = 5
+
+
+def retry_after(r):
+    """Seconds a 429 asks us to wait: JSON retry_after, else the Retry-After header, else 5."""
+    try:
+        return float(r.json()["parameters"]["retry_after"])
+    except Exception:
+        pass
+    try:
+        return float(r.headers.get("Retry-After", DEFAULT_RETRY_AFTER))
+    except (TypeError, ValueError):
+        return DEFAULT_RETRY_AFTER
+
+
+class TokenBucket:
+    """Async token bucket; take() waits until a token is available."""
+
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+
+    def pause(self, seconds):
+        """Send nothing for `seconds`, then exactly one message may go."""
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+        self.tokens = 0.0
+        self.updated = self.paused_until - 1 / self.rate
+
+    async def take(self):
+        while True:
+            now = time.monotonic()
+            if now < self.paused_until:
+                await asyncio.sleep(self.paused_until - now)
+                continue
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class FanoutSender:
+    """Delivers alerts to every chat from a background event loop.
+
+    submit() only enqueues and returns, so the poll loop never waits on
+    Telegram. Each chat has a bounded queue and its own worker. Sends are
+    paced by that chat's bucket and a shared global bucket. A 429 pauses
+    the bucket it hit for `retry_after` seconds. Latency is measured from
+    submit() to the API's 200.
+    """
+
+    def __init__(self, bot_token, chat_ids, queue_size=100):
+        self.api_url = f"https://api.telegram.org/bot{bot_token}/sendMessage"
+        self.chat_ids = [str(c) for c in chat_ids if c]
+        self.queue_size = queue_size
+        self.session = requests.Session()
+        self.latencies = deque(maxlen=500)
+        self.sent = self.dropped = self.failed = self.retries = 0
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run, name="tg-fanout", daemon=True)
+        self._queues = {}
+        self._global = None
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def _run(self):
+        asyncio.set_event_loop(self._loop)
+        self._global = TokenBucket(GLOBAL_RATE)
+        for chat_id in self.chat_ids:
+            # Group/channel ids are negative and get the stricter per-minute limit
+            rate = GROUP_RATE if chat_id.startswith("-") else PRIVATE_RATE
+            queue = asyncio.Queue(maxsize=self.queue_size)
+            self._queues[chat_id] = queue
+            self._loop.create_task(self._worker(chat_id, queue, TokenBucket(rate, capacity=1)))
+        self._loop.run_forever()
+
+    def submit(self, text):
+        """Queue `text` for every chat; never blocks (full queues drop)."""
+        queued = time.monotonic()
+        self._loop.call_soon_threadsafe(self._enqueue, text, queued)
+
+    def _enqueue(self, text, queued):
+        for chat_id, queue in self._queues.items():
+            try:
+                queue.put_nowait((text, queued))
+            except asyncio.QueueFull:
+                self.dropped += 1
+                print(f"[telegram] {chat_id} queue full, dropped: {text[:50]}")
+
+    async def _worker(self, chat_id, queue, bucket):
+        while True:
+            text, queued = await queue.get()
+            await self._deliver(chat_id, text, queued, bucket)
+            queue.task_done()
+
+    async def _deliver(self, chat_id, text, queued, bucket):
+        for attempt in range(MAX_RETRIES + 1):
+            await bucket.take()
+            await self._global.take()
+            try:
+                r = await asyncio.to_thread(
+                    self.session.post,
+                    self.api_url,
+                    data={
+                        "chat_id": chat_id,
+                        "text": text,
+                        "parse_mode": "Markdown",
+                        "disable_web_page_preview": False,
+                    },
+                    timeout=10,
+                )
+            except Exception as e:
+                print(f"[telegram] {chat_id} ERROR: {e}")
+                await asyncio.sleep(2 ** attempt)
+                continue
+
+            if r.status_code == 429:
+                wait = retry_after(r)
+                self.retries += 1
+                bucket.pause(wait)
+                if attempt == MAX_RETRIES:
+                    break
+                print(f"[telegram] {chat_id} rate limited, retry in {wait:g}s")
+                continue
+            if r.status_code != 200:
+                print(f"[telegram] {chat_id} HTTP {r.status_code}: {r.text[:120]}")
+                break
+
+            latency = time.monotonic() - queued
+            self.latencies.append(latency)
+            self.sent += 1
+            print(f"[telegram] → {chat_id}: {text[:50]}... ({latency:.1f}s)")
+            return
+        self.failed += 1
+
+    def pending(self):
+        return sum(q.qsize() for q in self._queues.values())
+
+    def stats(self):
+        lat = sorted(self.latencies)
+        if not lat:
+            return f"sent={self.sent} dropped={self.dropped} failed={self.failed} pending={self.pending()}"
+        p95 = lat[min(len(lat) - 1, int(len(lat) * 0.95))]
+        return (
+            f"sent={self.sent} dropped={self.dropped} failed={self.failed} "
+            f"retries={self.retries} pending={self.pending()} "
+            f"latency p50={statistics.median(lat):.1f}s p95={p95:.1f}s max={lat[-1]:.1f}s"
+        )
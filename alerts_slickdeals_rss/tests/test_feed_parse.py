@@ -0,0 +1,40 @@
+import io
+
+import constants as const
+from sd_curl_poller import iter_feed, parse_items
+
+
+def feed(*items):
+    body = "".join(
+        f"<item><title>{t}</title><link>{link}</link><slash:comments>{n}</slash:comments></item>"
+        for t, link, n in items
+    )
+    return io.BytesIO(
+        '<rss xmlns:slash="http://purl.org/rss/1.0/modules/slash/"><channel>'
+        f"{body}</channel></rss>".encode()
+    )
+
+
+def test_iter_feed_reads_likes():
+    assert list(iter_feed(feed(("A", "L1", 12), ("B", "L2", "x")))) == [("A", "L1", 12), ("B", "L2", 0)]
+
+
+def test_parse_stops_at_first_seen_link():
+    items = parse_items(feed(("A", "L1", 1), ("B", "L2", 2), ("C", "L3", 3)), "t", seen={"L2"})
+    assert [it["link"] for it in items] == ["L1"]
+
+
+def test_counts_read_past_seen_items(monkeypatch):
+    monkeypatch.setattr(const, "SD_TREND_SCAN", 3)
+    counts = []
+    items = parse_items(
+        feed(("A", "L1", 1), ("B", "L2", 2), ("C", "L3", 3), ("D", "L4", 4)),
+        "t", seen={"L1"}, counts=counts,
+    )
+    assert items == []
+    assert counts == [("L1", "A", 1), ("L2", "B", 2), ("L3", "C", 3)]
+
+
+def test_at_most_twenty_new_items():
+    rows = [(f"T{i}", f"L{i}", i) for i in range(30)]
+    assert len(parse_items(feed(*rows), "t")) == 20
@@ -0,0 +1,25 @@
+import constants as const
+import sd_curl_poller as poller
+
+FEEDS = ["https://feed/a", "https://feed/b", "https://feed/c"]
+
+
+def item(link):
+    return {"title": link, "link": link, "likes": 0}
+
+
+def test_feeds_merge_and_failures_are_isolated(monkeypatch):
+    def fake_fetch(i, url, seen, counts):
+        if url.endswith("c"):
+            raise OSError("timeout")
+        counts.append(("L1", "t", 3 if url.endswith("a") else 7))
+        return [item("L1"), item(f"L-{url[-1]}")]
+
+    monkeypatch.setattr(const, "SD_RSS_URLS", FEEDS)
+    monkeypatch.setattr(poller, "fetch_rss", fake_fetch)
+    items, feed_links, counts = poller.fetch_all_rss()
+
+    assert sorted(it["link"] for it in items) == ["L-a", "L-b", "L1"]
+    assert feed_links["https://feed/c"] is None
+    assert feed_links["https://feed/a"] == ["L1", "L-a"]
+    assert counts == [("L1", "t", 7)]
@@ -0,0 +1,47 @@
+from poll_schedule import PollSchedule
+
+T0 = 1_700_000_000
+
+
+def schedule(tmp_path):
+    return PollSchedule(str(tmp_path / "profile.json"), 120, 60, 900)
+
+
+def test_default_interval_until_learned(tmp_path):
+    s = schedule(tmp_path)
+    s.observe({"A": ["L1"]}, now=T0)
+    assert s.rates == {}
+    assert s.next_interval(now=T0) == (120, None)
+
+
+def test_arrival_rate_sets_next_poll(tmp_path):
+    s = schedule(tmp_path)
+    s.observe({"A": ["L1"], "B": None}, now=T0)
+    s.observe({"A": ["L1", "L2", "L3"], "B": ["X"]}, now=T0 + 480)
+    assert "B" not in s.rates
+    assert max(r for r in s.rates["A"] if r is not None) == 15.0  # 2 new in 8 minutes
+
+    # 15/h is 0.125 items per 30s step, so 8 steps reach one item
+    assert s.next_interval(now=T0 + 480) == (240, 1.0)
+
+    # Reloaded profile gives the same answer
+    assert PollSchedule(s.path, 120, 60, 900).next_interval(now=T0 + 480) == (240, 1.0)
+
+
+def test_interval_is_clamped(tmp_path):
+    s = schedule(tmp_path)
+    s.observe({"A": ["L0"]}, now=T0)
+    s.observe({"A": [f"L{i}" for i in range(200)]}, now=T0 + 600)
+    assert s.next_interval(now=T0 + 600)[0] == 60
+
+    quiet = PollSchedule(str(tmp_path / "quiet.json"), 120, 60, 900)
+    quiet.observe({"A": ["L1"]}, now=T0)
+    quiet.observe({"A": ["L1"]}, now=T0 + 600)
+    assert quiet.next_interval(now=T0 + 600)[0] == 900
+
+
+def test_long_gap_is_not_sampled(tmp_path):
+    s = schedule(tmp_path)
+    s.observe({"A": ["L1"]}, now=T0)
+    s.observe({"A": ["L1", "L2"]}, now=T0 + 2 * 900 + 1)
+    assert s.rates == {}
@@ -0,0 +1,94 @@
+import io
+
+import pytest
+
+import sd_curl_poller as poller
+from saved_searches import RequestBudget, SavedSearch, SearchRegistry
+
+T0 = 1_700_000_000
+
+FEED = b"<rss><channel><item><title>A</title><link>https://slickdeals.net/f/1-a</link></item></channel></rss>"
+
+
+class FakeResponse:
+    def __init__(self, status, body=b"", headers=None):
+        self.status_code = status
+        self.headers = headers or {}
+        self.raw = io.BytesIO(body)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise OSError(f"HTTP {self.status_code}")
+
+
+def registry(tmp_path, lines, per_minute=60, burst=10):
+    path = tmp_path / "searches.txt"
+    path.write_text("\n".join(lines) + "\n")
+    return SearchRegistry(str(path), str(tmp_path / "state.json"), 600, RequestBudget(per_minute, burst))
+
+
+def test_each_search_first_due_at_its_offset(tmp_path):
+    reg = registry(tmp_path, ["rtx 4070", "lego | 30", "# comment"])
+    assert {s.query: s.interval for s in reg.searches.values()} == {"rtx 4070": 600, "lego": 1800}
+    assert reg.due(now=T0) == []
+
+    s = reg.searches["rtx 4070"]
+    assert T0 < s.next_due <= T0 + 600
+    assert reg.due(now=s.next_due) == [s]
+
+
+def test_due_is_most_overdue_first_within_budget(tmp_path):
+    reg = registry(tmp_path, ["a", "b", "c"], per_minute=1, burst=2)
+    reg.due(now=T0)
+    for i, q in enumerate("cab"):
+        reg.searches[q].next_due = T0 + i
+    assert [s.query for s in reg.due(now=T0 + 10)] == ["c", "a"]
+    assert reg.budget.wait_time() > 0
+
+
+def test_done_schedules_and_backs_off(tmp_path):
+    reg = registry(tmp_path, ["a"])
+    s = reg.searches["a"]
+    reg.done(s, ok=False, now=T0)
+    reg.done(s, ok=False, now=T0)
+    assert (s.failures, s.next_due) == (2, T0 + 600 * 4)
+    reg.done(s, ok=True, now=T0)
+    assert (s.failures, s.next_due) == (0, T0 + 600)
+
+
+def test_validators_saved_and_reloaded(tmp_path):
+    reg = registry(tmp_path, ["a"])
+    reg.searches["a"].etag = '"v1"'
+    reg.save()
+    again = registry(tmp_path, ["a"])
+    assert again.searches["a"].headers() == {"If-None-Match": '"v1"'}
+
+
+def test_validators_kept_only_after_a_good_parse(monkeypatch):
+    search = SavedSearch("a", 600)
+    headers = {"ETag": '"v2"', "Last-Modified": "Mon, 19 Oct 2026 00:00:00 GMT"}
+
+    monkeypatch.setattr(poller.requests, "get", lambda *a, **kw: FakeResponse(200, b"<rss><chan", headers))
+    with pytest.raises(Exception):
+        poller.fetch_search(search, set())
+    assert search.headers() == {}
+
+    monkeypatch.setattr(poller.requests, "get", lambda *a, **kw: FakeResponse(200, FEED, headers))
+    assert [it["title"] for it in poller.fetch_search(search, set())] == ["A"]
+    assert search.headers()["If-None-Match"] == '"v2"'
+
+    monkeypatch.setattr(poller.requests, "get", lambda *a, **kw: FakeResponse(304))
+    assert poller.fetch_search(search, set()) == []
+
+
+def test_zero_minute_interval_is_raised_to_one_minute(tmp_path):
+    reg = registry(tmp_path, ["rtx 4070 | 0"])
+    assert reg.searches["rtx 4070"].interval == 60
+    reg.due(now=T0)
+    assert reg.next_wakeup(now=T0) <= 60
@@ -0,0 +1,55 @@
+import seen_store
+from seen_store import HOUR, SeenStore
+
+T0 = 1_700_000_000
+
+
+def at(monkeypatch, ts):
+    monkeypatch.setattr(seen_store.time, "time", lambda: ts)
+
+
+def test_add_and_reload(tmp_path, monkeypatch):
+    at(monkeypatch, T0)
+    path = str(tmp_path / "seen.log")
+    store = SeenStore(path)
+    store.add("L1", "title 1")
+    store.add("L1", "again")
+    at(monkeypatch, T0 + HOUR)
+    store.add("L2")
+
+    reloaded = SeenStore(path)
+    assert "L1" in reloaded and "L2" in reloaded and len(reloaded) == 2
+    assert reloaded.buckets[T0 // HOUR] == {"L1": "title 1"}
+    assert open(path).read().count("@") == 2
+
+
+def test_expire_drops_old_buckets_and_load_skips_them(tmp_path, monkeypatch):
+    at(monkeypatch, T0)
+    path = str(tmp_path / "seen.log")
+    store = SeenStore(path, max_age_hours=2)
+    store.add("old")
+    at(monkeypatch, T0 + 2 * HOUR)
+    store.add("new")
+
+    store.expire(now=T0 + 3 * HOUR)
+    assert "old" not in store and "new" in store
+
+    at(monkeypatch, T0 + 3 * HOUR)
+    assert list(SeenStore(path, max_age_hours=2).links) == ["new"]
+
+
+def test_compaction_keeps_live_records(tmp_path, monkeypatch):
+    path = str(tmp_path / "seen.log")
+    at(monkeypatch, T0)
+    store = SeenStore(path, max_age_hours=1)
+    for i in range(150):
+        store.add(f"old{i}")
+    at(monkeypatch, T0 + 2 * HOUR)
+    store.add("live")
+
+    store.expire()
+    compacting = store._compacting
+    if compacting is not None:
+        compacting.join(5)
+    assert open(path).read().splitlines() == [f"@{(T0 + 2 * HOUR) // HOUR}", "live\t"]
+    assert list(SeenStore(path, max_age_hours=1).links) == ["live"]
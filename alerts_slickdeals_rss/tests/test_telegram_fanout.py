@@ -0,0 +1,50 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+from telegram_fanout import DEFAULT_RETRY_AFTER, FanoutSender, TokenBucket, retry_after
+
+
+def response(status, body=None, headers=None):
+    def json():
+        if body is None:
+            raise ValueError("not JSON")
+        return body
+    return SimpleNamespace(status_code=status, json=json, headers=headers or {}, text="")
+
+
+def test_retry_after_sources():
+    assert retry_after(response(429, {"parameters": {"retry_after": 7}})) == 7
+    assert retry_after(response(429, None, {"Retry-After": "3"})) == 3
+    assert retry_after(response(429, {"ok": False}, {"Retry-After": "junk"})) == DEFAULT_RETRY_AFTER
+    assert retry_after(response(429)) == DEFAULT_RETRY_AFTER
+
+
+def test_bucket_paces_and_pauses():
+    async def run():
+        bucket = TokenBucket(rate=50, capacity=2)
+        started = time.monotonic()
+        for _ in range(4):
+            await bucket.take()
+        paced = time.monotonic() - started
+        bucket.pause(0.05)
+        started = time.monotonic()
+        await bucket.take()
+        return paced, time.monotonic() - started
+
+    paced, paused = asyncio.run(run())
+    assert 0.03 <= paced < 0.5
+    assert paused >= 0.045
+
+
+def test_unparseable_429_is_retried():
+    replies = [response(429, None, {"Retry-After": "0.01"}), response(200, {"ok": True})]
+    sender = FanoutSender("token", ["1"])
+    sender.session = SimpleNamespace(post=lambda *a, **kw: replies.pop(0))
+
+    async def run():
+        sender._global = TokenBucket(1000)
+        await sender._deliver("1", "hello", time.monotonic(), TokenBucket(1000, capacity=1))
+
+    asyncio.run(run())
+    assert (sender.sent, sender.retries, sender.failed) == (1, 1, 0)
@@ -0,0 +1,80 @@
+import threading
+from types import SimpleNamespace
+
+import thread_enrich
+from thread_enrich import ThreadEnricher, TTLCache, parse_thread, thread_id
+
+PAGE = (
+    '<script type="application/ld+json">{"offers": {"price": "1,299.99", '
+    '"seller": {"@type": "Organization", "name": "Best &amp; Co"}}}</script>'
+    '<div data-score="42"></div>'
+)
+
+
+def test_parse_thread_and_id():
+    assert parse_thread(PAGE) == {"price": 1299.99, "store": "Best & Co", "score": 42}
+    assert parse_thread("<html></html>") == {"price": None, "store": None, "score": None}
+    assert thread_id("https://slickdeals.net/f/123-foo?src=rss") == "123"
+    assert thread_id("https://example.com/") is None
+
+
+def test_ttl_cache_expiry_and_lru(monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr(thread_enrich.time, "monotonic", lambda: clock[0])
+    cache = TTLCache(maxsize=2, ttl=10)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)            # evicts "b", the least recently used
+    assert cache.get("b") is None and cache.get("c") == 3
+
+    clock[0] = 111.0
+    assert cache.get("a") is None
+    assert (cache.hits, cache.misses) == (2, 2)
+    assert "a" not in cache._data
+
+
+class FakeSession:
+    def __init__(self, release=None):
+        self.calls = []
+        self.release = release
+        self.headers = {}
+
+    def get(self, url, timeout):
+        self.calls.append(url)
+        if self.release is not None:
+            self.release.wait(5)
+        return SimpleNamespace(text=PAGE, raise_for_status=lambda: None)
+
+
+def test_enrich_merges_details_and_caches():
+    enricher = ThreadEnricher(workers=2, budget=5, cache_size=10, cache_ttl=60)
+    enricher.session = FakeSession()
+    items = [
+        {"link": "https://slickdeals.net/f/1-a"},
+        {"link": "https://slickdeals.net/f/1-a?dup"},
+        {"link": "https://example.com/no-thread"},
+    ]
+    enricher.enrich(items)
+    assert items[0]["store"] == "Best & Co" and items[1]["score"] == 42
+    assert "price" not in items[2]
+    assert len(enricher.session.calls) == 1
+
+    again = [{"link": "https://slickdeals.net/f/1-b"}]
+    enricher.enrich(again)
+    enricher.enrich([{"link": "https://slickdeals.net/f/1-c"}])
+    assert len(enricher.session.calls) == 1 and again[0]["price"] == 1299.99
+    assert enricher.failed == 0 and enricher.cache.hits >= 2
+
+
+def test_late_pages_go_out_bare_and_warm_the_cache():
+    release = threading.Event()
+    enricher = ThreadEnricher(workers=1, budget=0.05, cache_size=10, cache_ttl=60)
+    enricher.session = FakeSession(release)
+    item = {"link": "https://slickdeals.net/f/7-slow"}
+    enricher.enrich([item])
+    assert "price" not in item and enricher.late == 1
+
+    release.set()
+    enricher._pool.shutdown(wait=True)
+    assert enricher.cache.get("7")["score"] == 42
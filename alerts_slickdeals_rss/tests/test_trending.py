@@ -0,0 +1,43 @@
+from trending import LikeVelocity, _Ring
+
+T0 = 1_700_000_000
+
+
+def test_ring_gain_within_window():
+    ring = _Ring(8)
+    assert ring.push(T0, 5, window=600) == (0, 0)
+    assert ring.push(T0 + 300, 9, window=600) == (4, 300)
+    # T0 has aged out: the gain is measured from T0 + 300
+    assert ring.push(T0 + 700, 20, window=600) == (11, 400)
+
+
+def test_ring_overwrite_moves_tail():
+    ring = _Ring(3)
+    for i in range(5):
+        gain, span = ring.push(T0 + i, i * 10, window=3600)
+    # Only the last 3 samples survive, so the oldest in window is i=2
+    assert (gain, span) == (20, 2)
+    assert ring.size == 3
+
+
+def test_thread_trends_once():
+    v = LikeVelocity(window=900, min_gain=10)
+    assert v.observe([("L", "Deal", 2)], now=T0) == []
+    hits = v.observe([("L", "Deal", 14)], now=T0 + 600)
+    assert hits == [{"title": "Deal", "link": "L", "likes": 14, "gain": 12, "minutes": 10}]
+    assert v.observe([("L", "Deal", 40)], now=T0 + 1200) == []
+
+
+def test_slow_climb_does_not_trend():
+    v = LikeVelocity(window=900, min_gain=10)
+    for i in range(6):
+        assert v.observe([("L", "Deal", i * 4)], now=T0 + i * 1000) == []
+
+
+def test_eviction_by_ttl_and_size():
+    v = LikeVelocity(window=900, min_gain=10, ttl=3600, max_threads=2)
+    v.observe([("A", "a", 1)], now=T0)
+    v.observe([("B", "b", 1), ("C", "c", 1)], now=T0 + 60)
+    assert list(v.threads) == ["B", "C"]
+    v.observe([("C", "c", 2)], now=T0 + 3700)
+    assert list(v.threads) == ["C"] and len(v) == 1
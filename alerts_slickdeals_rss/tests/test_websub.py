@@ -0,0 +1,112 @@
+import hashlib
+import hmac
+import io
+import socket
+import time
+
+import pytest
+import requests
+
+import debug_websub_hub as hub_server
+from sd_curl_poller import parse_items
+from websub import PushReceiver
+
+FEED = (
+    '<rss xmlns:slash="http://purl.org/rss/1.0/modules/slash/"><channel>'
+    "<item><title>Test deal</title><link>https://slickdeals.net/f/1-test</link>"
+    "<slash:comments>12</slash:comments></item></channel></rss>"
+)
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_for(check, timeout=5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if check():
+            return True
+        time.sleep(0.05)
+    return False
+
+
+@pytest.fixture
+def hub():
+    server = hub_server.serve(free_port())
+    yield f"http://127.0.0.1:{server.server_address[1]}/"
+    server.shutdown()
+    hub_server.subscribers.clear()
+
+
+@pytest.fixture
+def receiver(hub):
+    port = free_port()
+    return PushReceiver(hub, f"http://127.0.0.1:{port}/sd", "127.0.0.1", port, secret="s3cret").start()
+
+
+def test_secret_is_required():
+    with pytest.raises(ValueError):
+        PushReceiver("http://hub/", "http://cb/", "127.0.0.1", 1, secret="")
+
+
+def test_subscribe_verify_publish_receive(hub, receiver, tmp_path):
+    feed = tmp_path / "feed.xml"
+    feed.write_text(FEED)
+    topic = feed.as_uri()
+
+    receiver.subscribe(topic)
+    assert wait_for(receiver.active), "subscription was never verified"
+    assert hub_server.subscribers[topic] == {receiver.callback_url: "s3cret"}
+
+    requests.post(hub, data={"hub.mode": "publish", "hub.url": topic}, timeout=5)
+    receiver.wait(5)
+    notes = receiver.drain()
+    assert len(notes) == 1
+    got_topic, body, _ = notes[0]
+    items = parse_items(io.BytesIO(body), source="push")
+    assert got_topic == topic
+    assert (items[0]["title"], items[0]["likes"]) == ("Test deal", 12)
+    assert (receiver.received, receiver.rejected) == (1, 0)
+
+
+def test_unknown_topic_is_not_verified(receiver):
+    r = requests.get(
+        receiver.callback_url,
+        params={"hub.mode": "subscribe", "hub.topic": "https://other/", "hub.challenge": "x"},
+        timeout=5,
+    )
+    assert r.status_code == 404
+
+
+def test_bad_or_missing_signature_is_dropped(receiver):
+    body = FEED.encode()
+    bad = "sha256=" + hmac.new(b"wrong", body, hashlib.sha256).hexdigest()
+    for headers in ({"X-Hub-Signature": bad}, {}):
+        r = requests.post(receiver.callback_url, data=body, headers=headers, timeout=5)
+        assert r.status_code == 202
+    assert receiver.rejected == 2
+    assert receiver.drain() == []
+
+    good = "sha256=" + hmac.new(b"s3cret", body, hashlib.sha256).hexdigest()
+    requests.post(receiver.callback_url, data=body, headers={"X-Hub-Signature": good}, timeout=5)
+    assert [n[1] for n in receiver.drain()] == [body]
+
+
+def test_only_a_pending_subscribe_is_verified(hub, receiver, tmp_path):
+    feed = tmp_path / "feed.xml"
+    feed.write_text(FEED)
+    topic = feed.as_uri()
+    receiver.subscribe(topic)
+    assert wait_for(receiver.active)
+
+    for mode in ("unsubscribe", "subscribe"):
+        r = requests.get(
+            receiver.callback_url,
+            params={"hub.mode": mode, "hub.topic": topic, "hub.challenge": "x", "hub.lease_seconds": "1"},
+            timeout=5,
+        )
+        assert (r.status_code, r.content) == (404, b"")
+    assert receiver.active(now=time.time() + 60)
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+
+import html
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait
+
+import requests
+
+THREAD_RE = re.compile(r"/f/(\d+)")
+THREAD_URL = "https://slickdeals.net/f/{tid}"
+
+# Thread pages embed product JSON-LD and data attributes; first match wins
+PRICE_RES = [
+    re.compile(r'"price"\s*:\s*"?(\d[\d,]*(?:\.\d+)?)'),
+    re.compile(r'class="[^"]*dealPrice[^"]*"[^>]*>\s*\$?(\d[\d,]*(?:\.\d+)?)'),
+]
+STORE_RES = [
+    re.compile(r'"seller"\s*:\s*\{[^}]*"name"\s*:\s*"([^"]+)"'),
+    re.compile(r'data-store-name="([^"]+)"'),
+]
+SCORE_RES = [
+    re.compile(r'"score"\s*:\s*"?(-?\d+)'),
+    re.compile(r'data-score="(-?\d+)"'),
+]
+
+
+def thread_id(link):
+    """'https://slickdeals.net/f/123-foo' -> '123', or None."""
+    m = THREAD_RE.search(link)
+    return m.group(1) if m else None
+
+
+def _first(patterns, text):
+    for pattern in patterns:
+        m = pattern.search(text)
+        if m:
+            return html.unescape(m.group(1)).strip()
+    return None
+
+
+def parse_thread(page):
+    """{price, store, score} from a thread page; missing fields are None."""
+    price = _first(PRICE_RES, page)
+    score = _first(SCORE_RES, page)
+    return {
+        "price": float(price.replace(",", "")) if price else None,
+        "store": _first(STORE_RES, page),
+        "score": int(score) if score else None,
+    }
+
+
+class TTLCache:
+    """LRU cache whose entries also expire `ttl` seconds after insertion."""
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()  # key -> (expires at, value)
+        self._lock = threading.Lock()
+        self.hits = self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._data[key]
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+
+class ThreadEnricher:
+    """Adds price / store / score from each new deal's thread page.
+
+    At most `workers` thread pages are fetched at once, and results are
+    cached by thread id. enrich() waits at most `budget` seconds: items
+    whose page isn't back by then go out as they are, and their fetches
+    finish in the background to warm the cache.
+    """
+
+    def __init__(self, workers, budget, cache_size, cache_ttl, timeout=10):
+        self.budget = budget
+        self.timeout = timeout
+        self.cache = TTLCache(cache_size, cache_ttl)
+        self.session = requests.Session()
+        self.session.headers["User-Agent"] = "Mozilla/5.0 (Macintosh; Intel Mac OS X)"
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="sd-enrich")
+        self._inflight = {}  # thread id -> future
+        self._lock = threading.Lock()
+        self.enriched = self.late = self.failed = 0
+
+    def _fetch(self, tid):
+        try:
+            r = self.session.get(THREAD_URL.format(tid=tid), timeout=self.timeout)
+            r.raise_for_status()
+            details = parse_thread(r.text)
+            self.cache.put(tid, details)
+            return details
+        except Exception as e:
+            self.failed += 1
+            print(f"[enrich] Thread {tid} failed: {e}")
+            return None
+        finally:
+            with self._lock:
+                self._inflight.pop(tid, None)
+
+    def enrich(self, items):
+        """Merge thread details into `items` in place, within the latency budget."""
+        pending = {}
+        for item in items:
+            tid = thread_id(item["link"])
+            if tid is None:
+                continue
+            details = self.cache.get(tid)
+            if details is not None:
+                item.update(details)
+                continue
+            with self._lock:
+                future = self._inflight.get(tid)
+                if future is None:
+                    future = self._inflight[tid] = self._pool.submit(self._fetch, tid)
+            pending.setdefault(future, []).append(item)
+
+        if not pending:
+            return
+        done, not_done = wait(pending, timeout=self.budget)
+        for future in done:
+            details = future.result()
+            if details:
+                for item in pending[future]:
+                    item.update(details)
+                    self.enriched += 1
+        self.late += sum(len(pending[f]) for f in not_done)
+        if not_done:
+            print(f"[enrich] {len(not_done)} thread pages over the {self.budget}s budget; sending without")
+
+    def stats(self):
+        return (
+            f"enriched={self.enriched} late={self.late} failed={self.failed} "
+            f"cache hits={self.cache.hits} misses={self.cache.misses}"
+        )
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+
+import time
+from collections import OrderedDict
+
+
+class _Ring:
+    """Last `slots` (time, likes) samples of one thread, plus a window cursor.
+
+    `tail` is the oldest sample still inside the window. It only moves
+    forward as samples arrive or age out, so the windowed gain costs O(1)
+    amortized per sample and the history is never rescanned.
+    """
+
+    __slots__ = ("ts", "likes", "head", "size", "tail", "alerted")
+
+    def __init__(self, slots):
+        self.ts = [0.0] * slots
+        self.likes = [0] * slots
+        self.head = 0      # next slot to write
+        self.size = 0
+        self.tail = 0
+        self.alerted = False
+
+    def push(self, now, likes, window):
+        slots = len(self.ts)
+        i = self.head
+        if self.size == slots:
+            if self.tail == i:  # about to overwrite the window's oldest sample
+                self.tail = (i + 1) % slots
+        else:
+            self.size += 1
+        self.ts[i], self.likes[i] = now, likes
+        self.head = (i + 1) % slots
+        while self.tail != i and self.ts[self.tail] < now - window:
+            self.tail = (self.tail + 1) % slots
+        return likes - self.likes[self.tail], now - self.ts[self.tail]
+
+
+class LikeVelocity:
+    """Rolling like counts per thread, flagging deals that take off.
+
+    Every poll feeds in (link, title, likes) for the items at the top of
+    each feed, seen or not. A thread trends when it gains `min_gain` likes
+    within `window` seconds. Each thread trends at most once. Threads not
+    seen for `ttl` seconds, or beyond `max_threads`, are evicted oldest
+    first.
+    """
+
+    def __init__(self, window, min_gain, slots=16, ttl=6 * 3600, max_threads=5000):
+        self.window = window
+        self.min_gain = min_gain
+        self.slots = slots
+        self.ttl = ttl
+        self.max_threads = max_threads
+        self.threads = OrderedDict()  # link -> _Ring, least recently updated first
+
+    def __len__(self):
+        return len(self.threads)
+
+    def observe(self, counts, now=None):
+        """Record one poll's counts; returns the items that just started trending."""
+        now = now or time.time()
+        trending = []
+        for link, title, likes in counts:
+            ring = self.threads.get(link)
+            if ring is None:
+                ring = self.threads[link] = _Ring(self.slots)
+            else:
+                self.threads.move_to_end(link)
+            gain, span = ring.push(now, likes, self.window)
+            if gain >= self.min_gain and not ring.alerted:
+                ring.alerted = True
+                trending.append({
+                    "title": title,
+                    "link": link,
+                    "likes": likes,
+                    "gain": gain,
+                    "minutes": max(1, round(span / 60)),
+                })
+
+        while self.threads:
+            link, ring = next(iter(self.threads.items()))
+            newest = ring.ts[(ring.head - 1) % self.slots]
+            if newest >= now - self.ttl and len(self.threads) <= self.max_threads:
+                break
+            self.threads.popitem(last=False)
+        return trending
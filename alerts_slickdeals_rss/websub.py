@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+
+import asyncio
+import hashlib
+import hmac
+import queue
+import threading
+import time
+from urllib.parse import parse_qs, urlsplit
+
+import requests
+
+RENEW_MARGIN = 0.1       # resubscribe with 10% of the lease left
+VERIFY_TIMEOUT = 300     # resubscribe if the hub never verified within this
+
+
+class PushReceiver:
+    """WebSub subscriber: subscribes feeds at a hub and receives their pushes.
+
+    A small asyncio HTTP server runs on its own thread. GET requests are
+    the hub's intent verification, answered with hub.challenge for topics
+    we asked for. POST requests are content notifications; the
+    X-Hub-Signature HMAC with `secret` must match or the body is ignored,
+    so a secret is required. Bodies are queued for the poll loop, which
+    wakes through wait() as soon as one arrives, so parsing and alerting
+    stay on the main thread.
+    """
+
+    def __init__(self, hub, callback_url, listen_host, listen_port, secret, lease=86400):
+        if not secret:
+            raise ValueError("PushReceiver needs a secret to authenticate pushes")
+        self.hub = hub
+        self.callback_url = callback_url
+        self.listen_host = listen_host
+        self.listen_port = listen_port
+        self.secret = secret
+        self.lease = lease
+        self.subscriptions = {}  # topic -> (requested at, lease expiry or None)
+        self._pending = set()  # topics with a subscribe request awaiting verification
+        self.notifications = queue.Queue()
+        self.arrived = threading.Event()
+        self.received = self.rejected = 0
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="websub", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        self._ready.wait(5)
+        return self
+
+    def _run(self):
+        asyncio.run(self._serve())
+
+    async def _serve(self):
+        server = await asyncio.start_server(self._handle, self.listen_host, self.listen_port)
+        print(f"[push] Listening on {self.listen_host}:{self.listen_port} for {self.callback_url}")
+        self._ready.set()
+        async with server:
+            await server.serve_forever()
+
+    # ---------- Subscriptions (poll-loop thread) ----------
+
+    def subscribe(self, topic):
+        data = {
+            "hub.mode": "subscribe",
+            "hub.topic": topic,
+            "hub.callback": self.callback_url,
+            "hub.lease_seconds": str(self.lease),
+            "hub.secret": self.secret,
+        }
+        with self._lock:
+            expiry = self.subscriptions.get(topic, (0, None))[1]
+            self.subscriptions[topic] = (time.time(), expiry)
+            self._pending.add(topic)
+        try:
+            r = requests.post(self.hub, data=data, timeout=10)
+            if r.status_code not in (202, 204):
+                print(f"[push] Hub refused {topic.split('?')[0]}: HTTP {r.status_code}")
+        except Exception as e:
+            print(f"[push] Subscribe failed for {topic.split('?')[0]}: {e}")
+
+    def renew(self, now=None):
+        """Resubscribe topics whose lease is nearly over or never got verified."""
+        now = now or time.time()
+        with self._lock:
+            topics = [
+                topic for topic, (requested, expiry) in self.subscriptions.items()
+                if (expiry is None and now - requested > VERIFY_TIMEOUT)
+                or (expiry is not None and expiry - now < self.lease * RENEW_MARGIN)
+            ]
+        for topic in topics:
+            self.subscribe(topic)
+
+    def active(self, now=None):
+        """True when every topic has a verified, unexpired subscription."""
+        now = now or time.time()
+        with self._lock:
+            return bool(self.subscriptions) and all(
+                expiry is not None and expiry > now for _, expiry in self.subscriptions.values()
+            )
+
+    def wait(self, timeout):
+        """Sleep up to `timeout` seconds, returning early when a push arrives."""
+        self.arrived.wait(timeout)
+        self.arrived.clear()
+
+    def drain(self):
+        """Every (topic, body, received at) queued since the last call."""
+        out = []
+        while True:
+            try:
+                out.append(self.notifications.get_nowait())
+            except queue.Empty:
+                return out
+
+    # ---------- HTTP (receiver thread) ----------
+
+    async def _handle(self, reader, writer):
+        try:
+            request = await reader.readline()
+            method, target, _ = request.decode("latin-1").split(" ", 2)
+            headers = {}
+            while True:
+                line = (await reader.readline()).decode("latin-1").strip()
+                if not line:
+                    break
+                name, _, value = line.partition(":")
+                headers[name.strip().lower()] = value.strip()
+            body = await reader.readexactly(int(headers.get("content-length", 0) or 0))
+
+            if method == "GET":
+                status, reply = self._verify(parse_qs(urlsplit(target).query))
+            elif method == "POST":
+                status, reply = self._notify(headers, body)
+            else:
+                status, reply = 405, b""
+        except Exception as e:
+            print(f"[push] Bad request: {e}")
+            status, reply = 400, b""
+
+        writer.write(
+            f"HTTP/1.1 {status} {'OK' if status < 300 else 'Error'}\r\n"
+            f"Content-Length: {len(reply)}\r\nConnection: close\r\n\r\n".encode() + reply
+        )
+        await writer.drain()
+        writer.close()
+
+    def _verify(self, params):
+        mode = params.get("hub.mode", [""])[0]
+        topic = params.get("hub.topic", [""])[0]
+        challenge = params.get("hub.challenge", [""])[0]
+        with self._lock:
+            # Only answer for a subscribe we asked for; anything else (an
+            # unsubscribe, a repeat, an unknown topic) could be forged
+            if topic not in self._pending or mode not in ("subscribe", "denied"):
+                return 404, b""
+            self._pending.discard(topic)
+            if mode == "denied":
+                print(f"[push] Hub denied {topic.split('?')[0]}: {params.get('hub.reason', [''])[0]}")
+                return 200, b""
+            lease = int(params.get("hub.lease_seconds", [self.lease])[0])
+            self.subscriptions[topic] = (self.subscriptions[topic][0], time.time() + lease)
+            print(f"[push] Subscribed to {topic.split('?')[0]} for {lease}s")
+        return 200, challenge.encode()
+
+    def _notify(self, headers, body):
+        algo, _, digest = headers.get("x-hub-signature", "").partition("=")
+        if algo not in ("sha1", "sha256", "sha384", "sha512"):
+            self.rejected += 1
+            return 202, b""
+        expected = hmac.new(self.secret.encode(), body, getattr(hashlib, algo)).hexdigest()
+        if not hmac.compare_digest(expected, digest):
+            # Acknowledge anyway (per the spec) but drop the content
+            self.rejected += 1
+            return 202, b""
+        topic = self._topic_from_links(headers.get("link", ""))
+        self.received += 1
+        self.notifications.put((topic, body, time.time()))
+        self.arrived.set()
+        return 202, b""
+
+    @staticmethod
+    def _topic_from_links(link_header):
+        for part in link_header.split(","):
+            url, _, params = part.partition(";")
+            if 'rel="self"' in params or "rel=self" in params:
+                return url.strip().strip("<>")
+        return None
@@ -9,6 +9,8 @@ POLL_INTERVAL_MIN = 2700  # 45 minutes (45 * 60)
 POLL_INTERVAL_MAX = 7200  # 2 hours (120 * 60)
 
 SEEN_FILE = "/home/piblack/projects/woot-clearance/seen_woot_ids.txt"
+# Deal filter rules (see common/deal_filter.py); no file means every deal passes
+RULES_FILE = "/home/piblack/projects/woot-clearance/woot_rules.txt"
 WOOT_SELLOUT_URL = "https://www.woot.com/category/sellout"
 
 # Delay between Telegram messages to ensure previews load
@@ -5,12 +5,15 @@ from datetime import datetime, timedelta
 import sys
 
 sys.path.insert(0, os.path.dirname(__file__) + "/..")
+sys.path.insert(0, os.path.dirname(__file__) + "/../..")
 import constants
+from common.deal_filter import DealFilter
 
 class WootScanner:
     def __init__(self):
         self.seen_file = constants.SEEN_FILE
         self.seen_ids = self._load_seen()
+        self.deal_filter = DealFilter(constants.RULES_FILE)
 
     def _load_seen(self):
         seen = set()
@@ -111,8 +114,8 @@ class WootScanner:
                 if new_deals:
                     print(f"🚨 {len(new_deals)} NEW WOOT DEALS!")
                     
-                    # Send each deal as a separate message
-                    for deal in new_deals:
+                    # Send each deal that passes the rules as a separate message
+                    for deal in self.deal_filter.filter(new_deals):
                         notifier.send_alert(deal)
                         time.sleep(constants.MESSAGE_DELAY)
                     
@@ -125,6 +128,8 @@ class WootScanner:
             else:
                 print("ℹ️ No deals parsed")
             
+            print(f"📏 Rules: {self.deal_filter.summary()}")
+
             # Calculate random interval for next scan
             next_interval = self._get_random_interval()
             next_scan_time = datetime.now() + timedelta(seconds=next_interval)
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+
+import os
+import re
+import time
+
+# Rule file, one rule per line ("#" starts a comment line):
+#
+#   exclude keyword  sample          reject if the text contains it
+#   exclude regex    \bymmv\b        reject if the regex matches
+#   include keyword  laptop          with any include rule, only deals
+#   include regex    \bssd\b          matching one of them are kept
+#   min likes 5                      numeric thresholds; all must pass
+#   max price 300
+#
+# Verdict: any exclude -> reject; else includes present and none matched
+# -> reject; else accept if every threshold passes. An include narrows the
+# feed, it never lets a deal skip a threshold.
+
+ACTIONS = ("include", "exclude")
+NUMBER_RE = re.compile(r"-?\d+(?:\.\d+)?")
+
+
+def _number(value):
+    """20, '20', '20%', '$1,299.99' -> float; anything else -> None."""
+    if isinstance(value, (int, float)):
+        return float(value)
+    m = NUMBER_RE.search(str(value or "").replace(",", ""))
+    return float(m.group()) if m else None
+
+
+class DealFilter:
+    """Keyword/regex/threshold deal filter shared by the feed pollers.
+
+    Exclude and include keywords/regexes are compiled into one alternation
+    each, with a named group per rule, so a deal's text is scanned at most
+    twice whatever the number of rules. Excludes get their own scan so an
+    include matching at the same spot (or overlapping it) can't hide one.
+    Thresholds are a short list of (field, op, limit) predicates. The rule
+    file is re-read when its mtime changes.
+
+    stats keeps hits per rule. Time is kept per scan ("(exclude scan)",
+    "(include scan)") and per threshold rule; a single alternation can't
+    say how long each keyword or regex took.
+    """
+
+    def __init__(self, path, default_rules="", text_fields=("title", "name")):
+        self.path = path
+        self.default_rules = default_rules
+        self.text_fields = text_fields
+        self._mtime = None
+        self.stats = {}
+        self._compile(default_rules)
+        self.reload_if_changed()
+
+    def reload_if_changed(self):
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            return
+        if mtime == self._mtime:
+            return
+        with open(self.path) as f:
+            self._compile(f.read())
+        self._mtime = mtime
+        print(f"[rules] Loaded {len(self.rules)} rules from {self.path}")
+
+    def _compile(self, text):
+        patterns, predicates = [], []   # (action, label, pattern), (label, field, op, limit)
+        for linenum, line in enumerate(text.splitlines(), 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            parts = line.split(None, 2)
+            if len(parts) < 3:
+                print(f"[rules] Bad rule on line {linenum}: {line}")
+                continue
+            action, kind, value = parts
+            label = f"{action} {kind} {value}"
+            if action in ACTIONS and kind in ("keyword", "regex"):
+                pattern = re.escape(value) if kind == "keyword" else value
+                try:
+                    re.compile(pattern)
+                except re.error as e:
+                    print(f"[rules] Bad regex on line {linenum}: {e}")
+                    continue
+                patterns.append((action, label, pattern))
+            elif action in ("min", "max") and _number(value) is not None:
+                predicates.append((label, kind, action, _number(value)))
+            else:
+                print(f"[rules] Bad rule on line {linenum}: {line}")
+
+        # One named group per keyword/regex rule, one alternation per action
+        self.group_labels = {f"r{n}": label for n, (_, label, _) in enumerate(patterns)}
+        self.automata = {}
+        for action in ("exclude", "include"):
+            alternatives = [
+                f"(?P<r{n}>{pattern})" for n, (a, _, pattern) in enumerate(patterns) if a == action
+            ]
+            if alternatives:
+                self.automata[action] = re.compile("|".join(alternatives), re.I)
+        self.predicates = predicates
+        self.rules = [label for _, label, _ in patterns] + [p[0] for p in predicates]
+        self.stats = {label: [0, 0.0] for label in self.rules}
+        for action in self.automata:
+            self.stats[f"({action} scan)"] = [0, 0.0]
+
+    def _scan(self, action, text):
+        """Label of the first `action` rule matching `text`, or None."""
+        automaton = self.automata.get(action)
+        if automaton is None:
+            return None
+        started = time.perf_counter()
+        m = automaton.search(text)
+        scan = self.stats[f"({action} scan)"]
+        scan[0] += 1
+        scan[1] += time.perf_counter() - started
+        if m is None:
+            return None
+        label = self.group_labels[m.lastgroup]
+        self.stats[label][0] += 1
+        return label
+
+    def evaluate(self, deal):
+        """(keep, reason) for one deal: excludes, then includes, then thresholds."""
+        if self.automata:
+            text = " ".join(str(deal.get(f) or "") for f in self.text_fields)
+            excluded = self._scan("exclude", text)
+            if excluded:
+                return False, excluded
+            if "include" in self.automata and not self._scan("include", text):
+                return False, "no include matched"
+
+        for label, field, op, limit in self.predicates:
+            started = time.perf_counter()
+            value = _number(deal.get(field))
+            ok = value is not None and (value >= limit if op == "min" else value <= limit)
+            stat = self.stats[label]
+            stat[1] += time.perf_counter() - started
+            if not ok:
+                stat[0] += 1
+                return False, label
+        return True, None
+
+    def filter(self, deals):
+        self.reload_if_changed()
+        kept = []
+        for deal in deals:
+            keep, reason = self.evaluate(deal)
+            if keep:
+                kept.append(deal)
+            elif reason:
+                print(f"[rules] Dropped ({reason}): {str(deal.get('title') or deal.get('name'))[:60]}")
+        return kept
+
+    def summary(self):
+        """'rule: hits, avg us' for every rule that fired or took time."""
+        return ", ".join(
+            f"{label}: {hits} hits {elapsed / max(hits, 1) * 1e6:.0f}us"
+            for label, (hits, elapsed) in self.stats.items()
+            if hits or elapsed
+        )
@@ -0,0 +1,62 @@
+import os
+
+from common.deal_filter import DealFilter
+
+
+def make(tmp_path, rules):
+    return DealFilter(str(tmp_path / "missing.txt"), rules)
+
+
+def test_overlapping_include_cannot_hide_exclude(tmp_path):
+    f = make(tmp_path, "exclude keyword sample\ninclude keyword free samples")
+    assert f.evaluate({"title": "Free Samples of coffee"}) == (False, "exclude keyword sample")
+    assert f.evaluate({"title": "Free samplers"}) == (False, "exclude keyword sample")
+
+
+def test_includes_restrict_even_with_thresholds(tmp_path):
+    f = make(tmp_path, "include keyword lego\nmin likes 0")
+    assert f.evaluate({"title": "Lego Millennium Falcon", "likes": 3}) == (True, None)
+    assert f.evaluate({"title": "Desk lamp", "likes": 50}) == (False, "no include matched")
+
+
+def test_include_match_still_needs_thresholds(tmp_path):
+    f = make(tmp_path, "include keyword lego\nmin likes 5")
+    assert f.evaluate({"title": "Lego set", "likes": 2}) == (False, "min likes 5")
+    assert f.evaluate({"title": "Lego set", "likes": 5}) == (True, None)
+
+
+def test_thresholds_and_number_parsing(tmp_path):
+    f = make(tmp_path, "max price 300\nmin discount 20")
+    assert f.evaluate({"price": "$1,299.99", "discount": "50%"}) == (False, "max price 300")
+    assert f.evaluate({"price": "$99", "discount": None}) == (False, "min discount 20")
+    assert f.evaluate({"price": 99, "discount": "25%"}) == (True, None)
+
+
+def test_bad_rules_are_skipped(tmp_path):
+    f = make(tmp_path, "exclude regex (\nexclude keyword\nbogus rule here\nexclude regex \\bymmv\\b")
+    assert f.rules == ["exclude regex \\bymmv\\b"]
+    assert f.evaluate({"title": "YMMV deal"})[0] is False
+    assert f.evaluate({"title": "ymmvx"}) == (True, None)
+
+
+def test_rule_file_replaces_defaults_and_reloads(tmp_path):
+    path = tmp_path / "rules.txt"
+    path.write_text("exclude keyword tv\n")
+    f = DealFilter(str(path), "exclude keyword lamp")
+    assert f.evaluate({"title": "Lamp"}) == (True, None)
+    assert f.evaluate({"title": "TV"})[0] is False
+
+    path.write_text("exclude keyword lamp\n")
+    os.utime(path, (1, 1))
+    assert [d["title"] for d in f.filter([{"title": "Lamp"}, {"title": "TV"}])] == ["TV"]
+
+
+def test_stats_time_scans_and_thresholds(tmp_path):
+    f = make(tmp_path, "exclude keyword sample\ninclude keyword lego\nmin likes 1")
+    f.evaluate({"title": "lego sample", "likes": 5})
+    f.evaluate({"title": "lego", "likes": 0})
+    assert f.stats["exclude keyword sample"][0] == 1
+    assert f.stats["include keyword lego"][0] == 1
+    assert f.stats["(exclude scan)"][0] == 2 and f.stats["(include scan)"][0] == 1
+    assert f.stats["min likes 1"][0] == 1
+    assert "exclude keyword sample: 1 hits" in f.summary()